@@ -0,0 +1,172 @@
+"""
+Atomic Rename - Renames that never replace an existing destination
+No OOP patterns used - functional approach
+
+A plain rename silently overwrites a file that appeared at the destination
+after an exists() check. renameat2() with RENAME_NOREPLACE (Linux 3.15+,
+called through ctypes) fails with EEXIST instead, in the same single
+syscall. Filesystems without it fall back to link() + unlink(), which is
+just as safe (link never replaces), and filesystems without hard links to
+an exclusive placeholder that the rename then replaces. Callers retry
+with the next free suffix on FileExistsError.
+"""
+
+import os
+import sys
+import errno
+import shutil
+
+RENAME_NOREPLACE = 1
+AT_FDCWD = -100
+
+# Ways to rename without replacing, cheapest first
+NOREPLACE_METHODS = ('renameat2', 'link', 'placeholder')
+
+# Errors meaning "this filesystem or kernel can't do it", not "this file is broken"
+UNSUPPORTED_ERRNOS = {
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.EPERM,
+    errno.EMLINK,
+}
+
+def load_renameat2():
+    """Look up renameat2 in the C library, or None where it doesn't exist"""
+    if not sys.platform.startswith('linux'):
+        return None
+
+    try:
+        import ctypes
+        function = ctypes.CDLL(None, use_errno=True).renameat2
+    except (ImportError, OSError, AttributeError):
+        return None  # No ctypes, or a glibc older than 2.28
+
+    function.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    function.restype = ctypes.c_int
+    return function
+
+RENAMEAT2 = load_renameat2()
+
+def renameat2_noreplace(source, destination, src_dir_fd=None, dst_dir_fd=None):
+    """Rename with RENAME_NOREPLACE; raises FileExistsError if the destination exists"""
+    import ctypes
+
+    if RENAMEAT2 is None:
+        raise OSError(errno.ENOSYS, "renameat2 is not available")
+
+    result = RENAMEAT2(
+        AT_FDCWD if src_dir_fd is None else src_dir_fd, os.fsencode(source),
+        AT_FDCWD if dst_dir_fd is None else dst_dir_fd, os.fsencode(destination),
+        RENAME_NOREPLACE
+    )
+    if result != 0:
+        error = ctypes.get_errno()
+        raise OSError(error, os.strerror(error), source, None, destination)
+
+def link_noreplace(source, destination, src_dir_fd=None, dst_dir_fd=None):
+    """Hard-link the destination, then unlink the source
+
+    A crash in between leaves both names, never a lost file.
+    """
+    os.link(source, destination, src_dir_fd=src_dir_fd, dst_dir_fd=dst_dir_fd, follow_symlinks=False)
+    os.unlink(source, dir_fd=src_dir_fd)
+
+def claim_name(path, dir_fd=None):
+    """Create an empty placeholder, failing with FileExistsError if the name is taken"""
+    os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644, dir_fd=dir_fd))
+
+def placeholder_noreplace(source, destination, src_dir_fd=None, dst_dir_fd=None):
+    """Claim the destination with a placeholder, then rename over it"""
+    claim_name(destination, dst_dir_fd)
+    try:
+        os.replace(source, destination, src_dir_fd=src_dir_fd, dst_dir_fd=dst_dir_fd)
+    except OSError:
+        os.unlink(destination, dir_fd=dst_dir_fd)
+        raise
+
+NOREPLACE_FUNCTIONS = {
+    'renameat2': renameat2_noreplace,
+    'link': link_noreplace,
+    'placeholder': placeholder_noreplace,
+}
+
+def rename_noreplace(source, destination, src_dir_fd=None, dst_dir_fd=None, unsupported=None):
+    """Rename a file unless the destination exists (FileExistsError)
+
+    Paths may be relative to open directory descriptors. Methods listed in
+    ``unsupported`` are skipped; a method the filesystem turns out not to
+    support is added to it, so later renames of the run go straight to the
+    next one. Other errors (EXDEV included) are raised as they are.
+    """
+    if unsupported is None:
+        unsupported = set()
+
+    for method in NOREPLACE_METHODS:
+        if method in unsupported and method != 'placeholder':
+            continue
+        try:
+            return NOREPLACE_FUNCTIONS[method](source, destination, src_dir_fd, dst_dir_fd)
+        except OSError as e:
+            if method == 'placeholder' or e.errno not in UNSUPPORTED_ERRNOS:
+                raise
+            unsupported.add(method)
+
+def move_noreplace(source_path, destination_path, unsupported=None):
+    """Move a file by path without replacing anything, across filesystems too
+
+    A destination on another filesystem is claimed with a placeholder and
+    then copied over it, since no rename can cross devices.
+    """
+    try:
+        rename_noreplace(source_path, destination_path, unsupported=unsupported)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        claim_name(destination_path)
+        try:
+            shutil.move(source_path, destination_path)
+        except OSError:
+            os.unlink(destination_path)
+            raise
+
+def candidate_names(filename):
+    """Yield filename, then stem_1.ext, stem_2.ext, ..."""
+    yield filename
+
+    stem, ext = os.path.splitext(filename)
+    counter = 1
+    while True:
+        yield f"{stem}_{counter}{ext}"
+        counter += 1
+
+def rename_unique(rename, source, directory, filename):
+    """Rename ``source`` into ``directory`` under the first name nobody holds
+
+    ``rename(source, destination)`` must raise FileExistsError instead of
+    replacing. Returns the name used; a free name costs a single rename.
+    """
+    for candidate in candidate_names(filename):
+        try:
+            rename(source, os.path.join(directory, candidate))
+            return candidate
+        except FileExistsError:
+            continue
+
+def move_file_noclobber(source_path, directory, unsupported=None):
+    """Move a file into a directory under the first name no other worker holds
+
+    Every try is an atomic no-replace rename (see move_noreplace), so
+    workers never overwrite each other's files. Returns the final filename,
+    or None if the source vanished (e.g. another sharding worker already
+    moved it after taking over an expired lease).
+    """
+    try:
+        return rename_unique(
+            lambda source, destination: move_noreplace(source, destination, unsupported),
+            source_path, directory, os.path.basename(source_path)
+        )
+    except FileNotFoundError:
+        if os.path.lexists(source_path):
+            raise
+        return None
@@ -0,0 +1,224 @@
+"""
+Batch Runner - Organizes many folders as jobs on a process pool
+No OOP patterns used - functional approach
+
+Jobs are scheduled largest first (so the long ones don't end up running
+alone at the end) and at most ``per_device_limit`` jobs run at the same
+time on one storage device, so two jobs never thrash the same disk.
+"""
+
+import os
+import glob
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# Exit status of a job
+JOB_SUCCEEDED = 0
+JOB_FAILED = 1
+
+def expand_folder_patterns(patterns):
+    """Expand folder paths and glob patterns into a list of unique folders
+
+    Glob matches that aren't folders are left out; literal paths are kept
+    even if they don't exist, so run_batch reports them as failed jobs
+    instead of a typo passing silently.
+    """
+    folders = []
+    seen = set()
+
+    for pattern in patterns:
+        is_glob = glob.has_magic(pattern)
+        matches = sorted(glob.glob(pattern)) if is_glob else [pattern]
+        for folder in matches:
+            key = os.path.abspath(folder)
+            if key not in seen and (os.path.isdir(folder) or not is_glob):
+                seen.add(key)
+                folders.append(folder)
+
+    return folders
+
+def estimate_job_size(folder_path):
+    """Count the top-level files of a folder and their total size"""
+    file_count = 0
+    total_size = 0
+
+    try:
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        file_count += 1
+                        total_size += entry.stat().st_size
+                except OSError:
+                    continue
+    except OSError:
+        pass
+
+    return file_count, total_size
+
+def get_device_id(folder_path):
+    """Get the id of the storage device a folder lives on"""
+    try:
+        return os.stat(folder_path).st_dev
+    except OSError:
+        return None
+
+def build_jobs(folders):
+    """Create job records for folders, largest estimated job first"""
+    jobs = []
+
+    for folder in folders:
+        file_count, total_size = estimate_job_size(folder)
+        jobs.append({
+            'folder': folder,
+            'files': file_count,
+            'bytes': total_size,
+            'device': get_device_id(folder)
+        })
+
+    jobs.sort(key=lambda job: (job['bytes'], job['files']), reverse=True)
+    return jobs
+
+def get_concurrent_jobs(jobs, max_workers, per_device_limit):
+    """Get how many jobs can actually run at the same time"""
+    device_count = len({job['device'] for job in jobs})
+    return max(1, min(max_workers, device_count * per_device_limit, len(jobs)))  # 1 for an empty batch
+
+def get_job_options(options, concurrent_jobs):
+    """Split process-wide throttle limits evenly across the jobs that run at once"""
+    job_options = dict(options or {})
+
+    for key in ('max_bytes_per_second', 'max_ops_per_second'):
+        if job_options.get(key):
+            job_options[key] = job_options[key] / concurrent_jobs
+
+    return job_options
+
+def create_failed_result(job, error):
+    """Build the result of a job that failed outside organize_folder"""
+    return {
+        'folder': job['folder'],
+        'estimated_files': job['files'],
+        'estimated_bytes': job['bytes'],
+        'status': JOB_FAILED,
+        'error': error,
+        'stats': {},
+        'seconds': 0.0
+    }
+
+def get_job_metrics_file(metrics_file, folder):
+    """Give every job its own textfile so concurrent jobs don't overwrite each other
+
+    The suffix is derived from the folder, so a scheduled batch rewrites
+    the same files on every run instead of piling up new ones.
+    """
+    stem, extension = os.path.splitext(metrics_file)
+    digest = hashlib.sha1(os.path.abspath(folder).encode('utf-8')).hexdigest()[:12]
+    return f"{stem}-{digest}{extension}"
+
+def run_job(job, options):
+    """Organize one folder and write its summaries (runs in a worker process)"""
+    from file_organizer import organize_folder, get_category_stats
+    from summary_writer import generate_summaries
+
+    start = time.time()
+    result = {
+        'folder': job['folder'],
+        'estimated_files': job['files'],
+        'estimated_bytes': job['bytes'],
+        'status': JOB_FAILED,
+        'error': None,
+        'stats': {},
+        'seconds': 0.0
+    }
+
+    if options and options.get('metrics_file'):
+        options = dict(options, metrics_file=get_job_metrics_file(options['metrics_file'], job['folder']))
+
+    try:
+        report = {}
+        organized_files = organize_folder(job['folder'], options, report)
+        generate_summaries(job['folder'], organized_files, report)
+
+        result['stats'] = get_category_stats(organized_files)
+        result['status'] = JOB_SUCCEEDED
+    except Exception as e:
+        result['error'] = str(e)
+
+    result['seconds'] = time.time() - start
+    return result
+
+def pick_next_job(pending, running_per_device, per_device_limit):
+    """Take the largest pending job whose device has a free slot, or None"""
+    for index, job in enumerate(pending):
+        if running_per_device.get(job['device'], 0) < per_device_limit:
+            return pending.pop(index)
+    return None
+
+def run_batch(folders, options=None, max_workers=None, per_device_limit=1, progress_callback=None):
+    """Organize every folder on a process pool and return the batch results
+
+    ``progress_callback`` is called with each job result as it finishes.
+    Raises ValueError if ``max_workers`` or ``per_device_limit`` is below 1.
+    """
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    if per_device_limit < 1:
+        raise ValueError("per_device_limit must be at least 1")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    results = []
+
+    for folder in folders:
+        if not os.path.isdir(folder):
+            # A mistyped path fails its job rather than vanishing from the batch
+            error = "Not a directory" if os.path.exists(folder) else "Folder not found"
+            result = create_failed_result({'folder': folder, 'files': 0, 'bytes': 0}, f"{error}: {folder}")
+            results.append(result)
+            if progress_callback:
+                progress_callback(result)
+
+    pending = build_jobs([folder for folder in folders if os.path.isdir(folder)])
+    job_options = get_job_options(options, get_concurrent_jobs(pending, max_workers, per_device_limit))
+    running = {}
+    running_per_device = {}
+    start = time.time()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            # Fill free worker slots without exceeding any device's cap
+            while pending and len(running) < max_workers:
+                job = pick_next_job(pending, running_per_device, per_device_limit)
+                if job is None:
+                    break
+                running[executor.submit(run_job, job, job_options)] = job
+                running_per_device[job['device']] = running_per_device.get(job['device'], 0) + 1
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                running_per_device[job['device']] -= 1
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker process itself died
+                    result = create_failed_result(job, f"Worker failed: {e}")
+
+                results.append(result)
+                if progress_callback:
+                    progress_callback(result)
+
+    return {
+        'jobs': results,
+        'seconds': time.time() - start,
+        'max_workers': max_workers,
+        'per_device_limit': per_device_limit
+    }
+
+def get_batch_exit_status(batch):
+    """Get the overall exit status: success only if every job succeeded"""
+    if any(job['status'] != JOB_SUCCEEDED for job in batch['jobs']):
+        return JOB_FAILED
+    return JOB_SUCCEEDED
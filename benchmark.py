@@ -0,0 +1,839 @@
+"""
+Benchmark Suite - Measures organizer performance on synthetic folders
+No OOP patterns used - functional approach
+
+Run ``python benchmark.py <benchmark> --help`` for the options of each
+benchmark. Use ``--base`` to place the synthetic folders on the storage
+you want to measure (e.g. a network mount), or ``--backend memory`` to run
+against the in-memory storage backend and measure algorithmic cost alone.
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import builtins
+import itertools
+import tempfile
+
+import atomic_rename
+
+# Extensions used for synthetic files, spread across every category
+BENCHMARK_EXTENSIONS = ['.jpg', '.mp4', '.pdf', '.csv', '.pptx', '.mp3', '.zip', '.py', '.exe', '.xyz']
+
+# os functions whose calls are counted (each is one syscall, give or take)
+COUNTED_OS_CALLS = (
+    'stat', 'lstat', 'open', 'rename', 'replace', 'mkdir', 'rmdir',
+    'listdir', 'scandir', 'unlink', 'remove', 'link', 'symlink'
+)
+
+_call_counts = {'calls': {}, 'components': 0}
+
+# Peak memory a chunked run may add when its folder is four times larger
+CHUNKED_GROWTH_TOLERANCE = 1.25
+
+def count_path_components(path):
+    """Count the path components the kernel must resolve for a path argument"""
+    if isinstance(path, bytes):
+        path = os.fsdecode(path)
+    if not isinstance(path, str):
+        return 0  # File descriptors resolve nothing
+    return len([part for part in path.replace('\\', '/').split('/') if part])
+
+def make_counted_call(name, original):
+    """Wrap an os function so every call and resolved path component is counted"""
+    def counted_call(*args, **kwargs):
+        calls = _call_counts['calls']
+        calls[name] = calls.get(name, 0) + 1
+
+        if name == 'renameat2':
+            paths = (args[1], args[3])  # (dir fd, path, dir fd, path, flags)
+        else:
+            paths = args[:2] if name in ('rename', 'replace', 'link', 'symlink') else args[:1]
+        for path in paths:
+            _call_counts['components'] += count_path_components(path)
+
+        return original(*args, **kwargs)
+    return counted_call
+
+def start_counting_os_calls():
+    """Start counting os calls; returns the originals for stop_counting_os_calls"""
+    _call_counts['calls'] = {}
+    _call_counts['components'] = 0
+
+    originals = {}
+    for name in COUNTED_OS_CALLS:
+        original = getattr(os, name)
+        wrapped = make_counted_call(name, original)
+        originals[name] = (original, wrapped)
+        setattr(os, name, wrapped)
+
+        # Keep capability checks like "os.rename in os.supports_dir_fd" working
+        for support_set in (os.supports_dir_fd, os.supports_fd, os.supports_follow_symlinks):
+            if original in support_set:
+                support_set.add(wrapped)
+
+    # Python-level open() is a syscall too (e.g. per-file access probes)
+    originals['fopen'] = (builtins.open, make_counted_call('fopen', builtins.open))
+    builtins.open = originals['fopen'][1]
+
+    # No-clobber renames call renameat2 through ctypes, not the os module
+    if atomic_rename.RENAMEAT2 is not None:
+        originals['renameat2'] = (atomic_rename.RENAMEAT2, make_counted_call('renameat2', atomic_rename.RENAMEAT2))
+        atomic_rename.RENAMEAT2 = originals['renameat2'][1]
+
+    return originals
+
+def stop_counting_os_calls(originals):
+    """Restore the original os functions and return the collected counts"""
+    builtins.open = originals.pop('fopen')[0]
+    if 'renameat2' in originals:
+        atomic_rename.RENAMEAT2 = originals.pop('renameat2')[0]
+    for name, (original, wrapped) in originals.items():
+        setattr(os, name, original)
+        for support_set in (os.supports_dir_fd, os.supports_fd, os.supports_follow_symlinks):
+            support_set.discard(wrapped)
+
+    return {
+        'calls': dict(_call_counts['calls']),
+        'total_calls': sum(_call_counts['calls'].values()),
+        'components': _call_counts['components']
+    }
+
+def create_deep_folder(base, depth):
+    """Create a folder nested ``depth`` levels below base and return its path"""
+    path = base
+    for level in range(depth):
+        path = os.path.join(path, f"level_{level:02d}")
+    path = os.path.join(path, "drop")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def populate_folder(folder, file_count, size=0, backend=None):
+    """Fill a folder with synthetic files spread across all categories"""
+    from storage import add_memory_file
+
+    payload = b"x" * size
+    for i in range(file_count):
+        ext = BENCHMARK_EXTENSIONS[i % len(BENCHMARK_EXTENSIONS)]
+        path = os.path.join(folder, f"file_{i:07d}{ext}")
+        if backend is not None:
+            add_memory_file(backend, path, size=size)
+            continue
+        with open(path, 'wb') as f:
+            f.write(payload)
+
+def create_benchmark_backend(args):
+    """Create the storage backend selected by --backend (None means local)"""
+    from storage import create_memory_backend, BACKEND_OPERATIONS
+
+    if args.backend != 'memory':
+        return None
+    latency = args.latency_us / 1e6
+    return create_memory_backend({operation: latency for operation in BACKEND_OPERATIONS} if latency else None)
+
+def needs_local_backend(args):
+    """Report and return True when a benchmark measures something only real disks have"""
+    if args.backend == 'local':
+        return False
+    print(f"⚠️  The {args.benchmark} benchmark measures syscalls and disk layout; "
+          f"it only runs with --backend local")
+    return True
+
+def measure_organize(folder, options):
+    """Run organize_folder once and return its wall time and os call counts"""
+    from file_organizer import organize_folder
+
+    originals = start_counting_os_calls()
+    start = time.perf_counter()
+    try:
+        report = {}
+        organized_files = organize_folder(folder, options, report)
+    finally:
+        elapsed = time.perf_counter() - start
+        counts = stop_counting_os_calls(originals)
+
+    counts['seconds'] = elapsed
+    counts['report'] = report
+    counts['organized_files'] = organized_files
+    return counts
+
+def print_measurement(label, measurement, file_count):
+    """Print one benchmark result line"""
+    per_file = measurement['total_calls'] / file_count if file_count else 0
+    print(f"{label:<28} {measurement['seconds']:8.3f}s  "
+          f"{measurement['total_calls']:8d} calls ({per_file:.1f}/file)  "
+          f"{measurement['components']:9d} path components")
+
+def print_call_breakdown(measurement):
+    """Print the per-function call counts of a measurement"""
+    breakdown = ", ".join(f"{name}={count}" for name, count in sorted(measurement['calls'].items()))
+    print(f"{'':<28} {breakdown}")
+
+def benchmark_dir_fd(args):
+    """Compare path-based moves with dir_fd-relative moves on a deep folder"""
+    if needs_local_backend(args):
+        return
+
+    from dir_handles import supports_dir_fd
+
+    if not supports_dir_fd():
+        print("⚠️  This platform has no dir_fd support; only the path-based run is measured")
+
+    print(f"📊 dir_fd benchmark: {args.files} files, {args.depth} directory levels deep")
+
+    variants = [("path-based moves", {'use_dir_fd': False, 'journal': False})]
+    if supports_dir_fd():
+        variants.append(("dir_fd-relative moves", {'use_dir_fd': True, 'journal': False}))
+
+    for label, options in variants:
+        base = tempfile.mkdtemp(prefix="organizer_bench_", dir=args.base)
+        try:
+            folder = create_deep_folder(base, args.depth)
+            populate_folder(folder, args.files)
+            measurement = measure_organize(folder, options)
+        finally:
+            shutil.rmtree(base, ignore_errors=True)
+
+        print_measurement(label, measurement, args.files)
+        print_call_breakdown(measurement)
+
+def measure_calls(function):
+    """Run a function and return its wall time and os call counts"""
+    originals = start_counting_os_calls()
+    start = time.perf_counter()
+    try:
+        function()
+    finally:
+        elapsed = time.perf_counter() - start
+        counts = stop_counting_os_calls(originals)
+
+    counts['seconds'] = elapsed
+    return counts
+
+def run_safe_moves(folder, probe):
+    """Move every file of a folder into a sub folder with file_utils.safe_move_file"""
+    from file_utils import safe_move_file
+
+    os.makedirs(os.path.join(folder, "moved"), exist_ok=True)
+    for name in sorted(os.listdir(folder)):
+        source = os.path.join(folder, name)
+        if name != "moved":
+            safe_move_file(source, os.path.join(folder, "moved", name), probe=probe)
+
+def run_write_checks(folder, count, cached):
+    """Validate directory and summary write access ``count`` times"""
+    from file_utils import validate_directory_access, clear_write_access_cache
+    from summary_writer import validate_summary_creation
+
+    clear_write_access_cache()
+    for _ in range(count):
+        if not cached:
+            clear_write_access_cache()
+        validate_directory_access(folder)
+        validate_summary_creation(folder, {})
+
+def benchmark_lean(args):
+    """Compare per-file probing with the lean execution mode"""
+    if needs_local_backend(args):
+        return
+
+    from file_organizer import organize_folder
+
+    print(f"📊 lean mode benchmark: {args.files} files (before → after)")
+
+    def run_in_fresh_folder(label, populate, function):
+        base = tempfile.mkdtemp(prefix="organizer_bench_", dir=args.base)
+        try:
+            if populate:
+                populate_folder(base, args.files)
+            measurement = measure_calls(lambda: function(base))
+        finally:
+            shutil.rmtree(base, ignore_errors=True)
+        print_measurement(label, measurement, args.files)
+        print_call_breakdown(measurement)
+
+    for mode in ('move', 'link'):
+        for lean in (False, True):
+            options = {'mode': mode, 'lean': lean, 'use_dir_fd': False, 'journal': False}
+            run_in_fresh_folder(
+                f"{mode} {'lean' if lean else 'per-file'}", True,
+                lambda folder, options=options: organize_folder(folder, options)
+            )
+
+    for probe in (True, False):
+        run_in_fresh_folder(
+            f"safe_move_file probe={probe}", True,
+            lambda folder, probe=probe: run_safe_moves(folder, probe)
+        )
+
+    for cached in (False, True):
+        run_in_fresh_folder(
+            f"write checks {'cached' if cached else 'uncached'}", False,
+            lambda folder, cached=cached: run_write_checks(folder, args.files, cached)
+        )
+
+def populate_mixed_folder(folder, small_count, large_count, large_size):
+    """Fill a folder with many small files and a few large ones, interleaved"""
+    populate_folder(folder, small_count, 4096)
+    payload = b"x" * large_size
+    for i in range(large_count):
+        with open(os.path.join(folder, f"large_{i:05d}.mp4"), 'wb') as f:
+            f.write(payload)
+
+def measure_planned_seek(folder, ordering, threshold):
+    """Measure the order a run would visit the source files in
+
+    Returns the extent distance of the small and large files (data reads,
+    what copies pay for) and the inode distance of the small files (inode
+    table travel, what moves and links pay for).
+    """
+    from file_organizer import scan_folder, plan_organization
+    from locality import order_work, measure_seek_distance, measure_inode_distance
+
+    entries = {entry['name']: entry for entry in scan_folder(folder)}
+    work = [(name, category, None) for category, names in plan_organization(list(entries)).items()
+            for name in names]
+    small, large = order_work(work, entries, ordering, folder, threshold)
+
+    small_seek = measure_seek_distance([os.path.join(folder, item[0]) for item in small])
+    large_seek = measure_seek_distance([os.path.join(folder, item[0]) for item in large])
+    small_inodes = measure_inode_distance([entries[item[0]]['inode'] for item in small])
+    return small_seek, large_seek, small_inodes
+
+def benchmark_ordering(args):
+    """Compare listdir, inode and extent ordering on a mixed small/large copy"""
+    if needs_local_backend(args):
+        return
+
+    from locality import get_physical_offset
+
+    large_size = args.large_mb * 1024 * 1024
+    threshold = min(large_size, 8 * 1024 * 1024)
+    print(f"📊 ordering benchmark: {args.small} small + {args.large} × {args.large_mb} MiB files, copy mode")
+
+    for ordering in ('listdir', 'inode', 'extent'):
+        base = tempfile.mkdtemp(prefix="organizer_bench_", dir=args.base)
+        try:
+            populate_mixed_folder(base, args.small, args.large, large_size)
+            # Planning doesn't force writeback, so give the new files their extents first
+            os.sync()
+            if get_physical_offset(os.path.join(base, "large_00000.mp4")) is None:
+                print("⚠️  FIEMAP is unavailable here; seek distances can't be measured")
+
+            small_seek, large_seek, small_inodes = measure_planned_seek(base, ordering, threshold)
+            options = {
+                'mode': 'copy', 'journal': False, 'ordering': ordering,
+                'large_file_threshold': threshold,
+                'small_file_workers': args.small_workers, 'large_file_workers': args.large_workers
+            }
+            measurement = measure_organize(base, options)
+        finally:
+            shutil.rmtree(base, ignore_errors=True)
+
+        print_measurement(ordering, measurement, args.small + args.large)
+        seeks = ", ".join(
+            f"{label} seek={'n/a' if seek is None else f'{seek / 1024 / 1024:.1f} MiB'}"
+            for label, seek in (("small", small_seek), ("large", large_seek))
+        )
+        print(f"{'':<28} {seeks}, small inode distance={small_inodes}")
+
+def generate_names(count, distinct=100000):
+    """Yield ``count`` synthetic filenames cycling through a pool of distinct ones"""
+    extensions = BENCHMARK_EXTENSIONS + ['.part', '.crdownload', '.swp', '.tmp', '']
+    pool = [f"file_{i:07d}{extensions[i % len(extensions)]}" for i in range(distinct)]
+    pool[::97] = [f".~lock.{name}#" for name in pool[::97]]
+    return itertools.islice(itertools.cycle(pool), count)
+
+def time_matcher(label, names, count, is_match):
+    """Run a matcher over every name and print its per-entry cost"""
+    matched = 0
+    start = time.perf_counter()
+    for name in names:
+        if is_match(name):
+            matched += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"{label:<28} {elapsed:8.3f}s  {elapsed / count * 1e9:8.1f} ns/entry  {matched:9d} ignored")
+
+def benchmark_ignore(args):
+    """Measure the per-entry cost of the compiled ignore matcher"""
+    import fnmatch
+    from ignore_rules import compile_rules, is_ignored, DEFAULT_IGNORE_PATTERNS
+
+    patterns = list(DEFAULT_IGNORE_PATTERNS) + ['*.tmp', 'file_00001??.pdf', '!keep.part']
+    rules = compile_rules(patterns)
+    print(f"📊 ignore benchmark: {len(patterns)} patterns, {args.names} names")
+
+    time_matcher("compiled matcher", generate_names(args.names), args.names,
+                 lambda name: is_ignored(rules, name))
+
+    # The naive loop is far slower; it only runs over a sample
+    naive_patterns = [p for p in patterns if not p.endswith('/') and not p.startswith('!')]
+    time_matcher(f"fnmatch loop ({args.naive_sample} sample)", generate_names(args.naive_sample),
+                 args.naive_sample,
+                 lambda name: any(fnmatch.fnmatchcase(name, p) for p in naive_patterns))
+
+def benchmark_scale(args):
+    """Organize a large flat folder in move and copy mode on the selected backend"""
+    from storage import add_memory_dir, get_backend_calls
+
+    backend = create_benchmark_backend(args)
+    latency = f", {args.latency_us} µs per operation" if backend is not None and args.latency_us else ""
+    print(f"📊 scale benchmark: {args.files} files on the {args.backend} backend{latency}")
+
+    for mode in ('move', 'copy'):
+        if backend is not None:
+            folder = f"/scale_{mode}"
+            add_memory_dir(backend, folder)
+            base = None
+        else:
+            folder = base = tempfile.mkdtemp(prefix="organizer_bench_", dir=args.base)
+
+        try:
+            populate_folder(folder, args.files, backend=backend)
+            calls_before = get_backend_calls(backend) if backend is not None else {}
+            options = {'mode': mode, 'journal': False, 'fanout_threshold': args.fanout_threshold}
+            if backend is not None:
+                options['backend'] = backend
+            measurement = measure_organize(folder, options)
+        finally:
+            if base is not None:
+                shutil.rmtree(base, ignore_errors=True)
+
+        print(f"{mode:<28} {measurement['seconds']:8.3f}s  "
+              f"{measurement['seconds'] / args.files * 1e6:8.1f} µs/file")
+        if backend is not None:
+            calls = get_backend_calls(backend)
+            measurement['calls'] = {name: count - calls_before.get(name, 0) for name, count in calls.items()
+                                    if count > calls_before.get(name, 0)}
+        print_call_breakdown(measurement)
+
+def benchmark_durability(args):
+    """Compare the cost of the none, batched and strict durability levels"""
+    from summary_writer import generate_summaries
+
+    if needs_local_backend(args):
+        return
+
+    print(f"📊 durability benchmark: {args.files} × {args.size} B files, batch of {args.batch}, "
+          f"journal and summaries included")
+
+    for mode in ('move', 'copy'):
+        for level in ('none', 'batched', 'strict'):
+            base = tempfile.mkdtemp(prefix="organizer_bench_", dir=args.base)
+            try:
+                populate_folder(base, args.files, args.size)
+                options = {'mode': mode, 'durability': level, 'durability_batch': args.batch}
+                measurement = measure_organize(base, options)
+                start = time.perf_counter()
+                generate_summaries(base, measurement['organized_files'], measurement['report'])
+                measurement['seconds'] += time.perf_counter() - start
+            finally:
+                shutil.rmtree(base, ignore_errors=True)
+
+            syncs = measurement['report']['durability']
+            print(f"{f'{mode} {level}':<28} {measurement['seconds']:8.3f}s  "
+                  f"{measurement['seconds'] / args.files * 1e6:8.1f} µs/file  "
+                  f"{syncs['file_syncs']:6d} file syncs  {syncs['dir_syncs']:6d} folder syncs")
+
+def benchmark_metrics(args):
+    """Measure the per-file cost of metrics export and latency timing"""
+    from storage import add_memory_dir
+
+    backend = create_benchmark_backend(args)
+    print(f"📊 metrics benchmark: {args.files} files on the {args.backend} backend, "
+          f"{args.small_workers} worker threads")
+
+    metrics_dir = tempfile.mkdtemp(prefix="organizer_metrics_", dir=args.base)
+    try:
+        results = {}
+        for label, metrics_file in (('without metrics', None),
+                                    ('with metrics', os.path.join(metrics_dir, 'organizer.prom'))):
+            if backend is not None:
+                folder = f"/metrics_{len(results)}"
+                add_memory_dir(backend, folder)
+                base = None
+            else:
+                folder = base = tempfile.mkdtemp(prefix="organizer_bench_", dir=args.base)
+
+            try:
+                populate_folder(folder, args.files, backend=backend)
+                options = {'journal': False, 'metrics_file': metrics_file, 'metrics_interval': 0.5,
+                           'small_file_workers': args.small_workers}
+                if backend is not None:
+                    options['backend'] = backend
+                measurement = measure_organize(folder, options)
+            finally:
+                if base is not None:
+                    shutil.rmtree(base, ignore_errors=True)
+
+            results[label] = measurement['seconds']
+            print(f"{label:<28} {measurement['seconds']:8.3f}s  "
+                  f"{measurement['seconds'] / args.files * 1e6:8.1f} µs/file")
+
+        overhead = (results['with metrics'] - results['without metrics']) / args.files * 1e6
+        print(f"{'overhead':<28} {overhead:8.2f} µs/file")
+    finally:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+
+def benchmark_concurrency(args):
+    """Compare fixed worker counts with the adaptive tuner on a congested in-memory share"""
+    from storage import create_memory_backend, add_memory_dir, BACKEND_OPERATIONS
+    from concurrency import format_decision
+
+    latency = (args.latency_us or 1000) / 1e6
+    print(f"📊 concurrency benchmark: {args.files} files, {latency * 1e6:.0f} µs per operation, "
+          f"share serves {args.capacity} operations at once")
+
+    for label, options in (('fixed 1 worker', {'small_file_workers': 1}),
+                           (f'fixed {args.max_workers} workers', {'small_file_workers': args.max_workers}),
+                           ('auto', {'concurrency': 'auto', 'max_workers': args.max_workers})):
+        # A fresh backend per run, so queued operations of one run don't slow the next
+        backend = create_memory_backend({operation: latency for operation in BACKEND_OPERATIONS}, args.capacity)
+        add_memory_dir(backend, '/share')
+        populate_folder('/share', args.files, backend=backend)
+        options.update({'backend': backend, 'journal': False, 'ordering': 'inode'})
+        measurement = measure_organize('/share', options)
+
+        print(f"{label:<28} {measurement['seconds']:8.3f}s  "
+              f"{args.files / measurement['seconds']:8.0f} files/s")
+        tuning = measurement['report'].get('concurrency', {}).get('small')
+        if tuning:
+            print(f"   workers: started {tuning['initial']}, peak {tuning['peak']}, ended {tuning['final']}")
+            for decision in tuning['decisions'][:args.show_decisions]:
+                print(f"   {format_decision(decision, tuning['unit'])}")
+
+def populate_categories(base, category_count, file_count, backend=None):
+    """Create already organized category folders; returns (organized_files, sizes)"""
+    from storage import add_memory_file, add_memory_dir
+
+    organized_files = {f"Category_{i:03d}": [] for i in range(category_count)}
+    sizes = {category: [] for category in organized_files}
+    categories = list(organized_files)
+    for category in categories:
+        if backend is not None:
+            add_memory_dir(backend, os.path.join(base, category))
+        else:
+            os.makedirs(os.path.join(base, category))
+
+    for i in range(file_count):
+        category = categories[i % category_count]
+        name = f"file_{i:07d}.dat"
+        path = os.path.join(base, category, name)
+        if backend is not None:
+            add_memory_file(backend, path, size=i)
+        else:
+            with open(path, 'wb'):
+                pass
+        organized_files[category].append(name)
+        sizes[category].append(0 if backend is None else i)
+
+    return organized_files, sizes
+
+def benchmark_reports(args):
+    """Time the report builder on many categories, with and without scanned sizes"""
+    from summary_writer import write_reports, SUMMARY_WORKERS
+    from storage import get_backend_calls
+
+    backend = create_benchmark_backend(args)
+    print(f"📊 reports benchmark: {args.files} files in {args.categories} categories "
+          f"on the {args.backend} backend (summaries, master summary and detailed report)")
+
+    base = "/reports" if backend is not None else tempfile.mkdtemp(prefix="organizer_bench_", dir=args.base)
+    try:
+        organized_files, sizes = populate_categories(base, args.categories, args.files, backend)
+        variants = [
+            ("stat per file, 1 thread", {}, 1),
+            (f"stat per file, {SUMMARY_WORKERS} threads", {}, SUMMARY_WORKERS),
+            ("scanned sizes, 1 thread", {'sizes': sizes}, 1),
+            (f"scanned sizes, {SUMMARY_WORKERS} threads", {'sizes': sizes}, SUMMARY_WORKERS),
+        ]
+        for label, report, workers in variants:
+            calls_before = get_backend_calls(backend) if backend is not None else {}
+            start = time.perf_counter()
+            write_reports(base, organized_files, report, backend, master=True, detailed=True, workers=workers)
+            elapsed = time.perf_counter() - start
+            stats = ""
+            if backend is not None:
+                stats = f"  {get_backend_calls(backend).get('stat', 0) - calls_before.get('stat', 0):9d} stat calls"
+            print(f"{label:<28} {elapsed:8.3f}s  {elapsed / args.files * 1e6:8.2f} µs/file{stats}")
+    finally:
+        if backend is None:
+            shutil.rmtree(base, ignore_errors=True)
+
+def create_synthetic_columns(file_count, category_count):
+    """Build a run report's columnar scan data for synthetic files, without touching disk"""
+    import array
+    import random
+
+    now = time.time()
+    rng = random.Random(42)
+    organized_files = {f"Category_{i:03d}": [] for i in range(category_count)}
+    report = {'sizes': {}, 'mtimes': {}, 'extension_codes': {},
+              'extensions': list(BENCHMARK_EXTENSIONS),
+              'extension_index': {ext: code for code, ext in enumerate(BENCHMARK_EXTENSIONS)}}
+
+    per_category = file_count // category_count
+    for category, files in organized_files.items():
+        files.extend(f"file_{i:07d}" for i in range(per_category))
+        report['sizes'][category] = array.array('q', (int(rng.lognormvariate(11, 2.5)) for _ in range(per_category)))
+        report['mtimes'][category] = array.array('d', (now - rng.expovariate(1 / 4e7) for _ in range(per_category)))
+        report['extension_codes'][category] = array.array(
+            'i', (rng.randrange(len(BENCHMARK_EXTENSIONS)) for _ in range(per_category))
+        )
+
+    return organized_files, report
+
+def benchmark_stats(args):
+    """Time the vectorised statistics report over synthetic columns"""
+    from stats_report import compute_statistics, render_statistics
+
+    try:
+        import numpy  # noqa: F401 (the report needs it)
+    except ImportError:
+        print("⚠️  The stats benchmark needs NumPy (pip install numpy)")
+        return
+
+    print(f"📊 stats benchmark: {args.files} files in {args.categories} categories (columns built in memory)")
+    organized_files, report = create_synthetic_columns(args.files, args.categories)
+
+    start = time.perf_counter()
+    statistics = compute_statistics("/synthetic", organized_files, report)
+    computed = time.perf_counter() - start
+    render_statistics("/synthetic", statistics)
+    rendered = time.perf_counter() - start - computed
+
+    print(f"{'compute':<28} {computed:8.3f}s  {computed / args.files * 1e9:8.1f} ns/file")
+    print(f"{'render':<28} {rendered:8.3f}s")
+
+def get_peak_rss():
+    """Peak resident memory of this process in bytes, or None where it can't be read"""
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # Linux reports KB
+
+def write_synthetic_snapshots(folder, file_count):
+    """Write an old and a new snapshot of synthetic files; every 100 files one of each change"""
+    from snapshots import format_record, SNAPSHOT_HEADER
+
+    old_path = os.path.join(folder, "old.tsv")
+    new_path = os.path.join(folder, "new.tsv")
+    mtime = 1700000000 * 10**9
+    with open(old_path, 'w', encoding='utf-8') as old, open(new_path, 'w', encoding='utf-8') as new:
+        old.write(SNAPSHOT_HEADER)
+        new.write(SNAPSHOT_HEADER)
+        for i in range(file_count):
+            category = f"Category_{i % 100:03d}"
+            record = (i * 2, 1000 + i, mtime, category, f"{category}/file_{i:08d}.dat")
+            old.write(format_record(record))
+            change = i % 100
+            if change == 1:
+                record = record[:4] + (f"{category}/renamed_{i:08d}.dat",)
+            elif change == 2:
+                record = (record[0], record[1] + 1, mtime + 1) + record[3:]
+            if change != 0:
+                new.write(format_record(record))
+            if change == 3:
+                new.write(format_record((i * 2 + 1, 10, mtime, category, f"{category}/added_{i:08d}.dat")))
+
+    return old_path, new_path
+
+def benchmark_snapshots(args):
+    """Time the streaming snapshot diff and report the process's peak memory"""
+    from snapshots import diff_snapshots, count_changes
+
+    print(f"📊 snapshots benchmark: diff of two {args.files}-entry snapshots "
+          f"(sort chunks of {args.chunk} records)")
+    base = tempfile.mkdtemp(prefix="organizer_bench_", dir=args.base)
+    try:
+        old_path, new_path = write_synthetic_snapshots(base, args.files)
+        megabytes = (os.path.getsize(old_path) + os.path.getsize(new_path)) / 1024 / 1024
+
+        start = time.perf_counter()
+        result = count_changes(diff_snapshots(old_path, new_path, base, args.chunk))
+        elapsed = time.perf_counter() - start
+        print(f"{'diff':<28} {elapsed:8.3f}s  {elapsed / args.files * 1e6:8.2f} µs/entry  {megabytes:.0f} MB read")
+        print(f"{'changes':<28} " + ", ".join(f"{count} {change}" for change, count in result['counts'].items()))
+        peak = get_peak_rss()
+        if peak is not None:
+            # Stays flat as --files grows; only --chunk moves it
+            print(f"{'peak RSS':<28} {peak / 1024 / 1024:8.1f} MB")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+def measure_peak_memory(folder, options):
+    """Organize a folder and its summaries; returns (seconds, peak traced bytes)"""
+    import tracemalloc
+    from file_organizer import organize_folder
+    from summary_writer import generate_summaries
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        report = {}
+        generate_summaries(folder, organize_folder(folder, options, report), report)
+        return time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def benchmark_chunked(args):
+    """Check that chunked runs stay under a memory ceiling however many files the folder holds
+
+    Runs one worker, --workers small-file workers and the auto-tuned
+    pools, each on a folder of --files / 4 and --files files. Returns 1
+    (a failed run) when a peak of the larger folder is above --ceiling-mb
+    or grew with the folder size.
+    """
+    if needs_local_backend(args):
+        return 0
+
+    ceiling = args.ceiling_mb * 1024 * 1024
+    print(f"📊 chunked benchmark: batches of {args.chunk} files, ceiling {args.ceiling_mb} MB "
+          f"(peak traced Python memory, summaries included)")
+
+    pools = [
+        ("1 worker", {}),
+        (f"{args.workers} workers", {'small_file_workers': args.workers}),
+        ("auto workers", {'concurrency': 'auto'}),
+    ]
+    variants = [(label, options, file_count, args.chunk)
+                for label, options in pools for file_count in (args.files // 4, args.files)]
+    variants.append(("1 worker", {}, args.files, None))
+
+    peaks = {}
+    for pool, options, file_count, chunk_size in variants:
+        folder = tempfile.mkdtemp(prefix="organizer_bench_", dir=args.base)
+        try:
+            populate_folder(folder, file_count)
+            seconds, peak = measure_peak_memory(folder, dict(options, chunk_size=chunk_size))
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+        label = f"{file_count} files, {pool}, " + (f"chunks of {chunk_size}" if chunk_size else "whole folder")
+        print(f"{label:<46} {seconds:8.3f}s  {seconds / file_count * 1e6:8.1f} µs/file  "
+              f"peak {peak / 1024 / 1024:7.1f} MB")
+        if chunk_size:
+            peaks.setdefault(pool, []).append(peak)
+
+    status = 0
+    for pool, (small_peak, large_peak) in peaks.items():
+        # Four times the files may not cost more than noise on top of the smaller run
+        if large_peak > small_peak * CHUNKED_GROWTH_TOLERANCE:
+            print(f"❌ Peak memory of chunked runs with {pool} grew with the folder")
+            status = 1
+        elif large_peak > ceiling:
+            print(f"❌ Peak memory of chunked runs with {pool} is above {args.ceiling_mb} MB")
+            status = 1
+    if not status:
+        print(f"✅ Chunked runs stayed under {args.ceiling_mb} MB")
+    return status
+
+BENCHMARKS = {
+    'dir_fd': benchmark_dir_fd,
+    'lean': benchmark_lean,
+    'ordering': benchmark_ordering,
+    'ignore': benchmark_ignore,
+    'scale': benchmark_scale,
+    'durability': benchmark_durability,
+    'reports': benchmark_reports,
+    'stats': benchmark_stats,
+    'metrics': benchmark_metrics,
+    'concurrency': benchmark_concurrency,
+    'snapshots': benchmark_snapshots,
+    'chunked': benchmark_chunked,
+}
+
+def build_parser():
+    """Build the argument parser with one sub-command per benchmark"""
+    parser = argparse.ArgumentParser(description="Folder Organizer benchmark suite")
+    parser.add_argument('--base', default=None, help="Directory to create synthetic folders in")
+    parser.add_argument('--backend', choices=['local', 'memory'], default='local',
+                        help="Storage backend the organizer runs against")
+    parser.add_argument('--latency-us', type=int, default=0,
+                        help="Latency injected into every in-memory backend operation (microseconds)")
+    commands = parser.add_subparsers(dest='benchmark')
+
+    dir_fd_parser = commands.add_parser('dir_fd', help="Path-based vs dir_fd-relative moves")
+    dir_fd_parser.add_argument('--files', type=int, default=5000)
+    dir_fd_parser.add_argument('--depth', type=int, default=30)
+
+    lean_parser = commands.add_parser('lean', help="Per-file probes vs lean execution mode")
+    lean_parser.add_argument('--files', type=int, default=5000)
+
+    ordering_parser = commands.add_parser('ordering', help="listdir vs inode vs extent ordering")
+    ordering_parser.add_argument('--small', type=int, default=5000)
+    ordering_parser.add_argument('--large', type=int, default=20)
+    ordering_parser.add_argument('--large-mb', type=int, default=16)
+    ordering_parser.add_argument('--small-workers', type=int, default=4)
+    ordering_parser.add_argument('--large-workers', type=int, default=1)
+
+    ignore_parser = commands.add_parser('ignore', help="Per-entry cost of the compiled ignore matcher")
+    ignore_parser.add_argument('--names', type=int, default=10000000)
+    ignore_parser.add_argument('--naive-sample', type=int, default=200000)
+
+    scale_parser = commands.add_parser('scale', help="Large flat folder, local or in-memory backend")
+    scale_parser.add_argument('--files', type=int, default=100000)
+    scale_parser.add_argument('--fanout-threshold', type=int, default=10000)
+
+    durability_parser = commands.add_parser('durability', help="Cost of the none, batched and strict fsync levels")
+    durability_parser.add_argument('--files', type=int, default=2000)
+    durability_parser.add_argument('--size', type=int, default=4096)
+    durability_parser.add_argument('--batch', type=int, default=256)
+
+    reports_parser = commands.add_parser('reports', help="Single-pass report builder, stat vs scanned sizes")
+    reports_parser.add_argument('--files', type=int, default=200000)
+    reports_parser.add_argument('--categories', type=int, default=100)
+
+    stats_parser = commands.add_parser('stats', help="NumPy statistics report over synthetic columns")
+    stats_parser.add_argument('--files', type=int, default=10000000)
+    stats_parser.add_argument('--categories', type=int, default=100)
+
+    metrics_parser = commands.add_parser('metrics', help="Per-file overhead of the Prometheus metrics export")
+    metrics_parser.add_argument('--files', type=int, default=50000)
+    metrics_parser.add_argument('--small-workers', type=int, default=4)
+
+    concurrency_parser = commands.add_parser('concurrency', help="Fixed worker counts vs the adaptive tuner")
+    concurrency_parser.add_argument('--files', type=int, default=5000)
+    concurrency_parser.add_argument('--capacity', type=int, default=8,
+                                    help="Operations the simulated share serves at once")
+    concurrency_parser.add_argument('--max-workers', type=int, default=32)
+    concurrency_parser.add_argument('--show-decisions', type=int, default=15)
+
+    snapshots_parser = commands.add_parser('snapshots', help="Streaming diff of two large snapshots")
+    snapshots_parser.add_argument('--files', type=int, default=1000000)
+    snapshots_parser.add_argument('--chunk', type=int, default=100000,
+                                  help="Records sorted in memory before spilling")
+
+    chunked_parser = commands.add_parser('chunked', help="Memory ceiling of chunked runs on a large flat folder")
+    chunked_parser.add_argument('--files', type=int, default=40000)
+    chunked_parser.add_argument('--chunk', type=int, default=1000)
+    chunked_parser.add_argument('--workers', type=int, default=4, help="Small-file workers of the threaded variant")
+    chunked_parser.add_argument('--ceiling-mb', type=float, default=8)
+
+    return parser
+
+def main(argv=None):
+    """Run the selected benchmark, or all of them with their defaults"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not args.benchmark:
+        status = 0
+        for name in BENCHMARKS:
+            common = [f'--backend={args.backend}', f'--latency-us={args.latency_us}']
+            status = main(([f'--base={args.base}'] if args.base else []) + common + [name]) or status
+        return status
+
+    # Benchmarks with a pass/fail check (e.g. a memory ceiling) return a status
+    print("=" * 60)
+    status = BENCHMARKS[args.benchmark](args)
+    print("=" * 60)
+    return status or 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""
+Calibration - Measures a filesystem once and estimates run times from it
+No OOP patterns used - functional approach
+
+A short micro-benchmark in a scratch folder on the target filesystem
+measures stat, rename and unlink latency, the cost of copying a small file
+and the throughput of large checksummed copies. It only runs when asked
+for (the estimate command); results are cached per mount point, and
+estimates combine them with the file count and byte distribution of the
+planned run.
+"""
+
+import os
+import json
+import time
+import shutil
+import tempfile
+
+from verified_copy import copy_file_with_checksum, SMALL_FILE_LIMIT
+
+# Calibrations older than this are measured again
+CALIBRATION_MAX_AGE = 30 * 24 * 3600
+
+CALIBRATION_SMALL_FILES = 200
+CALIBRATION_SMALL_SIZE = 4096
+CALIBRATION_LARGE_SIZE = 32 * 1024 * 1024
+
+# Used when the filesystem can't be measured (e.g. a read-only folder)
+DEFAULT_CALIBRATION = {
+    'stat_seconds': 0.00002,
+    'rename_seconds': 0.0001,
+    'unlink_seconds': 0.0001,
+    'small_copy_seconds': 0.0005,
+    'copy_bytes_per_second': 200 * 1024 * 1024,
+    'source': 'default'
+}
+
+# Fixed cost of a run: scanning setup, category folders, journal
+RUN_OVERHEAD_SECONDS = 0.05
+
+def get_cache_path():
+    """Get the path of the per-user calibration cache"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'folder_organizer', 'calibration.json')
+
+def get_mount_point(path):
+    """Get the mount point a path lives on"""
+    path = os.path.abspath(path)
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+def get_mount_key(path):
+    """Identify the filesystem of a path for the calibration cache"""
+    return f"{get_mount_point(path)}@{os.stat(path).st_dev}"
+
+def read_calibration_cache():
+    """Read every cached calibration, keyed by mount"""
+    try:
+        with open(get_cache_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_calibration_cache(cache):
+    """Write the calibration cache atomically"""
+    cache_path = get_cache_path()
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(temp_path, cache_path)
+
+def time_per_call(function, items):
+    """Run a function over items and return the mean seconds per call"""
+    start = time.perf_counter()
+    for item in items:
+        function(item)
+    return (time.perf_counter() - start) / max(len(items), 1)
+
+def get_scratch_parent(directory):
+    """Find a writable folder outside ``directory`` on the same filesystem
+
+    Tries the system temp folder, then the mount point. Raises OSError if
+    neither is on the same filesystem and writable.
+    """
+    device = os.stat(directory).st_dev
+    for candidate in (tempfile.gettempdir(), get_mount_point(directory)):
+        try:
+            if os.stat(candidate).st_dev == device and os.access(candidate, os.W_OK):
+                return candidate
+        except OSError:
+            continue
+
+    raise OSError(f"No writable scratch folder on the filesystem of {directory}")
+
+def calibrate_filesystem(directory):
+    """Micro-benchmark the filesystem of a directory
+
+    Works in a scratch folder next to, never inside, ``directory`` (see
+    get_scratch_parent) that is removed again. Returns a calibration dict
+    with per-operation seconds and copy throughput.
+    """
+    scratch = tempfile.mkdtemp(prefix='.organizer-calibration-', dir=get_scratch_parent(directory))
+    try:
+        small_payload = b"x" * CALIBRATION_SMALL_SIZE
+        small_paths = [os.path.join(scratch, f"small_{i:04d}") for i in range(CALIBRATION_SMALL_FILES)]
+
+        for path in small_paths:
+            with open(path, 'wb') as f:
+                f.write(small_payload)
+
+        stat_seconds = time_per_call(os.stat, small_paths)
+
+        # The engine's own copy routine, so checksum and copystat costs are included
+        copied = os.path.join(scratch, 'copied')
+        os.mkdir(copied)
+        copied_paths = [os.path.join(copied, os.path.basename(path)) for path in small_paths]
+        small_copy_seconds = time_per_call(
+            lambda path: copy_file_with_checksum(path, os.path.join(copied, os.path.basename(path))),
+            small_paths
+        )
+        unlink_seconds = time_per_call(os.remove, copied_paths)
+
+        renamed = os.path.join(scratch, 'renamed')
+        os.mkdir(renamed)
+        rename_seconds = time_per_call(
+            lambda path: os.rename(path, os.path.join(renamed, os.path.basename(path))),
+            small_paths
+        )
+
+        large_source = os.path.join(scratch, 'large_source')
+        with open(large_source, 'wb') as f:
+            chunk = os.urandom(1024 * 1024)
+            for _ in range(CALIBRATION_LARGE_SIZE // len(chunk)):
+                f.write(chunk)
+
+        start = time.perf_counter()
+        copy_file_with_checksum(large_source, os.path.join(scratch, 'large_copy'))
+        copy_seconds = time.perf_counter() - start
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        'stat_seconds': stat_seconds,
+        'rename_seconds': rename_seconds,
+        'unlink_seconds': unlink_seconds,
+        'small_copy_seconds': small_copy_seconds,
+        'copy_bytes_per_second': CALIBRATION_LARGE_SIZE / max(copy_seconds, 1e-6),
+        'source': 'measured',
+        'measured_at': time.time()
+    }
+
+def get_calibration(directory, refresh=False, measure=False):
+    """Get the calibration of a directory's filesystem
+
+    Without ``measure`` nothing is written: the cached calibration is used,
+    however old, or DEFAULT_CALIBRATION. With it a missing or expired
+    calibration (or any, with ``refresh``) is measured and cached; a
+    filesystem that can't be measured gets DEFAULT_CALIBRATION (not cached).
+    """
+    try:
+        key = get_mount_key(directory)
+    except OSError:
+        return dict(DEFAULT_CALIBRATION)
+
+    cache = read_calibration_cache()
+    cached = cache.get(key)
+    if not measure:
+        return cached or dict(DEFAULT_CALIBRATION)
+    if cached and not refresh and time.time() - cached.get('measured_at', 0) < CALIBRATION_MAX_AGE:
+        return cached
+
+    try:
+        calibration = calibrate_filesystem(directory)
+    except OSError:
+        return dict(DEFAULT_CALIBRATION)
+
+    cache[key] = calibration
+    try:
+        write_calibration_cache(cache)
+    except OSError:
+        pass  # Estimates still work, they just measure again next time
+    return calibration
+
+def summarize_sizes(sizes, small_limit=SMALL_FILE_LIMIT):
+    """Reduce file sizes (any iterable, read once) to the counts and bytes the estimator needs"""
+    distribution = {'files': 0, 'bytes': 0, 'small_files': 0, 'large_files': 0, 'large_bytes': 0}
+    for size in sizes:
+        distribution['files'] += 1
+        distribution['bytes'] += size
+        if size < small_limit:
+            distribution['small_files'] += 1
+        else:
+            distribution['large_files'] += 1
+            distribution['large_bytes'] += size
+    return distribution
+
+def estimate_seconds(distribution, mode='move', source=None, destination=None, reverify=False):
+    """Estimate the seconds a run takes from a size distribution and calibrations
+
+    ``source`` and ``destination`` are calibrations of the two filesystems;
+    the destination defaults to the source (organizing in place).
+    """
+    source = source or DEFAULT_CALIBRATION
+    destination = destination or source
+    files = distribution['files']
+
+    # Scanning stats every file on the source
+    seconds = RUN_OVERHEAD_SECONDS + files * source['stat_seconds']
+
+    if mode in ('move', 'link'):
+        return seconds + files * destination['rename_seconds']
+
+    # Small files cost a create each; large files are bound by copy throughput
+    throughput = min(source['copy_bytes_per_second'], destination['copy_bytes_per_second'])
+    seconds += distribution['small_files'] * destination['small_copy_seconds']
+    seconds += distribution['large_bytes'] / throughput
+
+    if reverify:
+        seconds += distribution['bytes'] / throughput
+    if mode == 'verified_move':
+        seconds += files * source.get('unlink_seconds', source['rename_seconds'])
+
+    return seconds
+
+def format_duration(seconds):
+    """Format a duration in seconds, minutes or hours"""
+    if seconds < 60:
+        return f"{seconds:.1f} seconds"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f} minutes"
+    return f"{seconds / 3600:.1f} hours"
+
+def estimate_folder(folder_path, options=None, refresh=False, measure=False):
+    """Estimate how long organizing a folder will take
+
+    Scans the folder the way the engine does (ignore rules included) and
+    combines the result with the calibration of its filesystem, measured
+    first only with ``measure`` (see get_calibration).
+    """
+    from file_organizer import get_organize_options, iter_folder_entries
+    from ignore_rules import load_rules
+
+    options = get_organize_options(options)
+    rules = load_rules(folder_path, options['ignore'], options['ignore_defaults'])
+    # Streamed, so estimating a huge folder holds no listing
+    distribution = summarize_sizes(entry['size'] for entry in iter_folder_entries(folder_path, rules=rules))
+    calibration = get_calibration(folder_path, refresh, measure)
+
+    return dict(
+        distribution,
+        seconds=estimate_seconds(distribution, options['mode'], calibration, reverify=options['reverify']),
+        calibration=calibration
+    )
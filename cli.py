@@ -0,0 +1,509 @@
+"""
+Command Line Interface - Runs the organizer from a terminal
+No OOP patterns used - functional approach
+"""
+
+import sys
+import time
+import argparse
+
+# Minimum seconds between progress lines
+PROGRESS_INTERVAL = 1.0
+
+_last_progress_time = 0.0
+
+def megabytes_to_bytes(value):
+    """Convert an MB/s command-line value to bytes/sec (None stays None)"""
+    if value is None:
+        return None
+    return int(value * 1024 * 1024)
+
+def positive_int(value):
+    """Parse a command-line count that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def print_progress(progress):
+    """Print a progress line, at most once per PROGRESS_INTERVAL"""
+    global _last_progress_time
+    from throttle import format_throttle_stats
+
+    now = time.monotonic()
+    if progress['done'] < progress['total'] and now - _last_progress_time < PROGRESS_INTERVAL:
+        return
+    _last_progress_time = now
+
+    workers = progress.get('workers', {})
+    pools = f", workers {workers['small']} small / {workers['large']} large" if workers else ""
+    print(f"   {progress['done']}/{progress['total']} files "
+          f"({format_throttle_stats(progress['throttle'])}{pools})")
+
+def add_organize_arguments(parser):
+    """Add the options shared by every command that organizes a folder"""
+    parser.add_argument('--mode', choices=['move', 'link', 'copy', 'verified_move'], default='move',
+                        help="How files are placed into category folders")
+    parser.add_argument('--reverify', action='store_true',
+                        help="Re-read copies and compare checksums before trusting them")
+    parser.add_argument('--journal', action='store_true',
+                        help="Record every operation in .organizer/journal-*.jsonl")
+    parser.add_argument('--max-mbps', type=float, default=None,
+                        help="Limit copy throughput to this many MB/s")
+    parser.add_argument('--max-ops', type=float, default=None,
+                        help="Limit file operations to this many per second")
+    parser.add_argument('--throttle-file', default=None,
+                        help="JSON file with bytes_per_second / ops_per_second, re-read when it changes")
+    parser.add_argument('--fanout-threshold', type=int, default=None,
+                        help="Split category folders into sub folders above this many entries")
+    parser.add_argument('--fanout-scheme', choices=['hash', 'date'], default='hash',
+                        help="Sub folder naming for fanned-out categories")
+    parser.add_argument('--strategy', default='extension',
+                        help="Sub folder layers below each category: extension, +year, +month, +size "
+                             "(e.g. extension+month for Images/2026/10)")
+    parser.add_argument('--ignore', action='append', default=[], metavar='PATTERN',
+                        help="Skip files matching this gitignore-style pattern (repeatable)")
+    parser.add_argument('--no-default-ignores', action='store_true',
+                        help="Also organize partial downloads, lock files and report files")
+    parser.add_argument('--pack-older-than', type=float, default=None, metavar='DAYS',
+                        help="Pack files older than this many days into per-category tar archives")
+    parser.add_argument('--pack-compression', choices=['none', 'gz', 'xz'], default='gz',
+                        help="Compression of packed archives")
+    parser.add_argument('--ordering', choices=['listdir', 'inode', 'extent'], default='listdir',
+                        help="Order files by inode or by on-disk extent (helps spinning disks)")
+    parser.add_argument('--small-workers', type=int, default=1,
+                        help="Threads for small files (metadata-bound work)")
+    parser.add_argument('--large-workers', type=int, default=1,
+                        help="Threads for large files (sequential copies)")
+    parser.add_argument('--concurrency', choices=['fixed', 'auto'], default='fixed',
+                        help="Tune the worker counts at runtime from observed latency and throughput")
+    parser.add_argument('--max-workers', type=int, default=32,
+                        help="Upper bound of each worker pool with --concurrency auto")
+    parser.add_argument('--durability', choices=['none', 'batched', 'strict'], default='none',
+                        help="fsync moved files, folders, journal and summaries: never, in batches or per file")
+    parser.add_argument('--durability-batch', type=int, default=256,
+                        help="Placements per folder between batched folder syncs")
+    parser.add_argument('--metrics-file', default=None, metavar='PATH',
+                        help="Export Prometheus metrics to this node-exporter textfile (*.prom)")
+    parser.add_argument('--slow-seconds', type=float, default=5.0,
+                        help="Log placements that take at least this many seconds as slow")
+    parser.add_argument('--snapshot', action='store_true',
+                        help="Save a sorted snapshot of the organized folder for 'diff'")
+    parser.add_argument('--chunk-size', type=int, default=None, metavar='FILES',
+                        help="Process huge folders in batches of this many files, with flat memory use")
+
+def get_options_from_args(args):
+    """Build organize_folder options from parsed arguments"""
+    return {
+        'mode': args.mode,
+        'reverify': args.reverify,
+        'journal': args.journal,
+        'max_bytes_per_second': megabytes_to_bytes(args.max_mbps),
+        'max_ops_per_second': args.max_ops,
+        'fanout_threshold': args.fanout_threshold,
+        'fanout_scheme': args.fanout_scheme,
+        'strategy': args.strategy,
+        'ignore': args.ignore,
+        'ignore_defaults': not args.no_default_ignores,
+        'pack_older_than_days': args.pack_older_than,
+        'pack_compression': args.pack_compression,
+        'ordering': args.ordering,
+        'small_file_workers': args.small_workers,
+        'large_file_workers': args.large_workers,
+        'concurrency': args.concurrency,
+        'max_workers': args.max_workers,
+        'durability': args.durability,
+        'durability_batch': args.durability_batch,
+        'metrics_file': args.metrics_file,
+        'slow_operation_seconds': args.slow_seconds,
+        'snapshot': args.snapshot,
+        'chunk_size': args.chunk_size
+    }
+
+def print_estimate(folder, options, refresh=False, measure=False):
+    """Print the calibrated time estimate of organizing a folder"""
+    from calibration import estimate_folder, format_duration
+
+    estimate = estimate_folder(folder, options, refresh, measure)
+    calibration = estimate['calibration']
+    print(f"⏱️  Estimated {format_duration(estimate['seconds'])} for {estimate['files']} files "
+          f"({estimate['large_files']} large, {estimate['bytes'] / 1024 / 1024:.1f} MB; "
+          f"{calibration['source']} calibration)")
+    return estimate
+
+def command_estimate(args):
+    """Estimate how long organizing a folder will take, without changing it"""
+    try:
+        estimate = print_estimate(args.folder, get_options_from_args(args), args.recalibrate, measure=True)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    calibration = estimate['calibration']
+    print(f"   stat {calibration['stat_seconds'] * 1e6:.0f} µs, "
+          f"rename {calibration['rename_seconds'] * 1e6:.0f} µs, "
+          f"small copy {calibration['small_copy_seconds'] * 1e6:.0f} µs, "
+          f"large copy {calibration['copy_bytes_per_second'] / 1024 / 1024:.0f} MB/s")
+    return 0
+
+def print_slow_operations(report, limit=5):
+    """Print how many placements were slow and the slowest of them"""
+    slow = report.get('slow_operations', [])
+    if not slow:
+        return
+    print(f"   🐢 {len(slow)} slow operations")
+    for operation in slow[:limit]:
+        print(f"      {operation['category']}/{operation['file']}: {operation['seconds']:.2f}s")
+
+def print_concurrency(report):
+    """Print how the tuner sized each worker pool, with its latest decisions"""
+    from concurrency import format_decision
+
+    for pool, tuning in report.get('concurrency', {}).items():
+        if not tuning['decisions']:
+            continue
+        print(f"   ⚙️  {pool} files: {tuning['initial']} → {tuning['final']} workers "
+              f"(peak {tuning['peak']} of {tuning['max']}, {len(tuning['decisions'])} adjustments)")
+        for decision in tuning['decisions'][-3:]:
+            print(f"      {format_decision(decision, tuning['unit'])}")
+
+def command_organize(args):
+    """Organize a single folder and write its summaries"""
+    from file_organizer import organize_folder, get_category_stats
+    from summary_writer import write_reports
+    from stats_report import load_numpy
+    from throttle import start_throttle_watcher
+
+    if args.stats and args.chunk_size:
+        print("❌ Error: --stats needs the file lists a run with --chunk-size doesn't keep")
+        return 1
+
+    watcher = start_throttle_watcher(args.throttle_file) if args.throttle_file else None
+
+    print(f"📁 Organizing {args.folder} ({args.mode})")
+    try:
+        print_estimate(args.folder, get_options_from_args(args))
+        report = {}
+        organized_files = organize_folder(args.folder, get_options_from_args(args), report, print_progress)
+        statistics = args.stats
+        if statistics:
+            try:
+                load_numpy()
+            except ImportError as e:
+                print(f"⚠️  {e}")
+                statistics = False
+        # Category summaries and the statistics report in one pass over the results
+        write_reports(args.folder, organized_files, report, statistics=statistics)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+    finally:
+        if watcher:
+            watcher.set()
+
+    stats = get_category_stats(organized_files)
+    print(f"✅ Successfully organized {stats.pop('total')} files")
+    if report.get('ignored'):
+        print(f"   🙈 Skipped {len(report['ignored'])} ignored files")
+    for failure in report.get('failed', []):
+        print(f"   ⚠️  {failure['file']} not moved: {failure['error']}")
+    for archive in report.get('packs', []):
+        print(f"   📦 {archive['category']}/{archive['archive']}: {archive['members']} files packed")
+    for category, count in stats.items():
+        if count:
+            print(f"   📁 {category}: {count} files")
+    print_slow_operations(report)
+    print_concurrency(report)
+    if report.get('snapshot'):
+        print(f"   📸 Snapshot of {report['snapshot']['entries']} files: {report['snapshot']['path']}")
+
+    return 1 if report.get('failed') else 0
+
+def print_job_result(result):
+    """Print one finished batch job"""
+    status = "✅" if result['status'] == 0 else "❌"
+    detail = result['error'] or f"{result['stats'].get('total', 0)} files"
+    print(f"   {status} {result['folder']} ({detail}, {result['seconds']:.1f}s)")
+
+def command_batch(args):
+    """Organize many folders on a process pool"""
+    from batch_runner import expand_folder_patterns, run_batch, get_batch_exit_status
+    from summary_writer import create_batch_report
+
+    folders = expand_folder_patterns(args.folders)
+    if not folders:
+        print("❌ Error: No folders matched")
+        return 1
+
+    print(f"📁 Organizing {len(folders)} folders ({args.mode})")
+    batch = run_batch(
+        folders, get_options_from_args(args),
+        max_workers=args.workers,
+        per_device_limit=args.per_device,
+        progress_callback=print_job_result
+    )
+
+    if args.report:
+        create_batch_report(args.report, batch)
+        print(f"📊 Batch report written to {args.report}")
+
+    status = get_batch_exit_status(batch)
+    failed = sum(1 for job in batch['jobs'] if job['status'] != 0)
+    print(f"{'✅' if status == 0 else '❌'} {len(batch['jobs']) - failed} succeeded, {failed} failed")
+    return status
+
+def command_shard_worker(args):
+    """Join a sharded run and organize the shards this worker can claim"""
+    from sharding import run_shard_worker
+    from file_organizer import get_category_stats
+
+    print(f"📁 Worker joining sharded run '{args.run_id}' on {args.folder}")
+    try:
+        organized_files = run_shard_worker(
+            args.folder, args.run_id,
+            worker_id=args.worker_id,
+            shard_count=args.shards,
+            lease_seconds=args.lease_seconds,
+            options=get_options_from_args(args),
+            progress_callback=print_progress
+        )
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    print(f"✅ This worker organized {get_category_stats(organized_files)['total']} files")
+    return 0
+
+def command_rebalance(args):
+    """Move flat files of oversized category folders into fan-out buckets"""
+    from fanout import rebalance_folder
+
+    print(f"📁 Rebalancing category folders of {args.folder}")
+    try:
+        results = rebalance_folder(
+            args.folder, args.threshold, args.scheme, args.width, args.workers
+        )
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    for category, moved in results.items():
+        print(f"   📁 {category}: {moved} files moved into buckets")
+    print(f"✅ Rebalanced {len(results)} categories")
+    return 0
+
+def command_pack(args):
+    """Pack cold files of an organized folder into per-category archives"""
+    from packer import pack_folder, describe_pack
+    from ignore_rules import load_rules
+
+    print(f"📦 Packing files older than {args.older_than:g} days in {args.folder}")
+    try:
+        result = pack_folder(
+            args.folder, args.older_than, args.compression, args.workers,
+            rules=load_rules(args.folder)
+        )
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    for archive in result['archives']:
+        print(f"   📦 {archive['category']}/{describe_pack(archive)}")
+    print(f"✅ Packed {sum(a['members'] for a in result['archives'])} files into {len(result['archives'])} archives")
+    return 0
+
+def command_extract(args):
+    """Extract a single member from a packed archive"""
+    from packer import extract_member
+
+    try:
+        path = extract_member(args.archive, args.member, args.to)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    print(f"✅ Extracted {path}")
+    return 0
+
+def command_snapshot(args):
+    """Save a sorted snapshot of a folder without organizing it"""
+    from snapshots import write_snapshot
+    from ignore_rules import load_rules
+
+    try:
+        snapshot = write_snapshot(args.folder, load_rules(args.folder, args.ignore))
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    print(f"📸 Snapshot of {snapshot['entries']} files: {snapshot['path']}")
+    return 0
+
+def get_diff_paths(old, new):
+    """Resolve the diff arguments: two snapshot files, or a folder and its latest two snapshots"""
+    from snapshots import list_snapshots
+
+    if new is not None:
+        return old, new
+
+    snapshots = list_snapshots(old)
+    if len(snapshots) < 2:
+        raise ValueError(f"{old} has {len(snapshots)} snapshots, diff needs two")
+    return snapshots[-2], snapshots[-1]
+
+def command_diff(args):
+    """Compare two snapshots and print what was added, removed, moved or modified"""
+    import json
+    from snapshots import diff_snapshots, count_changes, format_change
+
+    try:
+        old_path, new_path = get_diff_paths(args.old, args.new)
+        changes = diff_snapshots(old_path, new_path)
+        if args.output:
+            # Every change as a JSON line; only the counts stay in memory
+            with open(args.output, 'w', encoding='utf-8') as f:
+                def write_changes():
+                    for change in changes:
+                        f.write(json.dumps(change, ensure_ascii=False) + "\n")
+                        yield change
+                result = count_changes(write_changes(), args.limit)
+        else:
+            result = count_changes(changes, args.limit)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    print(f"🔍 {old_path} → {new_path}")
+    for change in result['changes']:
+        print(f"   {format_change(change)}")
+    total = sum(result['counts'].values())
+    if total > len(result['changes']):
+        print(f"   ... {total - len(result['changes'])} more")
+    print("✅ " + ", ".join(f"{count} {change}" for change, count in result['counts'].items()))
+    if args.output:
+        print(f"📄 Changes written to {args.output}")
+    return 0
+
+def command_journal(args):
+    """Print the operations recorded in a folder's latest journal (or a given journal file)"""
+    from collections import Counter
+    from journal import read_journal, get_latest_journal
+
+    journal_path = args.file or get_latest_journal(args.folder)
+    if journal_path is None:
+        print(f"❌ Error: no journal found in {args.folder}")
+        return 1
+
+    counts = Counter()
+    try:
+        for entry in read_journal(journal_path):
+            counts[entry['op']] += 1
+            if sum(counts.values()) <= args.limit:
+                print(f"   {entry['op']}: {entry['source']} → {entry['destination']}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    total = sum(counts.values())
+    if total > args.limit:
+        print(f"   ... {total - args.limit} more")
+    print(f"📒 {journal_path}: " + (", ".join(f"{count} {op}" for op, count in counts.items()) or "no entries"))
+    return 0
+
+def build_parser():
+    """Build the argument parser with all sub-commands"""
+    parser = argparse.ArgumentParser(prog='main.py', description="Folder Organizer command line")
+    commands = parser.add_subparsers(dest='command')
+
+    organize_parser = commands.add_parser('organize', help="Organize a folder")
+    organize_parser.add_argument('folder', help="Folder to organize")
+    organize_parser.add_argument('--stats', action='store_true',
+                                 help="Also write STATISTICS_REPORT.txt (size/age percentiles, needs NumPy)")
+    add_organize_arguments(organize_parser)
+    organize_parser.set_defaults(handler=command_organize)
+
+    estimate_parser = commands.add_parser('estimate', help="Estimate how long organizing a folder will take")
+    estimate_parser.add_argument('folder', help="Folder to estimate")
+    estimate_parser.add_argument('--recalibrate', action='store_true',
+                                 help="Measure the filesystem again instead of using the cached calibration")
+    add_organize_arguments(estimate_parser)
+    estimate_parser.set_defaults(handler=command_estimate)
+
+    batch_parser = commands.add_parser('batch', help="Organize many folders on a process pool")
+    batch_parser.add_argument('folders', nargs='+', help="Folders or glob patterns (e.g. '/home/*/Downloads')")
+    batch_parser.add_argument('--workers', type=positive_int, default=None,
+                              help="Worker processes (default: CPU count)")
+    batch_parser.add_argument('--per-device', type=positive_int, default=1,
+                              help="Maximum concurrent jobs per storage device")
+    batch_parser.add_argument('--report', default=None, help="Write an aggregated batch report here")
+    add_organize_arguments(batch_parser)
+    batch_parser.set_defaults(handler=command_batch)
+
+    shard_parser = commands.add_parser('shard-worker', help="Organize part of a huge folder alongside other workers")
+    shard_parser.add_argument('folder', help="Folder shared by all workers")
+    shard_parser.add_argument('--run-id', required=True, help="Same id for every worker of the run")
+    shard_parser.add_argument('--shards', type=int, default=64, help="Number of shards (same for every worker)")
+    shard_parser.add_argument('--lease-seconds', type=float, default=60, help="Lease duration before a shard can be recovered")
+    shard_parser.add_argument('--worker-id', default=None, help="Worker id (default: host-pid)")
+    add_organize_arguments(shard_parser)
+    shard_parser.set_defaults(handler=command_shard_worker)
+
+    rebalance_parser = commands.add_parser('rebalance', help="Fan out existing oversized category folders")
+    rebalance_parser.add_argument('folder', help="Organized folder")
+    rebalance_parser.add_argument('--threshold', type=int, default=10000,
+                                  help="Rebalance categories with more flat entries than this")
+    rebalance_parser.add_argument('--scheme', choices=['hash', 'date'], default='hash')
+    rebalance_parser.add_argument('--width', type=int, default=2, help="Hex digits of the hash prefix")
+    rebalance_parser.add_argument('--workers', type=int, default=8, help="Parallel move threads")
+    rebalance_parser.set_defaults(handler=command_rebalance)
+
+    pack_parser = commands.add_parser('pack', help="Pack cold files of an organized folder into archives")
+    pack_parser.add_argument('folder', help="Organized folder")
+    pack_parser.add_argument('--older-than', type=float, required=True, metavar='DAYS',
+                             help="Pack files last modified more than this many days ago")
+    pack_parser.add_argument('--compression', choices=['none', 'gz', 'xz'], default='gz')
+    pack_parser.add_argument('--workers', type=int, default=None, help="Packing processes (default: CPU count)")
+    pack_parser.set_defaults(handler=command_pack)
+
+    extract_parser = commands.add_parser('extract', help="Extract one file from a packed archive")
+    extract_parser.add_argument('archive', help="Archive in a category's packs folder")
+    extract_parser.add_argument('member', help="Member path as listed in the summary")
+    extract_parser.add_argument('--to', default='.', help="Destination folder")
+    extract_parser.set_defaults(handler=command_extract)
+
+    snapshot_parser = commands.add_parser('snapshot', help="Save a sorted snapshot of a folder")
+    snapshot_parser.add_argument('folder', help="Folder to list")
+    snapshot_parser.add_argument('--ignore', action='append', default=[], metavar='PATTERN',
+                                 help="Leave out files matching this gitignore-style pattern (repeatable)")
+    snapshot_parser.set_defaults(handler=command_snapshot)
+
+    diff_parser = commands.add_parser('diff', help="Show what changed between two snapshots")
+    diff_parser.add_argument('old', help="Older snapshot, or a folder to compare its latest two snapshots")
+    diff_parser.add_argument('new', nargs='?', default=None, help="Newer snapshot")
+    diff_parser.add_argument('--limit', type=int, default=20, help="Changes to print (counts cover all)")
+    diff_parser.add_argument('--output', default=None, metavar='PATH',
+                             help="Write every change to this file as JSON lines")
+    diff_parser.set_defaults(handler=command_diff)
+
+    journal_parser = commands.add_parser('journal', help="Show the operations recorded by the latest run")
+    journal_parser.add_argument('folder', help="Organized folder")
+    journal_parser.add_argument('--file', default=None, metavar='PATH',
+                                help="Read this journal instead of the folder's latest one")
+    journal_parser.add_argument('--limit', type=int, default=20, help="Operations to print (counts cover all)")
+    journal_parser.set_defaults(handler=command_journal)
+
+    return parser
+
+def run_cli(argv=None):
+    """Parse arguments and run the selected command; returns the exit status"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not getattr(args, 'handler', None):
+        parser.print_help()
+        return 2
+
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(run_cli())
@@ -0,0 +1,231 @@
+"""
+Concurrency - Adaptive worker counts for the move and copy pools
+No OOP patterns used - functional approach
+
+An AIMD controller (additive increase, multiplicative decrease, as in TCP
+congestion control) tunes how many workers of a pool may run at once.
+Every window it compares the pool's mean placement latency with the
+lowest latency seen so far and its throughput with the previous window's:
+while latency stays near the baseline and throughput keeps growing, one
+worker is added (doubling instead until the first congestion signal, like
+TCP slow start, so short runs reach a useful size); when latency balloons
+(requests queue up on a congested share) or an added worker made
+throughput drop, the limit is cut by a factor. A pool never exceeds its configured maximum, and the limit is
+held while the throttle is what bounds throughput.
+"""
+
+import time
+import threading
+
+from throttle import get_throttle_stats
+
+CONCURRENCY_MODES = ('fixed', 'auto')
+
+# Upper bound of each pool's worker count in auto mode
+DEFAULT_MAX_WORKERS = 32
+
+# Seconds and placements (started within the window) a window needs
+# before the limit is adjusted
+TUNE_INTERVAL = 0.5
+MIN_WINDOW_PLACEMENTS = 8
+
+INCREASE_STEP = 1
+DECREASE_FACTOR = 0.7
+
+# Latency above baseline × this is treated as congestion
+LATENCY_TOLERANCE = 2.0
+# Throughput below the previous window's × this undoes an increase
+THROUGHPUT_TOLERANCE = 0.9
+# The baseline may rise by this factor per window, so a share that got
+# slower for good is not mistaken for a congested one forever
+BASELINE_DRIFT = 1.05
+
+# Decisions kept per pool for reports
+MAX_DECISIONS = 200
+
+def create_tuner(name, initial, max_workers, unit='files'):
+    """Create the controller of one worker pool
+
+    ``unit`` is what throughput is measured in: 'files' for the
+    metadata-bound small-file pool, 'bytes' for the large-file pool.
+    """
+    initial = max(1, min(initial, max_workers))
+    return {
+        'name': name,
+        'unit': unit,
+        'limit': initial,
+        'initial': initial,
+        'max': max_workers,
+        'peak': initial,
+        'active': 0,
+        'condition': threading.Condition(),
+        'started': time.perf_counter(),
+        'window': create_window(),
+        'baseline': None,
+        'last_throughput': None,
+        'last_action': None,
+        'slow_start': True,
+        'decisions': []
+    }
+
+def create_window():
+    """Start a new measurement window"""
+    return {
+        'started': time.perf_counter(),
+        'placements': 0,  # All completed placements, for throughput
+        'bytes': 0,
+        'timed': 0,       # Placements started under the current limit, for latency
+        'seconds': 0.0,
+        'throttled': get_throttle_stats()['throttled_seconds']
+    }
+
+def acquire_slot(tuner):
+    """Wait until the pool's current limit lets one more worker run"""
+    with tuner['condition']:
+        while tuner['active'] >= tuner['limit']:
+            tuner['condition'].wait()
+        tuner['active'] += 1
+
+def release_slot(tuner, started=None, size=0):
+    """Give a slot back, recording the placement it ran (if any)
+
+    ``started`` is the placement's time.perf_counter() start. Placements
+    that began before the current window ran under the previous limit, so
+    they count towards throughput but not latency.
+    """
+    with tuner['condition']:
+        tuner['active'] -= 1
+        if started is not None:
+            window = tuner['window']
+            window['placements'] += 1
+            window['bytes'] += size
+            if started >= window['started']:
+                window['timed'] += 1
+                window['seconds'] += time.perf_counter() - started
+            adjust_limit(tuner)
+        tuner['condition'].notify_all()
+
+def record_decision(tuner, limit, reason, latency, throughput):
+    """Change the limit and keep the decision for the report"""
+    tuner['limit'] = limit
+    tuner['peak'] = max(tuner['peak'], limit)
+    tuner['decisions'].append({
+        'seconds': round(time.perf_counter() - tuner['started'], 3),
+        'workers': limit,
+        'reason': reason,
+        'latency': latency,
+        'throughput': throughput
+    })
+    del tuner['decisions'][:-MAX_DECISIONS]
+
+def adjust_limit(tuner):
+    """Close the window once it is long enough and apply the AIMD rule (condition held)"""
+    window = tuner['window']
+    elapsed = time.perf_counter() - window['started']
+    if elapsed < TUNE_INTERVAL or window['timed'] < MIN_WINDOW_PLACEMENTS:
+        return
+
+    latency = window['seconds'] / window['timed']
+    amount = window['bytes'] if tuner['unit'] == 'bytes' else window['placements']
+    throughput = amount / elapsed
+    throttled = get_throttle_stats()['throttled_seconds'] > window['throttled']
+
+    baseline = tuner['baseline']
+    tuner['baseline'] = latency if baseline is None else min(latency, baseline * BASELINE_DRIFT)
+    limit = tuner['limit']
+    decreased = max(1, int(limit * DECREASE_FACTOR))
+
+    if throttled:
+        # More workers would only wait longer for throttle tokens
+        action = 'hold'
+    elif baseline is not None and latency > baseline * LATENCY_TOLERANCE and limit > 1:
+        action = 'decrease'
+        tuner['slow_start'] = False
+        record_decision(tuner, decreased, f"latency {latency * 1000:.1f} ms over "
+                        f"{LATENCY_TOLERANCE:g}× baseline {baseline * 1000:.1f} ms", latency, throughput)
+    elif (tuner['last_action'] == 'increase' and tuner['last_throughput']
+          and throughput < tuner['last_throughput'] * THROUGHPUT_TOLERANCE and limit > 1):
+        action = 'decrease'
+        tuner['slow_start'] = False
+        record_decision(tuner, decreased, "throughput fell after adding a worker", latency, throughput)
+    elif limit < tuner['max'] and tuner['slow_start']:
+        action = 'increase'
+        record_decision(tuner, min(tuner['max'], limit * 2), "slow start", latency, throughput)
+    elif limit < tuner['max']:
+        action = 'increase'
+        record_decision(tuner, min(tuner['max'], limit + INCREASE_STEP), "latency near baseline", latency, throughput)
+    else:
+        action = 'hold'
+
+    tuner['last_action'] = action
+    tuner['last_throughput'] = throughput
+    tuner['window'] = create_window()
+
+def run_adaptive(items, process_item, tuner, size_of=None, executor=None):
+    """Process items on up to tuner['max'] threads, as many at once as the tuner allows
+
+    ``size_of(item)`` gives the bytes a placement moved, for byte-based
+    tuners. With an ``executor`` (of tuner['max'] threads) the workers run
+    on its threads, so repeated calls reuse them instead of starting new
+    ones. The first failure stops the pool and is re-raised.
+    """
+    iterator = iter(items)
+    lock = threading.Lock()
+    errors = []
+
+    def worker():
+        while True:
+            acquire_slot(tuner)
+            with lock:
+                item = None if errors else next(iterator, None)
+            if item is None:
+                release_slot(tuner)
+                return
+
+            started = time.perf_counter()
+            try:
+                process_item(item)
+            except BaseException as e:
+                with lock:
+                    errors.append(e)
+                release_slot(tuner)
+                return
+            release_slot(tuner, started, size_of(item) if size_of else 0)
+
+    count = min(tuner['max'], len(items))
+    if executor is not None:
+        for future in [executor.submit(worker) for _ in range(count)]:
+            future.result()
+    else:
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+
+def get_worker_limits(tuners):
+    """Current worker limit of every tuned pool, e.g. {'small': 6, 'large': 2}"""
+    return {name: tuner['limit'] for name, tuner in tuners.items()}
+
+def get_tuner_report(tuner):
+    """Summarize a pool's tuning for the run report"""
+    return {
+        'initial': tuner['initial'],
+        'final': tuner['limit'],
+        'peak': tuner['peak'],
+        'max': tuner['max'],
+        'unit': tuner['unit'],
+        'decisions': list(tuner['decisions'])
+    }
+
+def format_decision(decision, unit='files'):
+    """Format one tuning decision for progress and profile output"""
+    if unit == 'bytes':
+        throughput = f"{decision['throughput'] / 1024 / 1024:.1f} MB/s"
+    else:
+        throughput = f"{decision['throughput']:.0f} files/s"
+    return (f"{decision['seconds']:7.2f}s → {decision['workers']:2d} workers "
+            f"({decision['reason']}; {decision['latency'] * 1000:.2f} ms/file, {throughput})")
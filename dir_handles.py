@@ -0,0 +1,86 @@
+"""
+Directory Handles - File operations relative to open directory descriptors
+No OOP patterns used - functional approach
+
+Opening the source folder and each category folder once lets every later
+existence check and rename resolve a single path component instead of the
+full absolute path, which matters on deep or network-mounted trees.
+"""
+
+import os
+import threading
+
+def supports_dir_fd():
+    """Check if this platform supports the *at() calls the engine relies on"""
+    return (
+        os.open in os.supports_dir_fd
+        and os.stat in os.supports_dir_fd
+        and os.rename in os.supports_dir_fd
+        and os.mkdir in os.supports_dir_fd
+        and os.scandir in os.supports_fd
+    )
+
+def open_directory(path, dir_fd=None):
+    """Open a directory and return its file descriptor"""
+    flags = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)
+    return os.open(path, flags, dir_fd=dir_fd)
+
+def open_dir_handles(base_folder):
+    """Open the base folder and return the handle state for a run"""
+    return {
+        'base_path': base_folder,
+        'base': open_directory(base_folder),
+        'categories': {},
+        # Concurrent workers may open the same category folder
+        'lock': threading.RLock()
+    }
+
+def get_category_fd(handles, category):
+    """Get the descriptor of a category folder, creating and opening it once
+
+    ``category`` may be a nested relative path such as "Images/3f"; each
+    level is opened relative to its parent.
+    """
+    fd = handles['categories'].get(category)
+    if fd is not None:
+        return fd
+
+    with handles['lock']:
+        fd = handles['categories'].get(category)
+        if fd is not None:
+            return fd
+
+        parent, name = os.path.split(category)
+        parent_fd = get_category_fd(handles, parent) if parent else handles['base']
+
+        try:
+            os.mkdir(name, dir_fd=parent_fd)
+        except FileExistsError:
+            pass
+
+        fd = open_directory(name, dir_fd=parent_fd)
+        handles['categories'][category] = fd
+        return fd
+
+def close_dir_handles(handles):
+    """Close every descriptor opened for a run"""
+    if handles is None:
+        return
+
+    for fd in handles['categories'].values():
+        os.close(fd)
+    handles['categories'].clear()
+
+    os.close(handles['base'])
+
+def exists_at(dir_fd, name):
+    """Check if a name exists inside an open directory"""
+    try:
+        os.stat(name, dir_fd=dir_fd, follow_symlinks=False)
+        return True
+    except FileNotFoundError:
+        return False
+
+def rename_at(src_dir_fd, src_name, dst_dir_fd, dst_name):
+    """Rename between two open directories"""
+    os.rename(src_name, dst_name, src_dir_fd=src_dir_fd, dst_dir_fd=dst_dir_fd)
@@ -0,0 +1,197 @@
+"""
+Durability - fsync policies for moves, journals and reports
+No OOP patterns used - functional approach
+
+A rename is only safe after a power loss once the directories it touched
+are synced, and a copy once its data is synced too. Levels:
+
+- 'none': leave it to the operating system (fastest, the old behaviour)
+- 'batched': copied files and the journal are synced in batches, and each
+  destination folder is synced once every N placements and at the end
+  (a verified move still syncs each copy before deleting its original)
+- 'strict': every placed file, its folders and every journal line are
+  synced before the run moves on
+"""
+
+import os
+import threading
+
+DURABILITY_LEVELS = ('none', 'batched', 'strict')
+
+# Placements per destination folder between two batched directory syncs
+DEFAULT_DURABILITY_BATCH = 256
+
+def sync_file(path):
+    """Flush a file's data and metadata to disk"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def sync_directory(path):
+    """Flush a directory's entries to disk
+
+    Platforms that can't open directories (Windows) commit renames
+    themselves, so this is a no-op there.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+    except (PermissionError, IsADirectoryError):
+        return False
+    try:
+        os.fsync(fd)
+    except OSError:
+        return False  # Some filesystems reject fsync on directories
+    finally:
+        os.close(fd)
+    return True
+
+def create_durability(level='none', batch_size=DEFAULT_DURABILITY_BATCH):
+    """Create the durability state of a run"""
+    if level not in DURABILITY_LEVELS:
+        raise ValueError(f"Unknown durability level: {level}")
+    if batch_size < 1:
+        raise ValueError("Durability batch size must be at least 1")
+
+    return {
+        'level': level,
+        'batch_size': batch_size,
+        'pending_dirs': {},   # directory -> placements since its last sync
+        'pending_files': [],  # written files whose data isn't synced yet
+        'file_syncs': 0,
+        'dir_syncs': 0,
+        'lock': threading.Lock()
+    }
+
+def count_syncs(durability, files=0, dirs=0):
+    """Add to a run's sync counters"""
+    with durability['lock']:
+        durability['file_syncs'] += files
+        durability['dir_syncs'] += dirs
+
+def sync_paths(durability, files, dirs):
+    """Sync files first, then the directories that name them"""
+    synced_files = 0
+    for path in files:
+        try:
+            sync_file(path)
+            synced_files += 1
+        except FileNotFoundError:
+            pass  # Removed since it was written (e.g. replaced by a later report)
+    synced_dirs = sum(1 for path in dirs if sync_directory(path))
+    count_syncs(durability, synced_files, synced_dirs)
+
+def record_placement(durability, destination_path, source_dir=None, wrote_data=False):
+    """Record a file placed at ``destination_path`` and sync per the level
+
+    ``source_dir`` is the folder a file was moved out of; ``wrote_data`` is
+    set when the destination has new data (copies) rather than a renamed
+    or linked entry.
+    """
+    if durability is None or durability['level'] == 'none':
+        return
+
+    destination_dir = os.path.dirname(destination_path)
+    dirs = [destination_dir] + ([source_dir] if source_dir and source_dir != destination_dir else [])
+
+    if durability['level'] == 'strict':
+        sync_paths(durability, [destination_path] if wrote_data else [], dirs)
+        return
+
+    with durability['lock']:
+        if wrote_data:
+            durability['pending_files'].append(destination_path)
+        if source_dir:
+            durability['pending_dirs'].setdefault(source_dir, 0)
+        count = durability['pending_dirs'].get(destination_dir, 0) + 1
+        durability['pending_dirs'][destination_dir] = count
+        if count < durability['batch_size']:
+            return
+
+        # Take the batch under the lock, sync it outside so other workers keep going
+        files = [path for path in durability['pending_files'] if os.path.dirname(path) == destination_dir]
+        durability['pending_files'] = [
+            path for path in durability['pending_files'] if os.path.dirname(path) != destination_dir
+        ]
+        del durability['pending_dirs'][destination_dir]
+        source_pending = source_dir in durability['pending_dirs']
+        if source_pending:
+            del durability['pending_dirs'][source_dir]
+
+    sync_paths(durability, files, [destination_dir] + ([source_dir] if source_pending else []))
+
+def sync_before_removal(durability, copy_path):
+    """Make a copy durable before its original is deleted
+
+    Batching can't apply here: if the original went first, a crash could
+    lose both. Does nothing at level 'none'.
+    """
+    if durability is None or durability['level'] == 'none':
+        return
+    sync_paths(durability, [copy_path], [os.path.dirname(copy_path)])
+
+def record_removal(durability, directory):
+    """Record a folder that files were removed from and sync it per the level"""
+    if durability is None or durability['level'] == 'none':
+        return
+
+    if durability['level'] == 'strict':
+        sync_paths(durability, [], [directory])
+        return
+
+    with durability['lock']:
+        durability['pending_dirs'].setdefault(directory, 0)
+
+def record_written_file(durability, path, data_synced=False):
+    """Record a report or state file that was just written
+
+    ``data_synced`` skips the file itself when only its folder entry is
+    left to sync (see sync_before_replace).
+    """
+    if durability is None or durability['level'] == 'none':
+        return
+
+    files = [] if data_synced else [path]
+    if durability['level'] == 'strict':
+        sync_paths(durability, files, [os.path.dirname(path)])
+        return
+
+    with durability['lock']:
+        durability['pending_files'].extend(files)
+        durability['pending_dirs'].setdefault(os.path.dirname(path), 0)
+
+def sync_before_replace(durability, temp_path):
+    """Sync a temp file's data before it is renamed over its target
+
+    Done at both levels: a rename that outlives a crash must never point
+    at data that didn't. The folder is then synced per the level by
+    record_written_file.
+    """
+    if durability is None or durability['level'] == 'none':
+        return
+    sync_file(temp_path)
+    count_syncs(durability, files=1)
+
+def flush_durability(durability):
+    """Sync everything a batched run still has pending"""
+    if durability is None:
+        return
+
+    with durability['lock']:
+        files = durability['pending_files']
+        dirs = list(durability['pending_dirs'])
+        durability['pending_files'] = []
+        durability['pending_dirs'] = {}
+
+    if files or dirs:
+        sync_paths(durability, files, dirs)
+
+def get_durability_stats(durability):
+    """Get the level and sync counts of a run for its report"""
+    return {
+        'level': durability['level'],
+        'batch_size': durability['batch_size'],
+        'file_syncs': durability['file_syncs'],
+        'dir_syncs': durability['dir_syncs']
+    }
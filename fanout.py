@@ -0,0 +1,209 @@
+"""
+Fan-out - Shards oversized category folders into prefix subdirectories
+No OOP patterns used - functional approach
+
+A category folder that grows past a threshold is switched to a fan-out
+layout: files go to Category/<bucket>/<name>, where the bucket is a hash
+prefix of the name ("hash") or the file's modification month ("date").
+The chosen layout is recorded in a marker file inside the category folder
+so later runs, summaries and the rebalance tool all agree on it.
+"""
+
+import os
+import re
+import json
+import zlib
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from atomic_rename import rename_unique, rename_noreplace, move_noreplace, move_file_noclobber
+
+FANOUT_SCHEMES = ('hash', 'date')
+
+# Marker file describing the layout of a fanned-out category folder
+FANOUT_MARKER = '.fanout'
+
+# Files at the category root that belong to the organizer, not the user
+RESERVED_NAMES = {FANOUT_MARKER, 'summary.txt'}
+
+# Suffix of flat files moved aside while their name's bucket is created
+PARKED_SUFFIX = '.fanout-parked'
+
+DATE_BUCKET_PATTERN = re.compile(r'\d{4}-\d{2}\Z')
+
+def get_bucket(filename, layout, mtime=None):
+    """Get the bucket (sub folder name) of a file for a fan-out layout"""
+    if layout['scheme'] == 'date':
+        return datetime.fromtimestamp(mtime or 0).strftime("%Y-%m")
+
+    # Hex digits of a stable hash; width 2 gives 256 buckets, 3 gives 4096
+    return f"{zlib.crc32(os.fsencode(filename)):08x}"[:layout['width']]
+
+def read_fanout_layout(category_path, backend=None):
+    """Read the fan-out layout of a category folder, or None if it is flat"""
+    marker_path = os.path.join(category_path, FANOUT_MARKER)
+    try:
+        if backend is not None:
+            layout = json.loads(backend['read'](marker_path))
+        else:
+            with open(marker_path, 'r', encoding='utf-8') as f:
+                layout = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if layout.get('scheme') not in FANOUT_SCHEMES:
+        return None
+    return layout
+
+def write_fanout_layout(category_path, layout, backend=None):
+    """Record the fan-out layout of a category folder"""
+    marker_path = os.path.join(category_path, FANOUT_MARKER)
+    if backend is not None:
+        backend['makedirs'](category_path)
+        backend['write'](marker_path, json.dumps(layout))
+        return
+
+    os.makedirs(category_path, exist_ok=True)
+    with open(marker_path, 'w', encoding='utf-8') as f:
+        json.dump(layout, f)
+
+def count_flat_entries(category_path, backend=None):
+    """Count the entries directly inside a category folder, leaving out the organizer's own files"""
+    try:
+        if backend is not None:
+            return sum(1 for name in backend['listdir'](category_path) if name not in RESERVED_NAMES)
+        with os.scandir(category_path) as entries:
+            return sum(1 for entry in entries if entry.name not in RESERVED_NAMES)
+    except OSError:
+        return 0
+
+def choose_category_layout(category_path, incoming_count, threshold, scheme, width, backend=None):
+    """Decide the layout for a category receiving ``incoming_count`` files
+
+    An existing marker always wins. Otherwise the category is fanned out
+    once its current entries plus the incoming files exceed ``threshold``.
+    ``backend`` is the storage backend of the run (local files if None).
+    """
+    layout = read_fanout_layout(category_path, backend)
+    if layout or not threshold:
+        return layout
+
+    if count_flat_entries(category_path, backend) + incoming_count <= threshold:
+        return None
+
+    layout = {'scheme': scheme, 'width': width}
+    write_fanout_layout(category_path, layout, backend)
+    return layout
+
+def describe_layout(layout):
+    """Describe a fan-out layout for summaries"""
+    if not layout:
+        return "flat"
+    if layout['scheme'] == 'date':
+        return "date fan-out (one folder per month)"
+    return f"hash fan-out ({16 ** layout['width']} buckets)"
+
+def list_flat_files(category_path):
+    """List the user files still sitting at the root of a category folder"""
+    with os.scandir(category_path) as entries:
+        return [
+            entry.name for entry in entries
+            if entry.is_file(follow_symlinks=False) and entry.name not in RESERVED_NAMES
+        ]
+
+def is_bucket_name(name, layout):
+    """Check if a name has the shape of a bucket folder of a layout"""
+    if layout['scheme'] == 'date':
+        return DATE_BUCKET_PATTERN.match(name) is not None
+    return len(name) == layout['width'] and all(char in '0123456789abcdef' for char in name)
+
+def park_bucket_named_files(category_path, files, unsupported=None):
+    """Move flat files named like a bucket aside so the bucket folders can be created
+
+    Returns a dict of filename -> parked name.
+    """
+    parked = {}
+    for filename in files:
+        parked[filename] = rename_unique(
+            lambda source, destination: rename_noreplace(source, destination, unsupported=unsupported),
+            os.path.join(category_path, filename), category_path, filename + PARKED_SUFFIX
+        )
+    return parked
+
+def move_into_bucket(category_path, filename, layout, created_buckets, unsupported=None, parked_name=None):
+    """Move one flat file into its bucket; returns its new relative path
+
+    A file moved aside by park_bucket_named_files is read from
+    ``parked_name`` and keeps its original name inside the bucket.
+    """
+    source = os.path.join(category_path, parked_name or filename)
+    mtime = os.stat(source).st_mtime if layout['scheme'] == 'date' else None
+    bucket = get_bucket(filename, layout, mtime)
+
+    bucket_path = os.path.join(category_path, bucket)
+    if bucket not in created_buckets:
+        os.makedirs(bucket_path, exist_ok=True)
+        created_buckets.add(bucket)
+
+    if parked_name:
+        result = rename_unique(
+            lambda source, destination: move_noreplace(source, destination, unsupported),
+            source, bucket_path, filename
+        )
+        return os.path.join(bucket, result)
+
+    # No-replace renames keep parallel moves from clobbering each other in a bucket
+    result = move_file_noclobber(source, bucket_path, unsupported)
+    return os.path.join(bucket, result) if result else None
+
+def rebalance_category(category_path, scheme='hash', width=2, workers=8):
+    """Move the flat files of a category folder into fan-out buckets in parallel
+
+    Keeps an existing layout if the category already has one. Returns the
+    number of files moved.
+    """
+    layout = read_fanout_layout(category_path) or {'scheme': scheme, 'width': width}
+    write_fanout_layout(category_path, layout)
+
+    files = list_flat_files(category_path)
+    # Shared between threads; a lost race only means a redundant makedirs
+    created_buckets = set()
+    unsupported_renames = set()
+
+    # A flat file named like a bucket would make that bucket's makedirs fail
+    parked = park_bucket_named_files(
+        category_path, [filename for filename in files if is_bucket_name(filename, layout)], unsupported_renames
+    )
+    moved = [
+        move_into_bucket(category_path, filename, layout, created_buckets, unsupported_renames, parked_name)
+        for filename, parked_name in parked.items()
+    ]
+    files = [filename for filename in files if filename not in parked]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        moved += list(executor.map(
+            lambda filename: move_into_bucket(
+                category_path, filename, layout, created_buckets, unsupported_renames
+            ),
+            files
+        ))
+
+    return sum(1 for path in moved if path)
+
+def rebalance_folder(base_folder, threshold, scheme='hash', width=2, workers=8, categories=None):
+    """Rebalance every category folder with more than ``threshold`` flat entries
+
+    Returns a dict of category -> files moved.
+    """
+    from file_organizer import FILE_CATEGORIES
+
+    results = {}
+    for category in categories or FILE_CATEGORIES.keys():
+        category_path = os.path.join(base_folder, category)
+        if not os.path.isdir(category_path):
+            continue
+        if count_flat_entries(category_path) <= threshold and not read_fanout_layout(category_path):
+            continue
+        results[category] = rebalance_category(category_path, scheme, width, workers)
+
+    return results
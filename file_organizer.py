@@ -4,7 +4,42 @@ No OOP patterns used - functional approach
 """
 
 import os
-import shutil
+import time
+import array
+import errno
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from link_strategies import link_file, find_existing_link
+from journal import open_journal, append_journal_entry, close_journal
+from throttle import set_throttle_limits, throttle_operation, get_throttle_stats
+from file_utils import check_write_access
+from fanout import choose_category_layout, get_bucket, FANOUT_SCHEMES
+from locality import order_work, ORDERINGS
+from strategies import make_strategy, parse_strategy
+from ignore_rules import load_rules, is_ignored
+from packer import pack_folder, PACK_COMPRESSIONS
+from storage import get_backend, is_local_backend
+from metrics import (
+    create_metrics, instrument_backend, observe_latency, record_file, record_error,
+    start_metrics_writer, finish_metrics, DEFAULT_METRICS_INTERVAL
+)
+from concurrency import (
+    create_tuner, run_adaptive, get_worker_limits, get_tuner_report,
+    CONCURRENCY_MODES, DEFAULT_MAX_WORKERS
+)
+from durability import (
+    create_durability, record_placement, sync_before_removal, flush_durability, get_durability_stats,
+    DURABILITY_LEVELS, DEFAULT_DURABILITY_BATCH
+)
+from dir_handles import (
+    supports_dir_fd, open_dir_handles, close_dir_handles, get_category_fd,
+    rename_at, exists_at
+)
+from atomic_rename import rename_noreplace, move_noreplace, rename_unique
+from snapshots import write_snapshot
+from summary_writer import open_summary_spool, append_summary_spool, finish_summary_spool, discard_summary_spool
 
 # File categories and their extensions
 FILE_CATEGORIES = {
@@ -20,6 +55,44 @@ FILE_CATEGORIES = {
     'Others': []
 }
 
+# Supported ways of placing files into their category folders
+ORGANIZE_MODES = ('move', 'link', 'copy', 'verified_move')
+
+# Default options for organize_folder
+ORGANIZE_DEFAULTS = {
+    'mode': 'move',  # 'move' relocates files, 'link' leaves the originals in place
+    'checksum_algorithm': 'sha256',  # Used by the 'copy' and 'verified_move' modes
+    'reverify': False,  # Re-read each copy before trusting its streamed checksum
+    'journal': False,  # Record every operation under the .organizer folder
+    'max_bytes_per_second': None,  # Process-wide copy limit (None keeps the current limit)
+    'max_ops_per_second': None,  # Process-wide file operation limit (None keeps the current limit)
+    'use_dir_fd': None,  # Move relative to open directory handles (None = when supported)
+    'lean': True,  # Create category folders once per run instead of probing per file
+    'fanout_threshold': None,  # Entries after which a category is split into sub folders
+    'fanout_scheme': 'hash',  # 'hash' (name prefix) or 'date' (modification month)
+    'fanout_width': 2,  # Hex digits of the hash prefix (2 = 256 buckets)
+    'ordering': 'listdir',  # 'listdir', 'inode' or 'extent' (physical order for spinning disks)
+    'large_file_threshold': 8 * 1024 * 1024,  # Files this big are scheduled as large copies
+    'small_file_workers': 1,  # Threads for small-file (metadata-bound) work
+    'large_file_workers': 1,  # Threads for large sequential copies
+    'concurrency': 'fixed',  # 'auto' tunes both pools at runtime, starting from the counts above
+    'max_workers': DEFAULT_MAX_WORKERS,  # Upper bound of each pool in auto mode
+    'strategy': 'extension',  # Sub folder layers, e.g. 'extension+month' or 'extension+size'
+    'ignore': (),  # Extra gitignore-style patterns, on top of the folder's .organizerignore
+    'ignore_defaults': True,  # Skip partial downloads, lock files and the organizer's reports
+    'pack_older_than_days': None,  # Pack files older than this into per-category archives
+    'pack_compression': 'gz',  # 'none', 'gz' or 'xz'
+    'pack_workers': None,  # Packing processes (default: CPU count)
+    'backend': None,  # Storage backend from storage.py; None means the local filesystem
+    'durability': 'none',  # 'none', 'batched' or 'strict' fsync of moves, journal and summaries
+    'durability_batch': DEFAULT_DURABILITY_BATCH,  # Placements per folder between batched syncs
+    'metrics_file': None,  # node-exporter textfile (*.prom) rewritten during and after the run
+    'metrics_interval': DEFAULT_METRICS_INTERVAL,  # Seconds between textfile rewrites
+    'slow_operation_seconds': 5.0,  # Placements taking this long are logged as slow (None = off)
+    'snapshot': False,  # Write a sorted snapshot of the organized folder for later diffs
+    'chunk_size': None,  # Files scanned, placed and flushed per batch (None = the whole folder at once)
+}
+
 def categorize_file(filename):
     """Categorize a file based on its extension"""
     file_ext = os.path.splitext(filename)[1].lower()
@@ -31,35 +104,356 @@ def categorize_file(filename):
     # If no category matches, put in "Others"
     return "Others"
 
-def get_unique_filename(filepath):
+def get_unique_filename(filepath, exists=os.path.exists):
     """Generate a unique filename if the destination already exists"""
-    if not os.path.exists(filepath):
+    if not exists(filepath):
         return filepath
     
     name, ext = os.path.splitext(filepath)
     counter = 1
     
-    while os.path.exists(f"{name}_{counter}{ext}"):
+    while exists(f"{name}_{counter}{ext}"):
         counter += 1
     
     return f"{name}_{counter}{ext}"
 
-def move_file_to_category(source_path, destination_path):
-    """Move a file to its category folder with error handling"""
+def move_file_to_category(source_path, destination_path, create_dirs=True, resolve_name=True,
+                          backend=None):
+    """Move a file to its category folder with error handling
+    
+    With ``resolve_name`` a taken name gets the next free suffix. Each try
+    is an atomic no-replace rename, so a free name costs one rename and a
+    file that appears at the destination meanwhile is never overwritten.
+    """
+    backend = get_backend(backend)
+    
     try:
-        # Handle duplicate filenames
-        destination_path = get_unique_filename(destination_path)
-        
         # Create destination directory if it doesn't exist
-        os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+        if create_dirs:
+            backend['makedirs'](os.path.dirname(destination_path))
+        
+        if resolve_name:
+            return True, rename_unique(
+                backend['rename_noreplace'], source_path,
+                os.path.dirname(destination_path), os.path.basename(destination_path)
+            )
         
         # Move the file
-        shutil.move(source_path, destination_path)
+        backend['rename'](source_path, destination_path)
         return True, os.path.basename(destination_path)
         
     except Exception as e:
         return False, str(e)
 
+def move_file_at(handles, filename, category, destination_name=None, metrics=None, unsupported=None):
+    """Move a file to its category folder relative to open directory handles
+
+    ``category`` is the destination folder relative to the base folder,
+    e.g. "Images" or "Images/3f" for a fanned-out category. A
+    ``destination_name`` reserved by the caller is used as is; otherwise
+    no-replace renames try the next suffix until one is free (see
+    atomic_rename.py, whose ``unsupported`` methods are skipped). Renames
+    are timed into ``metrics`` when given.
+    """
+    try:
+        category_fd = get_category_fd(handles, category)
+        
+        started = time.perf_counter()
+        try:
+            if destination_name is None:
+                destination_name = rename_unique(
+                    lambda source, name: rename_noreplace(source, name, handles['base'], category_fd, unsupported),
+                    filename, '', filename
+                )
+            else:
+                rename_at(handles['base'], filename, category_fd, destination_name)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                record_error(metrics, 'rename', e)
+                raise
+            # Category folder is another filesystem mounted inside the base folder
+            base_path = handles['base_path']
+            destination_name = rename_unique(
+                move_noreplace, os.path.join(base_path, filename),
+                os.path.join(base_path, category), destination_name or filename
+            )
+        observe_latency(metrics, 'rename', time.perf_counter() - started)
+        
+        return True, destination_name
+        
+    except Exception as e:
+        return False, str(e)
+
+def link_file_to_category(source_path, destination_path, unsupported=None, create_dirs=True,
+                          resolve_name=True):
+    """Place a link to a file in its category folder, leaving the original in place"""
+    try:
+        if create_dirs:
+            os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+
+        # A previous link run already placed this exact file here, maybe under a name_N
+        existing = find_existing_link(source_path, destination_path)
+        if existing:
+            return True, os.path.basename(existing), 'existing'
+
+        # Handle duplicate filenames
+        if resolve_name:
+            destination_path = get_unique_filename(destination_path)
+
+        strategy = link_file(source_path, destination_path, unsupported)
+        return True, os.path.basename(destination_path), strategy
+
+    except Exception as e:
+        return False, str(e), None
+
+def copy_file_to_category(source_path, destination_path, options, remove_source=False,
+                          create_dirs=True, resolve_name=True, backend=None, durability=None):
+    """Copy a file into its category folder, checksumming it in the same pass
+
+    With ``remove_source`` the original is deleted once the copy is complete
+    (and, if the 'reverify' option is set, re-read and matched, and with a
+    ``durability`` level other than 'none', synced to disk).
+    """
+    algorithm = options['checksum_algorithm']
+    backend = get_backend(backend)
+    
+    try:
+        # Handle duplicate filenames
+        if resolve_name:
+            destination_path = get_unique_filename(destination_path, backend['exists'])
+        
+        # Create destination directory if it doesn't exist
+        if create_dirs:
+            backend['makedirs'](os.path.dirname(destination_path))
+        
+        checksum, _ = backend['copy'](source_path, destination_path, algorithm)
+        
+        if options['reverify'] and backend['checksum'](destination_path, algorithm) != checksum:
+            backend['remove'](destination_path)
+            raise OSError(f"Checksum mismatch after copying to {destination_path}")
+        
+        if remove_source:
+            sync_before_removal(durability, destination_path)
+            backend['remove'](source_path)
+        
+        return True, os.path.basename(destination_path), f"{algorithm}:{checksum}"
+        
+    except Exception as e:
+        return False, str(e), None
+
+def reserve_destination_name(run_state, target_dir, filename, exists):
+    """Pick a free destination name that no other worker of this run can take
+
+    Names are reserved in memory under the run lock before the disk check,
+    so concurrent workers never settle on the same suffix.
+    """
+    stem, ext = os.path.splitext(filename)
+    candidate = filename
+    counter = 0
+    
+    while True:
+        with run_state['lock']:
+            reserved = run_state['reserved_names'].setdefault(target_dir, set())
+            taken = candidate in reserved
+            reserved.add(candidate)
+        
+        if not taken and not exists(candidate):
+            return candidate
+        
+        counter += 1
+        candidate = f"{stem}_{counter}{ext}"
+
+def place_file_in_category(folder_path, filename, target_dir, options, run_state):
+    """Move, link or copy a file according to the run mode
+
+    ``target_dir`` is the destination folder relative to ``folder_path``.
+    ``run_state`` carries per-run resources (open directory handles, link
+    strategies and rename methods found unsupported, reserved names). Returns (success,
+    filename or error, detail) where detail is the link strategy or
+    checksum for modes that produce one.
+    """
+    mode = options['mode']
+    handles = run_state['handles']
+    backend = run_state['backend']
+    source_path = os.path.join(folder_path, filename)
+    destination_path = os.path.join(folder_path, target_dir, filename)
+    
+    # Lean runs created every category folder up front
+    create_dirs = not options['lean']
+    
+    # No-replace renames settle name collisions atomically, even between workers
+    if mode == 'move' and handles:
+        success, result = move_file_at(
+            handles, filename, target_dir,
+            metrics=run_state['metrics'] if options['metrics_file'] else None,
+            unsupported=run_state['unsupported_renames']
+        )
+        return success, result, None
+    
+    if mode == 'move':
+        success, result = move_file_to_category(source_path, destination_path, create_dirs, backend=backend)
+        return success, result, None
+    
+    # Concurrent copies and links reserve destination names instead of the exists-then-place check
+    resolve_name = not run_state['concurrent']
+    if not resolve_name:
+        existing = find_existing_link(source_path, destination_path) if mode == 'link' else None
+        if existing:
+            return True, os.path.basename(existing), 'existing'
+        
+        if handles:
+            target_fd = get_category_fd(handles, target_dir)
+            exists = lambda name: exists_at(target_fd, name)
+        else:
+            exists = lambda name: backend['exists'](os.path.join(folder_path, target_dir, name))
+        
+        destination_name = reserve_destination_name(run_state, target_dir, filename, exists)
+        destination_path = os.path.join(folder_path, target_dir, destination_name)
+    
+    if mode == 'link':
+        return link_file_to_category(
+            source_path, destination_path, run_state['unsupported_links'], create_dirs, resolve_name
+        )
+    
+    # Copy and verified move
+    return copy_file_to_category(
+        source_path, destination_path, options,
+        remove_source=(mode == 'verified_move'), create_dirs=create_dirs,
+        resolve_name=resolve_name, backend=backend, durability=run_state['durability']
+    )
+
+def plan_organization(files):
+    """Group filenames by destination category, keeping their listing order"""
+    plan = {}
+    
+    for filename in files:
+        category = categorize_file(filename)
+        if category:
+            plan.setdefault(category, []).append(filename)
+    
+    return plan
+
+def get_target_dir(category, subdir):
+    """Get a destination folder relative to the base folder"""
+    return os.path.join(category, subdir) if subdir else category
+
+def assign_destinations(folder_path, plan, options, run_state):
+    """Turn a plan into (filename, category, sub folder) work items
+
+    The strategy's layers (date, size tier) give each file a sub folder from
+    its scanned stat data. Categories that exceed the fan-out threshold add
+    a bucket below that; the layout of each category is returned alongside
+    the work.
+    """
+    work = []
+    layouts = {}
+    get_sub_folder = make_strategy(options['strategy'])
+    
+    for category, names in plan.items():
+        layout = choose_category_layout(
+            os.path.join(folder_path, category), len(names),
+            options['fanout_threshold'], options['fanout_scheme'], options['fanout_width'],
+            run_state['backend']
+        )
+        layouts[category] = layout
+        
+        for filename in names:
+            entry = run_state['entries'][filename]
+            subdir = get_sub_folder(entry)
+            if layout:
+                bucket = get_bucket(filename, layout, entry['mtime'])
+                subdir = os.path.join(subdir, bucket) if subdir else bucket
+            work.append((filename, category, subdir))
+    
+    return work, layouts
+
+def prepare_category_folders(folder_path, work, run_state):
+    """Create every destination folder the planned work needs, once per run
+
+    A folder that can't be created (e.g. a file already has the category's
+    name) only fails the work going there. Returns the exception of each
+    such folder by its path relative to ``folder_path``.
+    """
+    target_dirs = {get_target_dir(category, subdir) for _, category, subdir in work}
+    failed = {}
+    
+    for target_dir in sorted(target_dirs):
+        try:
+            if run_state['handles']:
+                get_category_fd(run_state['handles'], target_dir)
+            else:
+                run_state['backend']['makedirs'](os.path.join(folder_path, target_dir))
+        except OSError as e:
+            failed[target_dir] = e
+    
+    return failed
+
+def should_use_dir_fd(options):
+    """Decide if a run moves files relative to open directory handles"""
+    if options['mode'] != 'move' or options['use_dir_fd'] is False:
+        return False
+    
+    if not is_local_backend(options['backend']):
+        return False
+    
+    return supports_dir_fd()
+
+def get_organize_options(options=None):
+    """Merge user options with the defaults and validate them"""
+    merged = dict(ORGANIZE_DEFAULTS)
+
+    if options:
+        unknown = set(options) - set(ORGANIZE_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown organize options: {', '.join(sorted(unknown))}")
+        merged.update(options)
+
+    if merged['mode'] not in ORGANIZE_MODES:
+        raise ValueError(f"Unknown organize mode: {merged['mode']}")
+    
+    if merged['fanout_scheme'] not in FANOUT_SCHEMES:
+        raise ValueError(f"Unknown fan-out scheme: {merged['fanout_scheme']}")
+    
+    if merged['ordering'] not in ORDERINGS:
+        raise ValueError(f"Unknown ordering: {merged['ordering']}")
+    
+    # Raises ValueError for unknown strategy layers
+    parse_strategy(merged['strategy'])
+    
+    if merged['pack_compression'] not in PACK_COMPRESSIONS:
+        raise ValueError(f"Unknown pack compression: {merged['pack_compression']}")
+    
+    if merged['durability'] not in DURABILITY_LEVELS:
+        raise ValueError(f"Unknown durability level: {merged['durability']}")
+    
+    if merged['durability_batch'] < 1:
+        raise ValueError("durability_batch must be at least 1")
+    
+    if merged['metrics_interval'] <= 0:
+        raise ValueError("metrics_interval must be positive")
+    
+    if merged['concurrency'] not in CONCURRENCY_MODES:
+        raise ValueError(f"Unknown concurrency mode: {merged['concurrency']}")
+    
+    if merged['max_workers'] < 1:
+        raise ValueError("max_workers must be at least 1")
+    
+    if merged['chunk_size'] is not None and merged['chunk_size'] < 1:
+        raise ValueError("chunk_size must be at least 1")
+    
+    if not is_local_backend(merged['backend']):
+        # Links and tar archives need real files
+        if merged['mode'] == 'link':
+            raise ValueError("Link mode needs the local storage backend")
+        if merged['pack_older_than_days'] is not None:
+            raise ValueError("Packing needs the local storage backend")
+        if merged['snapshot']:
+            raise ValueError("Snapshots need the local storage backend")
+        if merged['chunk_size'] is not None:
+            raise ValueError("Chunked runs need the local storage backend")
+
+    return merged
+
 def get_files_in_folder(folder_path):
     """Get all files in the specified folder"""
     if not os.path.exists(folder_path):
@@ -76,57 +470,468 @@ def get_files_in_folder(folder_path):
     
     return files
 
-def organize_folder(folder_path):
-    """Organize files in the specified folder by type"""
+def scan_folder(folder_path, handles=None, rules=None, ignored=None, backend=None):
+    """Scan the top-level files of a folder, capturing their stat data once
+    
+    Returns a list of entries with name, size, mtime and inode, so later
+    stages (fan-out by date, ordering, reports) need no further stat calls.
+    Names matching the ignore ``rules`` are skipped before any stat and
+    appended to ``ignored`` when a list is given.
+    """
+    skip = (lambda name: is_ignored(rules, name)) if rules else None
+    
+    try:
+        return get_backend(backend)['scan'](handles['base'] if handles else folder_path, skip, ignored)
+    except PermissionError:
+        raise PermissionError(f"Permission denied accessing folder: {folder_path}")
+
+def iter_folder_entries(folder_path, handles=None, rules=None, ignored=None, backend=None):
+    """Like scan_folder, but yields entries as the directory is read"""
+    skip = (lambda name: is_ignored(rules, name)) if rules else None
+    
+    try:
+        yield from get_backend(backend)['iter_scan'](handles['base'] if handles else folder_path, skip, ignored)
+    except PermissionError:
+        raise PermissionError(f"Permission denied accessing folder: {folder_path}")
+
+def iter_entry_batches(folder_path, handles, rules, ignored, backend, chunk_size=None):
+    """Yield the scanned entries of a folder in lists of ``chunk_size`` (one list when None)
+
+    Batches are cut from a single directory stream, so entries of earlier
+    batches that were moved away are never listed again.
+    """
+    if not chunk_size:
+        yield scan_folder(folder_path, handles, rules, ignored, backend)
+        return
+    
+    entries = iter_folder_entries(folder_path, handles, rules, ignored, backend)
+    while True:
+        batch = list(itertools.islice(entries, chunk_size))
+        if not batch:
+            return
+        yield batch
+
+def start_report_columns(report):
+    """Reset the columnar scan data a run report carries for its summaries and statistics
+
+    'sizes', 'mtimes' and 'extension_codes' map each category to an array
+    aligned with its organized files; codes index 'extensions'. Arrays
+    keep millions of entries compact and can be wrapped by NumPy without
+    a copy.
+    """
+    report['sizes'] = {}
+    report['mtimes'] = {}
+    report['extension_codes'] = {}
+    report['extensions'] = []
+    report['extension_index'] = {}
+
+def record_report_columns(report, category, filename, entry):
+    """Append one organized file's size, mtime and extension to the report columns"""
+    if category not in report['sizes']:
+        report['sizes'][category] = array.array('q')
+        report['mtimes'][category] = array.array('d')
+        report['extension_codes'][category] = array.array('i')
+    
+    extension = os.path.splitext(filename)[1].lower()
+    code = report['extension_index'].get(extension)
+    if code is None:
+        code = report['extension_index'][extension] = len(report['extensions'])
+        report['extensions'].append(extension)
+    
+    report['sizes'][category].append(entry['size'])
+    report['mtimes'][category].append(entry['mtime'])
+    report['extension_codes'][category].append(code)
+
+def get_executor(executors, key, workers):
+    """Get a run's thread pool for ``key``, starting it on first use"""
+    executor = executors.get(key)
+    if executor is None:
+        executor = executors[key] = ThreadPoolExecutor(max_workers=max(1, workers))
+    return executor
+
+def shutdown_executors(executors):
+    """Stop every thread pool of a run"""
+    for executor in executors.values():
+        executor.shutdown(wait=True)
+    executors.clear()
+
+def execute_work(groups, process_item, size_of=None, executors=None):
+    """Run each (work items, worker count) group, groups concurrently with each other
+    
+    A group's worker count may be a tuner (see concurrency.py), which then
+    decides how many of its workers run at once. Thread pools are kept in
+    ``executors`` when given, so a run that calls this once per batch
+    reuses the same threads (and their metrics shards) throughout. The
+    first failure is re-raised once every group has stopped.
+    """
+    if len(groups) == 1 and not isinstance(groups[0][1], dict) and groups[0][1] <= 1:
+        for item in groups[0][0]:
+            process_item(item)
+        return
+    
+    owned = executors is None
+    executors = {} if owned else executors
+    futures = []
+    try:
+        for index, (items, workers) in enumerate(groups):
+            if not items:
+                continue
+            if isinstance(workers, dict):
+                # The tuner's workers run on their own pool; one driver thread feeds them
+                pool = get_executor(executors, (index, 'tuned'), workers['max'])
+                driver = get_executor(executors, (index, 'driver'), 1)
+                futures.append(driver.submit(run_adaptive, items, process_item, workers, size_of, pool))
+                continue
+            executor = get_executor(executors, (index, workers), workers)
+            futures.extend(executor.submit(process_item, item) for item in items)
+        
+        for future in futures:
+            future.result()
+    finally:
+        if owned:
+            shutdown_executors(executors)
+        else:
+            # Shared pools stay up, but no work may run on into the next batch
+            wait(futures)
+
+def finish_run_metrics(metrics, options, metrics_writer, journal, report):
+    """Write the final metrics textfile and log slow operations to the report and journal"""
+    try:
+        merged = finish_metrics(metrics, options['metrics_file'], metrics_writer)
+    except OSError as e:
+        # Losing the textfile must not fail a run whose files are already placed
+        merged = finish_metrics(metrics)
+        report['metrics_error'] = str(e)
+    
+    report['metrics'] = {
+        'files': merged['files'],
+        'bytes': merged['bytes'],
+        'errors': {f"{operation}:{error_type}": count for (operation, error_type), count in merged['errors'].items()},
+        'seconds': merged['duration']
+    }
+    report['slow_operations'] = [
+        {'file': filename, 'category': category, 'seconds': seconds}
+        for filename, category, seconds in merged['slow']
+    ]
+    for filename, category, seconds in merged['slow']:
+        append_journal_entry(journal, {
+            'op': 'slow',
+            'source': filename,
+            'destination': category,
+            'category': category,
+            'detail': f"{seconds:.3f}s"
+        })
+
+def organize_folder(folder_path, options=None, report=None, progress_callback=None):
+    """Organize files in the specified folder by type
+
+    ``options`` overrides ORGANIZE_DEFAULTS. When a ``report`` dict is given
+    it is filled with per-file details of the run: the link strategy used for
+    each file in link mode, checksums in the copy modes and the journal path.
+    ``progress_callback`` is called after every file with a progress dict
+    (done, total, filename, category, the current throttle stats and the
+    worker count of each pool). With 'concurrency' set to 'auto' the pool
+    sizes are tuned while the run goes, up to 'max_workers' each.
+    The 'durability' option syncs placed files, their folders and the
+    journal to disk per file ('strict') or in batches ('batched').
+    Counters, latency histograms and slow placements end up in the report;
+    'metrics_file' also exports them as a node-exporter textfile.
+    'snapshot' lists the organized folder under .organizer/snapshots for
+    later diffs (see snapshots.py).
+    With a 'chunk_size' the folder is read as a stream and processed in
+    batches of that many files (scan, classify, place, then append to the
+    journal and the category summaries), and each batch is let go once it
+    is flushed, so memory stays flat however many files the folder holds.
+    Such runs write their summaries themselves and return each category's
+    file count instead of its file list.
+    With an ordering other than 'listdir' or more than one worker, small and
+    large files are processed concurrently on their own thread pools. The
+    'backend' option runs the whole pipeline on another storage backend,
+    e.g. an in-memory one for benchmarks.
+    """
+    options = get_organize_options(options)
+    backend = get_backend(options['backend'])
+    
+    # Per-worker counters; storage operations are only timed when exported
+    metrics = create_metrics({'folder': folder_path, 'mode': options['mode']}, options['slow_operation_seconds'])
+    if options['metrics_file']:
+        backend = instrument_backend(backend, metrics)
+    
+    if options['max_bytes_per_second'] is not None or options['max_ops_per_second'] is not None:
+        set_throttle_limits(options['max_bytes_per_second'], options['max_ops_per_second'])
+
     # Validate folder path
-    if not os.path.exists(folder_path):
+    if not backend['exists'](folder_path):
         raise FileNotFoundError(f"Folder not found: {folder_path}")
     
-    if not os.path.isdir(folder_path):
+    if not backend['stat'](folder_path)['is_dir']:
         raise NotADirectoryError(f"Path is not a directory: {folder_path}")
     
     # Initialize organized files dictionary
     organized_files = {category: [] for category in FILE_CATEGORIES.keys()}
+    if report is None:
+        report = {}
+    report['mode'] = options['mode']
     
-    # Get all files in the folder
-    files = get_files_in_folder(folder_path)
-    
-    if not files:
-        return organized_files  # Return empty categories if no files found
+    # Per-file details are filed under 'strategies' (link) or 'checksums' (copy)
+    detail_key = 'strategies' if options['mode'] == 'link' else 'checksums'
+    details = report.setdefault(detail_key, {})
+    # Scanned stat data, aligned with organized_files, so reports need no stat calls
+    start_report_columns(report)
+
+    # Separate small/large pools (or any worker count above one) run files concurrently
+    concurrent = (
+        options['ordering'] != 'listdir'
+        or options['small_file_workers'] > 1
+        or options['large_file_workers'] > 1
+        or options['concurrency'] == 'auto'
+    )
+    run_state = {
+        # Link strategies the filesystem turned out not to support during this run
+        'unsupported_links': set(),
+        # No-replace rename methods the filesystem doesn't support (see atomic_rename.py)
+        'unsupported_renames': set(),
+        # Source and category folders opened once, when moving with *at() calls
+        'handles': open_dir_handles(folder_path) if should_use_dir_fd(options) else None,
+        'backend': backend,
+        'concurrent': concurrent,
+        # Guards results, journal and reserved names when workers run concurrently
+        'lock': threading.Lock(),
+        'reserved_names': {},
+        'metrics': metrics,
+        # fsync policy; other backends have no disk to sync
+        'durability': create_durability(
+            options['durability'] if is_local_backend(backend) else 'none', options['durability_batch']
+        )
+    }
+    report['dir_fd'] = run_state['handles'] is not None
+    journal = None
+    tuners = None
+    spool = None
+    # Thread pools shared by every batch of the run
+    executors = {}
+    metrics_writer = (
+        start_metrics_writer(metrics, options['metrics_file'], options['metrics_interval'])
+        if options['metrics_file'] else None
+    )
     
-    # Process each file
-    for filename in files:
-        file_path = os.path.join(folder_path, filename)
-        category = categorize_file(filename)
+    try:
+        rules = load_rules(folder_path, options['ignore'], options['ignore_defaults'], backend)
+        ignored = []
+        report['ignored'] = ignored
+        report['failed'] = []
+        report['layouts'] = {}
+        report['strategy'] = options['strategy']
         
-        if category:
-            # Create category folder path
-            category_path = os.path.join(folder_path, category)
-            destination = os.path.join(category_path, filename)
+        if options['concurrency'] == 'auto':
+            # Metadata-bound small files are tuned on files/s, large copies on bytes/s;
+            # chunked runs keep tuning across batches
+            tuners = {
+                'small': create_tuner('small', options['small_file_workers'], options['max_workers']),
+                'large': create_tuner('large', options['large_file_workers'], options['max_workers'], 'bytes')
+            }
+        
+        # Chunked runs flush each batch's summary lines to disk and return counts only
+        spool = open_summary_spool(folder_path, options['strategy']) if options['chunk_size'] else None
+        counts = {category: 0 for category in FILE_CATEGORIES}
+        
+        # 'total' is the number of files scanned so far
+        progress = {'done': 0, 'total': 0}
+        
+        def get_workers():
+            if tuners:
+                return get_worker_limits(tuners)
+            if concurrent:
+                return {'small': options['small_file_workers'], 'large': options['large_file_workers']}
+            return {'small': 1, 'large': 0}
+        
+        def process_item(item):
+            filename, category, subdir = item
             
-            # Move file to category folder
-            success, result = move_file_to_category(file_path, destination)
+            # Respect the process-wide ops/sec limit
+            throttle_operation()
             
-            if success:
+            # Move, link or copy file into category folder
+            started = time.perf_counter()
+            success, result, detail = place_file_in_category(
+                folder_path, filename, get_target_dir(category, subdir), options, run_state
+            )
+            seconds = time.perf_counter() - started
+            
+            if not success:
+                record_error(metrics, options['mode'], 'PlacementFailed')
+                raise Exception(f"Failed to {options['mode']} {filename}: {result}")
+            
+            observe_latency(metrics, 'place', seconds)
+            record_file(metrics, category, run_state['entries'][filename]['size'], seconds, filename)
+            
+            # Copies wrote new data (verified moves synced theirs already);
+            # moves took an entry out of the source folder
+            record_placement(
+                run_state['durability'], os.path.join(folder_path, get_target_dir(category, subdir), result),
+                source_dir=folder_path if options['mode'] in ('move', 'verified_move') else None,
+                wrote_data=options['mode'] == 'copy' or detail == 'reflink'
+            )
+            
+            with run_state['lock']:
+                # Files in fanned-out categories are listed by their bucket path
+                result = f"{subdir}/{result}" if subdir else result
                 organized_files[category].append(result)
+                record_report_columns(report, category, filename, run_state['entries'][filename])
+                if detail:
+                    details.setdefault(category, {})[result] = detail
+                append_journal_entry(journal, {
+                    'op': options['mode'],
+                    'source': filename,
+                    'destination': f"{category}/{result}",
+                    'category': category,
+                    'detail': detail
+                })
+                progress['done'] += 1
+                
+                if progress_callback:
+                    progress_callback({
+                        'done': progress['done'],
+                        'total': progress['total'],
+                        'filename': filename,
+                        'category': category,
+                        'throttle': get_throttle_stats(),
+                        'workers': get_workers()
+                    })
+        
+        # Get the files in the folder, with the stat data later stages need;
+        # without a chunk size the whole folder is a single batch
+        batches = iter_entry_batches(
+            folder_path, run_state['handles'], rules, ignored, backend, options['chunk_size']
+        )
+        for batch in batches:
+            run_state['entries'] = {entry['name']: entry for entry in batch}
+            files = [entry['name'] for entry in batch]
+            if not files:
+                continue
+            progress['total'] += len(files)
+            
+            plan = plan_organization(files)
+            work, layouts = assign_destinations(folder_path, plan, options, run_state)
+            report['layouts'].update(layouts)
+            
+            if options['lean']:
+                # One cached write probe and one mkdir per folder instead of per-file checks
+                error = None
+                if progress['total'] == len(files) and is_local_backend(backend):
+                    error = check_write_access(folder_path)
+                if error is not None:
+                    raise PermissionError(f"Cannot write to folder {folder_path}: {error}")
+                failed_dirs = prepare_category_folders(folder_path, work, run_state)
+                if failed_dirs:
+                    # Files bound for a folder that can't exist stay put; everything else goes on
+                    kept = []
+                    for item in work:
+                        filename, category, subdir = item
+                        error = failed_dirs.get(get_target_dir(category, subdir))
+                        if error is None:
+                            kept.append(item)
+                            continue
+                        record_error(metrics, 'mkdir', error)
+                        report['failed'].append({'file': filename, 'category': category, 'error': str(error)})
+                    work = kept
+            
+            if journal is None and options['journal']:
+                journal = open_journal(folder_path, backend, run_state['durability'])
+                report['journal'] = journal['path']
+            
+            if concurrent:
+                # Small files (metadata-bound) and large files (bandwidth-bound) get their own pools
+                small, large = order_work(
+                    work, run_state['entries'], options['ordering'], folder_path,
+                    options['large_file_threshold']
+                )
+                if tuners:
+                    groups = [(small, tuners['small']), (large, tuners['large'])]
+                else:
+                    groups = [(small, options['small_file_workers']), (large, options['large_file_workers'])]
+                ordering = report.setdefault('ordering', {
+                    'ordering': options['ordering'],
+                    'small_files': 0,
+                    'large_files': 0
+                })
+                ordering['small_files'] += len(small)
+                ordering['large_files'] += len(large)
             else:
-                raise Exception(f"Failed to move {filename}: {result}")
+                groups = [(work, 1)]
+            
+            execute_work(groups, process_item, lambda item: run_state['entries'][item[0]]['size'], executors)
+            
+            if spool is not None:
+                # Flush the batch's listings, then let go of everything it held
+                append_summary_spool(spool, organized_files, report)
+                for category, names in organized_files.items():
+                    counts[category] += len(names)
+                    names.clear()
+                details.clear()
+                start_report_columns(report)
+                run_state['reserved_names'].clear()
+            run_state['entries'] = {}
+        
+        if not progress['total']:
+            return counts if spool is not None else organized_files  # No files found
+        
+        if tuners:
+            report['concurrency'] = {name: get_tuner_report(tuner) for name, tuner in tuners.items()}
+        
+        if options['pack_older_than_days'] is not None:
+            # Cold files, including ones organized by earlier runs, go into archives
+            packs = pack_folder(
+                folder_path, options['pack_older_than_days'], options['pack_compression'],
+                options['pack_workers'], journal=journal, rules=rules,
+                durability=run_state['durability']
+            )
+            report['packs'] = packs['archives']
+            report['packed'] = packs['packed']
+        
+        if spool is not None:
+            # Category summaries are complete once packing has listed its archives
+            report['streamed_summaries'] = finish_summary_spool(spool, report, run_state['durability'])
+            organized_files = counts
+        
+        if options['snapshot']:
+            # Everything below the folder, as it looks after this run
+            report['snapshot'] = write_snapshot(folder_path, rules, run_state['durability'])
+    finally:
+        shutdown_executors(executors)
+        if spool is not None:
+            discard_summary_spool(spool)  # Listings of a failed run
+        finish_run_metrics(metrics, options, metrics_writer, journal, report)
+        close_journal(journal)
+        flush_durability(run_state['durability'])
+        report['durability'] = get_durability_stats(run_state['durability'])
+        close_dir_handles(run_state['handles'])
     
     return organized_files
 
 def get_category_stats(organized_files):
-    """Get statistics about organized files"""
+    """Get statistics about organized files (file lists, or the counts of a chunked run)"""
     stats = {}
     total_files = 0
     
     for category, files in organized_files.items():
-        file_count = len(files)
+        file_count = files if isinstance(files, int) else len(files)
         stats[category] = file_count
         total_files += file_count
     
     stats['total'] = total_files
     return stats
 
+def get_strategy_counts(report):
+    """Count how many files used each link strategy in a run report"""
+    counts = {}
+
+    for files in report.get('strategies', {}).values():
+        for strategy in files.values():
+            counts[strategy] = counts.get(strategy, 0) + 1
+
+    return counts
+
 def validate_file_operation(file_path):
     """Validate if a file operation is safe to perform"""
     if not os.path.exists(file_path):
@@ -5,9 +5,16 @@ No OOP patterns used - functional approach
 
 import os
 import shutil
+import tempfile
 from datetime import datetime
 from pathlib import Path
 
+from ignore_rules import walk_directory
+from calibration import estimate_seconds, format_duration
+
+# Outcome of write-access probes keyed by absolute directory path: None or the error raised
+_write_access_cache = {}
+
 def get_file_extension(filename):
     """Get the file extension in lowercase"""
     return os.path.splitext(filename)[1].lower()
@@ -79,50 +86,63 @@ def is_safe_to_move(filepath):
     except OSError as e:
         return False, f"OS Error: {str(e)}"
 
-def get_unique_filename(filepath):
+def get_unique_filename(filepath, exists=os.path.exists):
     """Generate a unique filename if the destination already exists"""
-    if not os.path.exists(filepath):
+    if not exists(filepath):
         return filepath
     
     name, ext = os.path.splitext(filepath)
     counter = 1
     
-    while os.path.exists(f"{name}_{counter}{ext}"):
+    while exists(f"{name}_{counter}{ext}"):
         counter += 1
     
     return f"{name}_{counter}{ext}"
 
-def safe_move_file(source, destination):
-    """Safely move a file with error handling"""
+def safe_move_file(source, destination, probe=True):
+    """Safely move a file with error handling
+    
+    With ``probe=False`` the source isn't opened and the destination folder
+    isn't checked up front; a missing destination folder is created only
+    when the move actually fails because of it.
+    """
     try:
-        # Check if source exists and is accessible
-        safe, message = is_safe_to_move(source)
-        if not safe:
-            return False, f"Cannot access source file: {message}"
-        
-        # Create destination directory if it doesn't exist
         dest_dir = os.path.dirname(destination)
-        if dest_dir and not os.path.exists(dest_dir):
-            os.makedirs(dest_dir, exist_ok=True)
+        
+        if probe:
+            # Check if source exists and is accessible
+            safe, message = is_safe_to_move(source)
+            if not safe:
+                return False, f"Cannot access source file: {message}"
+            
+            # Create destination directory if it doesn't exist
+            if dest_dir and not os.path.exists(dest_dir):
+                os.makedirs(dest_dir, exist_ok=True)
         
         # Handle duplicate filenames
         destination = get_unique_filename(destination)
         
         # Move the file
-        shutil.move(source, destination)
+        try:
+            shutil.move(source, destination)
+        except FileNotFoundError:
+            if probe or not dest_dir or os.path.isdir(dest_dir):
+                raise
+            os.makedirs(dest_dir, exist_ok=True)
+            shutil.move(source, destination)
         return True, os.path.basename(destination)
         
     except Exception as e:
         return False, str(e)
 
-def get_directory_size(directory_path):
-    """Calculate total size of a directory and all its contents"""
+def get_directory_size(directory_path, rules=None):
+    """Calculate total size of a directory and all its contents, skipping ignored entries"""
     total_size = 0
     file_count = 0
     dir_count = 0
     
     try:
-        for root, dirs, files in os.walk(directory_path):
+        for root, dirs, files in walk_directory(directory_path, rules):
             dir_count += len(dirs)
             for file in files:
                 file_path = os.path.join(root, file)
@@ -141,12 +161,12 @@ def get_directory_size(directory_path):
         'dir_count': dir_count
     }
 
-def count_files_by_extension(directory_path):
-    """Count files by their extensions in a directory"""
+def count_files_by_extension(directory_path, rules=None):
+    """Count files by their extensions in a directory, skipping ignored entries"""
     extension_counts = {}
     
     try:
-        for root, dirs, files in os.walk(directory_path):
+        for root, dirs, files in walk_directory(directory_path, rules):
             for file in files:
                 ext = get_file_extension(file)
                 extension_counts[ext] = extension_counts.get(ext, 0) + 1
@@ -155,15 +175,15 @@ def count_files_by_extension(directory_path):
     
     return extension_counts
 
-def get_oldest_and_newest_files(directory_path):
-    """Find the oldest and newest files in a directory"""
+def get_oldest_and_newest_files(directory_path, rules=None):
+    """Find the oldest and newest files in a directory, skipping ignored entries"""
     oldest_file = None
     newest_file = None
     oldest_time = float('inf')
     newest_time = 0
     
     try:
-        for root, dirs, files in os.walk(directory_path):
+        for root, dirs, files in walk_directory(directory_path, rules):
             for file in files:
                 file_path = os.path.join(root, file)
                 try:
@@ -202,18 +222,38 @@ def validate_directory_access(directory_path):
     except OSError as e:
         return False, f"OS Error reading directory: {str(e)}"
     
+    # Test write access (probed once per directory, then cached)
+    error = check_write_access(directory_path)
+    if isinstance(error, PermissionError):
+        return False, "Permission denied - cannot write to directory"
+    if error is not None:
+        return False, f"OS Error writing to directory: {str(error)}"
+    
+    return True, "Directory is accessible and writable"
+
+def check_write_access(directory_path, use_cache=True):
+    """Probe write access with a temporary file; returns None or the error raised
+    
+    The outcome is cached per directory so repeated validations cost no I/O.
+    """
+    key = os.path.abspath(directory_path)
+    if use_cache and key in _write_access_cache:
+        return _write_access_cache[key]
+    
     try:
-        # Test write access
-        test_file = os.path.join(directory_path, "test_write.tmp")
-        with open(test_file, 'w') as f:
-            f.write("test")
+        fd, test_file = tempfile.mkstemp(prefix=".organizer_write_test_", dir=directory_path)
+        os.close(fd)
         os.remove(test_file)
-    except PermissionError:
-        return False, "Permission denied - cannot write to directory"
+        error = None
     except OSError as e:
-        return False, f"OS Error writing to directory: {str(e)}"
+        error = e
     
-    return True, "Directory is accessible and writable"
+    _write_access_cache[key] = error
+    return error
+
+def clear_write_access_cache():
+    """Forget cached write-access results (e.g. after permissions changed)"""
+    _write_access_cache.clear()
 
 def create_backup_list(organized_files):
     """Create a list of files that were organized for potential backup"""
@@ -230,19 +270,21 @@ def create_backup_list(organized_files):
     
     return backup_list
 
-def estimate_organization_time(file_count):
-    """Estimate the time needed to organize files based on count"""
-    # Rough estimation: 0.1 seconds per file + 0.5 seconds overhead
-    estimated_seconds = (file_count * 0.1) + 0.5
+def estimate_organization_time(file_count, calibration=None, mode='move'):
+    """Estimate the time needed to organize files based on count
     
-    if estimated_seconds < 60:
-        return f"{estimated_seconds:.1f} seconds"
-    elif estimated_seconds < 3600:
-        minutes = estimated_seconds / 60
-        return f"{minutes:.1f} minutes"
-    else:
-        hours = estimated_seconds / 3600
-        return f"{hours:.1f} hours"
+    Uses a filesystem calibration (see calibration.get_calibration) when
+    given, typical local-disk figures otherwise. calibration.estimate_folder
+    also accounts for file sizes.
+    """
+    distribution = {
+        'files': file_count,
+        'bytes': 0,
+        'small_files': file_count,
+        'large_files': 0,
+        'large_bytes': 0
+    }
+    return format_duration(estimate_seconds(distribution, mode, calibration))
 
 def get_system_info():
     """Get basic system information for logging"""
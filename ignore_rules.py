@@ -0,0 +1,221 @@
+"""
+Ignore Rules - Compiled gitignore-style include/exclude patterns
+No OOP patterns used - functional approach
+
+Patterns are compiled once into a matcher: literal names go into a set,
+literal suffixes ("*.part") and prefixes ("~$*") into tuples checked by a
+single endswith/startswith call, everything else into one combined
+regular expression. Matching only looks at names, so it runs before any
+stat, and directories that match are pruned from walks instead of being
+descended into.
+
+Syntax: "#" starts a comment, a trailing "/" matches directories only, a
+pattern containing "/" is matched against the path relative to the root
+(otherwise against the name), "*" and "?" don't cross "/", "**" does, and
+"!" re-includes. Unlike git, a re-include always wins over an exclude,
+whatever the order of the lines.
+"""
+
+import os
+import re
+
+# Per-folder rules file, read in addition to the options
+IGNORE_FILE_NAME = '.organizerignore'
+
+# Suffix of report files still being written (renamed into place when complete)
+TEMP_SUFFIX = '.organizer-tmp'
+
+# Skipped unless the run turns the defaults off
+DEFAULT_IGNORE_PATTERNS = (
+    # Partial downloads
+    '*.part', '*.partial', '*.crdownload', '*.download', '*.opdownload',
+    # Lock and owner files of open documents
+    '.~lock.*#', '~$*', '*.swp',
+    # The organizer's own reports and state
+    'summary.txt', 'MASTER_SUMMARY.txt', 'DETAILED_REPORT.txt', 'STATISTICS_REPORT.txt',
+    IGNORE_FILE_NAME, '.organizer/', '*' + TEMP_SUFFIX,
+    # Trees recursive walks should never enter
+    '.git/', 'node_modules/', '__pycache__/',
+)
+
+GLOB_CHARS = set('*?[')
+
+def translate_pattern(pattern):
+    """Translate one glob pattern into a regular expression fragment"""
+    parts = []
+    i = 0
+
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+            continue
+        if char == '*':
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append(f"[{body}]")
+                i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+
+    return ''.join(parts)
+
+def create_rule_group():
+    """Create an empty group of compiled patterns"""
+    return {
+        'names': set(),
+        'suffixes': set(),  # "*literal" patterns
+        'prefixes': set(),  # "literal*" patterns
+        'patterns': [],   # name patterns for the combined regex
+        'path_patterns': [],  # patterns matched against the relative path
+        'regex': None,
+        'path_regex': None
+    }
+
+def add_pattern(group, pattern):
+    """File one pattern under the fastest structure that can match it"""
+    if '/' in pattern:
+        group['path_patterns'].append(pattern.lstrip('/'))
+        return
+
+    body = pattern[1:]
+    if pattern.startswith('*') and body and not GLOB_CHARS & set(body):
+        group['suffixes'].add(body)
+        return
+
+    head = pattern[:-1]
+    if pattern.endswith('*') and head and not GLOB_CHARS & set(head):
+        group['prefixes'].add(head)
+        return
+
+    if not GLOB_CHARS & set(pattern):
+        group['names'].add(pattern)
+        return
+
+    group['patterns'].append(pattern)
+
+def finish_rule_group(group):
+    """Combine a group's glob patterns into one regex each"""
+    if group['patterns']:
+        group['regex'] = re.compile(
+            '(?:' + '|'.join(translate_pattern(p) for p in group['patterns']) + r')\Z'
+        )
+    if group['path_patterns']:
+        group['path_regex'] = re.compile(
+            '(?:' + '|'.join(translate_pattern(p) for p in group['path_patterns']) + r')\Z'
+        )
+
+    # str.endswith/startswith take a tuple and check it in one C call
+    group['suffixes'] = tuple(sorted(group['suffixes']))
+    group['prefixes'] = tuple(sorted(group['prefixes']))
+    return group
+
+def compile_rules(patterns):
+    """Compile gitignore-style lines into a matcher"""
+    groups = {key: create_rule_group() for key in ('exclude', 'exclude_dirs', 'include', 'include_dirs')}
+
+    for line in patterns:
+        pattern = line.strip()
+        if not pattern or pattern.startswith('#'):
+            continue
+
+        kind = 'exclude'
+        if pattern.startswith('!'):
+            kind = 'include'
+            pattern = pattern[1:]
+        if pattern.endswith('/'):
+            kind += '_dirs'
+            pattern = pattern.rstrip('/')
+
+        if pattern:
+            add_pattern(groups[kind], pattern)
+
+    for group in groups.values():
+        finish_rule_group(group)
+
+    groups['empty'] = not any(
+        group['names'] or group['suffixes'] or group['prefixes'] or group['regex'] or group['path_regex']
+        for group in (groups['exclude'], groups['exclude_dirs'])
+    )
+    return groups
+
+def match_group(group, name, path):
+    """Check a name (and its relative path) against one group"""
+    if name in group['names'] or name.endswith(group['suffixes']) or name.startswith(group['prefixes']):
+        return True
+
+    regex = group['regex']
+    if regex is not None and regex.match(name) is not None:
+        return True
+
+    path_regex = group['path_regex']
+    return path_regex is not None and path_regex.match(path) is not None
+
+def is_ignored(rules, name, is_dir=False, path=None):
+    """Check if an entry is excluded and not re-included
+
+    ``path`` is the entry's path relative to the walked root, with "/"
+    separators; it defaults to the name for top-level entries.
+    """
+    if rules is None or rules['empty']:
+        return False
+
+    if path is None:
+        path = name
+    excluded = match_group(rules['exclude'], name, path) or (
+        is_dir and match_group(rules['exclude_dirs'], name, path)
+    )
+    if not excluded:
+        return False
+
+    return not (
+        match_group(rules['include'], name, path)
+        or (is_dir and match_group(rules['include_dirs'], name, path))
+    )
+
+def read_ignore_file(folder_path, backend=None):
+    """Read the rules file of a folder; returns its lines or an empty list"""
+    path = os.path.join(folder_path, IGNORE_FILE_NAME)
+    try:
+        if backend is not None:
+            return backend['read'](path).splitlines()
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().splitlines()
+    except OSError:
+        return []
+
+def load_rules(folder_path, patterns=(), use_defaults=True, backend=None):
+    """Compile the defaults, the folder's rules file and extra patterns into one matcher"""
+    lines = list(DEFAULT_IGNORE_PATTERNS) if use_defaults else []
+    lines.extend(read_ignore_file(folder_path, backend))
+    lines.extend(patterns or ())
+    return compile_rules(lines)
+
+def walk_directory(directory_path, rules=None):
+    """os.walk that skips ignored files and never descends into ignored folders
+
+    Yields (root, dirs, files) like os.walk, with both lists already filtered.
+    """
+    for root, dirs, files in os.walk(directory_path):
+        relative = os.path.relpath(root, directory_path)
+        prefix = '' if relative == os.curdir else relative.replace(os.sep, '/') + '/'
+
+        # Pruning in place stops os.walk from entering these folders at all
+        dirs[:] = [d for d in dirs if not is_ignored(rules, d, True, prefix + d)]
+        files = [f for f in files if not is_ignored(rules, f, False, prefix + f)]
+        yield root, dirs, files
@@ -0,0 +1,97 @@
+"""
+Journal - Records every file operation of a run as JSON lines
+No OOP patterns used - functional approach
+"""
+
+import io
+import os
+import json
+from datetime import datetime
+
+from durability import record_written_file, count_syncs
+
+# Hidden folder inside the organized folder that holds run state
+STATE_DIR_NAME = '.organizer'
+
+JOURNAL_PREFIX = 'journal-'
+JOURNAL_SUFFIX = '.jsonl'
+
+def get_state_dir(base_folder):
+    """Get the path of the organizer state folder for a base folder"""
+    return os.path.join(base_folder, STATE_DIR_NAME)
+
+def open_journal(base_folder, backend=None, durability=None):
+    """Open a new journal file for a run and return the journal state
+
+    On a non-local storage backend the journal is buffered in memory and
+    written through the backend when it is closed. With a ``durability``
+    state (see durability.py) entries are synced per its level: every line
+    when strict, every batch of lines when batched.
+    """
+    state_dir = get_state_dir(base_folder)
+    run_id = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    journal_path = os.path.join(state_dir, f"{JOURNAL_PREFIX}{run_id}{JOURNAL_SUFFIX}")
+
+    if backend is not None and backend['name'] != 'local':
+        backend['makedirs'](state_dir)
+        return {'path': journal_path, 'handle': io.StringIO(), 'entries': 0, 'backend': backend}
+
+    os.makedirs(state_dir, exist_ok=True)
+    return {
+        'path': journal_path,
+        'handle': open(journal_path, 'a', encoding='utf-8'),
+        'entries': 0,
+        'durability': durability
+    }
+
+def append_journal_entry(journal, entry):
+    """Append one operation record to the journal"""
+    if journal is None:
+        return
+
+    journal['handle'].write(json.dumps(entry, ensure_ascii=False) + "\n")
+    journal['entries'] += 1
+
+    durability = journal.get('durability')
+    if durability is None or durability['level'] == 'none':
+        return
+    if durability['level'] == 'strict' or journal['entries'] % durability['batch_size'] == 0:
+        journal['handle'].flush()
+        os.fsync(journal['handle'].fileno())
+        count_syncs(durability, files=1)
+
+def close_journal(journal):
+    """Flush and close the journal file"""
+    if journal is None or journal['handle'].closed:
+        return
+
+    if journal.get('backend'):
+        journal['backend']['write'](journal['path'], journal['handle'].getvalue())
+    journal['handle'].close()
+    record_written_file(journal.get('durability'), journal['path'])
+
+def read_journal(journal_path):
+    """Yield the operation records stored in a journal file"""
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def get_latest_journal(base_folder):
+    """Get the path of the most recent journal in a base folder, or None"""
+    state_dir = get_state_dir(base_folder)
+
+    try:
+        journals = [
+            name for name in os.listdir(state_dir)
+            if name.startswith(JOURNAL_PREFIX) and name.endswith(JOURNAL_SUFFIX)
+        ]
+    except OSError:
+        return None
+
+    if not journals:
+        return None
+
+    # Run ids are timestamps, so the names sort chronologically
+    return os.path.join(state_dir, max(journals))
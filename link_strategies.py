@@ -0,0 +1,113 @@
+"""
+Link Strategies - Builds category views without duplicating file data
+No OOP patterns used - functional approach
+"""
+
+import os
+import sys
+import errno
+import shutil
+
+# ioctl request number for FICLONE (from linux/fs.h)
+FICLONE = 0x40049409
+
+# Strategies tried for each file, cheapest independent copy first
+LINK_STRATEGIES = ('reflink', 'hardlink', 'symlink')
+
+# Errors meaning "this filesystem can't do it", not "this file is broken";
+# anything else (EPERM from protected hardlinks, EINVAL from FICLONE on a
+# special file, EMLINK) only makes that one file fall back to the next strategy
+UNSUPPORTED_ERRNOS = {
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EXDEV,
+    errno.ENOSYS,
+}
+
+def reflink_file(source_path, destination_path):
+    """Clone a file with FICLONE so both paths share extents (copy-on-write)"""
+    if not sys.platform.startswith('linux'):
+        raise OSError(errno.EOPNOTSUPP, "Reflink clones are only supported on Linux")
+
+    import fcntl
+
+    src_fd = os.open(source_path, os.O_RDONLY)
+    try:
+        dst_fd = os.open(destination_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        except OSError:
+            os.close(dst_fd)
+            os.unlink(destination_path)
+            raise
+        os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+    # Keep timestamps and permissions so the view looks like the original
+    shutil.copystat(source_path, destination_path)
+
+def hardlink_file(source_path, destination_path):
+    """Create a hard link to the source file"""
+    os.link(source_path, destination_path)
+
+def symlink_file(source_path, destination_path):
+    """Create a relative symbolic link pointing at the source file"""
+    target = os.path.relpath(source_path, os.path.dirname(destination_path))
+    os.symlink(target, destination_path)
+
+LINK_FUNCTIONS = {
+    'reflink': reflink_file,
+    'hardlink': hardlink_file,
+    'symlink': symlink_file,
+}
+
+def link_file(source_path, destination_path, unsupported=None):
+    """Link a file using the first strategy that works and return its name
+
+    Strategies listed in ``unsupported`` are skipped. When a strategy fails
+    because the filesystem can't do it, it is added to ``unsupported`` so the
+    remaining files of the run don't pay for the failed attempt again.
+    """
+    if unsupported is None:
+        unsupported = set()
+
+    last_error = None
+    for strategy in LINK_STRATEGIES:
+        if strategy in unsupported:
+            continue
+
+        try:
+            LINK_FUNCTIONS[strategy](source_path, destination_path)
+            return strategy
+        except OSError as e:
+            last_error = e
+            if e.errno in UNSUPPORTED_ERRNOS:
+                unsupported.add(strategy)
+
+    if last_error is None:
+        raise OSError(errno.EOPNOTSUPP, "No link strategy available")
+    raise last_error
+
+def is_existing_link(source_path, destination_path):
+    """Check if the destination already shares the source's inode or points at it"""
+    try:
+        return os.path.samefile(source_path, destination_path)
+    except OSError:
+        return False
+
+def find_existing_link(source_path, destination_path):
+    """Find the link a previous run placed for the source, under its name or a name_N suffix
+
+    Names are checked in the order collisions hand them out, up to the
+    first free one. Returns the link's path, or None.
+    """
+    from atomic_rename import candidate_names
+
+    directory, filename = os.path.split(destination_path)
+    for candidate in candidate_names(filename):
+        path = os.path.join(directory, candidate)
+        if not os.path.lexists(path):
+            return None
+        if is_existing_link(source_path, path):
+            return path
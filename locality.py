@@ -0,0 +1,132 @@
+"""
+Locality - Orders planned work by physical position on disk
+No OOP patterns used - functional approach
+
+On spinning disks the order in which files are touched decides how far the
+heads travel. 'inode' orders work by inode number, which helps runs that
+only touch metadata (moves and links update inodes, whose tables are laid
+out in inode order). 'extent' orders work by the physical offset of each
+file's first extent, read with the FIEMAP ioctl where the platform and
+filesystem support it (inode order otherwise), which helps runs that read
+file data (copies and verified moves). Where the folder listing already
+follows creation order and data was written in that order, 'listdir' is
+as good as either.
+"""
+
+import os
+import sys
+import struct
+
+ORDERINGS = ('listdir', 'inode', 'extent')
+
+# _IOWR('f', 11, struct fiemap) from linux/fs.h
+FS_IOC_FIEMAP = 0xC020660B
+
+# struct fiemap header and a single struct fiemap_extent
+FIEMAP_HEADER = struct.Struct('=QQIIII')
+FIEMAP_EXTENT = struct.Struct('=QQQQQIIII')
+# Set on extents without a physical location yet (e.g. delayed allocation)
+FIEMAP_EXTENT_UNKNOWN = 0x00000002
+
+def get_physical_offset(file_path):
+    """Get the physical byte offset of a file's first extent, or None if unknown
+
+    No FIEMAP_FLAG_SYNC: planning must not write back every file's dirty
+    data, so a file that isn't on disk yet simply has no offset.
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+
+    import fcntl
+
+    request = bytearray(FIEMAP_HEADER.size + FIEMAP_EXTENT.size)
+    FIEMAP_HEADER.pack_into(request, 0, 0, 0xFFFFFFFFFFFFFFFF, 0, 0, 1, 0)
+
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return None
+
+    try:
+        fcntl.ioctl(fd, FS_IOC_FIEMAP, request)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+    mapped_extents = FIEMAP_HEADER.unpack_from(request, 0)[3]
+    if not mapped_extents:
+        return None  # Empty or fully inline file
+
+    extent = FIEMAP_EXTENT.unpack_from(request, FIEMAP_HEADER.size)
+    if extent[5] & FIEMAP_EXTENT_UNKNOWN:
+        return None
+    return extent[1]
+
+def split_by_size(work, entries, large_file_threshold):
+    """Split work items into (small files, large files) by scanned size"""
+    small = []
+    large = []
+
+    for item in work:
+        if entries[item[0]]['size'] >= large_file_threshold:
+            large.append(item)
+        else:
+            small.append(item)
+
+    return small, large
+
+def order_by_inode(work, entries):
+    """Order work items by the inode number captured during the scan"""
+    return sorted(work, key=lambda item: entries[item[0]]['inode'])
+
+def order_by_extent(work, entries, folder_path):
+    """Order work items by physical extent offset, falling back to inode order
+
+    Files whose offset can't be read keep their inode position relative to
+    each other and are placed after the mapped ones.
+    """
+    keyed = []
+    for item in work:
+        offset = get_physical_offset(os.path.join(folder_path, item[0]))
+        if offset is None:
+            keyed.append((1, entries[item[0]]['inode'], item))
+        else:
+            keyed.append((0, offset, item))
+
+    keyed.sort(key=lambda key: key[:2])
+    return [key[2] for key in keyed]
+
+def order_work(work, entries, ordering, folder_path, large_file_threshold):
+    """Split work into small and large files and order each group
+
+    Returns (small files, large files), both in inode order for 'inode'
+    and in extent order for 'extent'. 'listdir' keeps the planned order.
+    """
+    small, large = split_by_size(work, entries, large_file_threshold)
+
+    if ordering == 'inode':
+        return order_by_inode(small, entries), order_by_inode(large, entries)
+    if ordering == 'extent':
+        return order_by_extent(small, entries, folder_path), order_by_extent(large, entries, folder_path)
+
+    return small, large
+
+def measure_seek_distance(paths):
+    """Sum the physical distance between consecutive files' first extents
+
+    Used by the benchmark suite as a proxy for head travel on a spinning disk.
+    Returns None when no offsets are available.
+    """
+    offsets = [offset for offset in (get_physical_offset(path) for path in paths) if offset is not None]
+    if not offsets:
+        return None
+
+    return sum(abs(b - a) for a, b in zip(offsets, offsets[1:]))
+
+def measure_inode_distance(inodes):
+    """Sum the distance between consecutive inode numbers
+
+    The benchmark's proxy for inode table travel in metadata-only runs.
+    """
+    return sum(abs(b - a) for a, b in zip(inodes, inodes[1:]))
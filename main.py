@@ -13,7 +13,29 @@ def check_dependencies():
         'ui_manager',
         'file_organizer', 
         'summary_writer',
-        'file_utils'
+        'file_utils',
+        'link_strategies',
+        'verified_copy',
+        'journal',
+        'throttle',
+        'cli',
+        'dir_handles',
+        'batch_runner',
+        'sharding',
+        'fanout',
+        'locality',
+        'strategies',
+        'ignore_rules',
+        'packer',
+        'calibration',
+        'storage',
+        'durability',
+        'stats_report',
+        'metrics',
+        'concurrency',
+        'atomic_rename',
+        'results_browser',
+        'snapshots'
     ]
     
     missing_modules = []
@@ -49,6 +71,11 @@ def display_welcome_message():
 
 def main():
     """Main application entry point"""
+    # Any command-line arguments switch to terminal mode
+    if len(sys.argv) > 1:
+        from cli import run_cli
+        sys.exit(run_cli(sys.argv[1:]))
+    
     try:
         # Check dependencies
         if not check_dependencies():
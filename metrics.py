@@ -0,0 +1,254 @@
+"""
+Metrics - Run counters, latency histograms and Prometheus textfile export
+No OOP patterns used - functional approach
+
+Every worker thread updates its own shard of counters without taking a
+lock; a writer thread merges the shards every few seconds and rewrites a
+node-exporter textfile (atomically, as the textfile collector expects).
+Files whose placement took longer than a threshold are kept as slow
+operations.
+"""
+
+import os
+import time
+import bisect
+import tempfile
+import threading
+
+METRIC_PREFIX = 'folder_organizer'
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implied
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+# Backend operations that are timed when metrics are exported
+TIMED_OPERATIONS = (
+    'scan', 'stat', 'exists', 'rename', 'rename_noreplace', 'replace', 'copy', 'checksum', 'remove', 'makedirs'
+)
+
+# Seconds between textfile rewrites while a run is in progress
+DEFAULT_METRICS_INTERVAL = 5.0
+
+def create_metrics(labels=None, slow_seconds=None):
+    """Create the metrics state of a run
+
+    ``labels`` are added to every exported series (e.g. the folder and
+    mode); ``slow_seconds`` flags placements that take at least that long.
+    """
+    return {
+        'labels': dict(labels or {}),
+        'slow_seconds': slow_seconds,
+        'started': time.time(),
+        'finished': None,
+        'shards': [],
+        'shards_lock': threading.Lock(),  # Only taken when a new thread registers its shard
+        'local': threading.local()
+    }
+
+def create_shard():
+    """Create one worker's private counters"""
+    return {
+        'files': {},    # category -> count
+        'bytes': {},    # category -> bytes
+        'errors': {},   # (operation, error type) -> count
+        'latency': {},  # operation -> bucket counts + [sum]
+        'slow': []      # (filename, category, seconds)
+    }
+
+def get_shard(metrics):
+    """Get the calling thread's shard, registering it on first use"""
+    shard = getattr(metrics['local'], 'shard', None)
+    if shard is None:
+        shard = metrics['local'].shard = create_shard()
+        with metrics['shards_lock']:
+            metrics['shards'].append(shard)
+    return shard
+
+def observe_latency(metrics, operation, seconds):
+    """Add one timed operation to its latency histogram"""
+    if metrics is None:
+        return
+    latency = get_shard(metrics)['latency']
+    histogram = latency.get(operation)
+    if histogram is None:
+        # One count per bucket, one for +Inf, then the sum of observed seconds
+        histogram = latency[operation] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+    histogram[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    histogram[-1] += seconds
+
+def record_file(metrics, category, size, seconds, filename):
+    """Count one placed file and flag it if it was slow"""
+    if metrics is None:
+        return
+    shard = get_shard(metrics)
+    shard['files'][category] = shard['files'].get(category, 0) + 1
+    shard['bytes'][category] = shard['bytes'].get(category, 0) + size
+    if metrics['slow_seconds'] is not None and seconds >= metrics['slow_seconds']:
+        shard['slow'].append((filename, category, seconds))
+
+def record_error(metrics, operation, error):
+    """Count a failed operation by its error type"""
+    if metrics is None:
+        return
+    errors = get_shard(metrics)['errors']
+    key = (operation, type(error).__name__ if isinstance(error, BaseException) else str(error))
+    errors[key] = errors.get(key, 0) + 1
+
+def instrument_backend(backend, metrics):
+    """Wrap a storage backend so its operations are timed and their errors counted"""
+    def timed(operation, function):
+        def call(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            except Exception as e:
+                record_error(metrics, operation, e)
+                raise
+            finally:
+                observe_latency(metrics, operation, time.perf_counter() - started)
+        return call
+
+    instrumented = dict(backend)
+    for operation in TIMED_OPERATIONS:
+        if operation in backend:
+            instrumented[operation] = timed(operation, backend[operation])
+    return instrumented
+
+def merge_counts(target, source):
+    """Add one counter dict into another"""
+    for key, value in source.items():
+        target[key] = target.get(key, 0) + value
+
+def merge_metrics(metrics):
+    """Merge every worker's shard into one snapshot
+
+    Shards are copied with single C-level dict/list copies, so workers
+    keep updating them while the merge runs.
+    """
+    with metrics['shards_lock']:
+        shards = list(metrics['shards'])
+
+    merged = create_shard()
+    for shard in shards:
+        merge_counts(merged['files'], dict(shard['files']))
+        merge_counts(merged['bytes'], dict(shard['bytes']))
+        merge_counts(merged['errors'], dict(shard['errors']))
+        for operation, histogram in dict(shard['latency']).items():
+            histogram = list(histogram)
+            total = merged['latency'].setdefault(operation, [0] * (len(LATENCY_BUCKETS) + 1) + [0.0])
+            for i, value in enumerate(histogram):
+                total[i] += value
+        merged['slow'].extend(list(shard['slow']))
+
+    merged['slow'].sort(key=lambda slow: -slow[2])
+    finished = metrics['finished']
+    merged['duration'] = (finished or time.time()) - metrics['started']
+    merged['running'] = finished is None
+    return merged
+
+def escape_label(value):
+    """Escape a label value for the Prometheus text format"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(base_labels, **labels):
+    """Format a label set, run labels first"""
+    pairs = list(base_labels.items()) + list(labels.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs) + '}'
+
+def render_prometheus(metrics, merged=None):
+    """Render a merged snapshot in the Prometheus text exposition format"""
+    merged = merged or merge_metrics(metrics)
+    labels = metrics['labels']
+    lines = []
+
+    def header(name, kind, description):
+        lines.append(f"# HELP {METRIC_PREFIX}_{name} {description}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+
+    header('files_total', 'counter', "Files placed into category folders.")
+    for category, count in sorted(merged['files'].items()):
+        lines.append(f"{METRIC_PREFIX}_files_total{format_labels(labels, category=category)} {count}")
+
+    header('bytes_total', 'counter', "Bytes placed into category folders.")
+    for category, count in sorted(merged['bytes'].items()):
+        lines.append(f"{METRIC_PREFIX}_bytes_total{format_labels(labels, category=category)} {count}")
+
+    header('errors_total', 'counter', "Failed operations by error type.")
+    for (operation, error_type), count in sorted(merged['errors'].items()):
+        lines.append(f"{METRIC_PREFIX}_errors_total"
+                     f"{format_labels(labels, operation=operation, type=error_type)} {count}")
+
+    header('operation_seconds', 'histogram', "Latency of storage operations and file placements.")
+    for operation, histogram in sorted(merged['latency'].items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), histogram):
+            cumulative += count
+            lines.append(f"{METRIC_PREFIX}_operation_seconds_bucket"
+                         f"{format_labels(labels, operation=operation, le=bound)} {cumulative}")
+        lines.append(f"{METRIC_PREFIX}_operation_seconds_sum"
+                     f"{format_labels(labels, operation=operation)} {histogram[-1]:.6f}")
+        lines.append(f"{METRIC_PREFIX}_operation_seconds_count"
+                     f"{format_labels(labels, operation=operation)} {cumulative}")
+
+    header('slow_operations_total', 'counter', "Placements slower than the slow-operation threshold.")
+    lines.append(f"{METRIC_PREFIX}_slow_operations_total{format_labels(labels)} {len(merged['slow'])}")
+
+    header('run_duration_seconds', 'gauge', "Duration of the run so far, or of the finished run.")
+    lines.append(f"{METRIC_PREFIX}_run_duration_seconds{format_labels(labels)} {merged['duration']:.3f}")
+
+    header('run_in_progress', 'gauge', "1 while the run is going, 0 once it finished.")
+    lines.append(f"{METRIC_PREFIX}_run_in_progress{format_labels(labels)} {int(merged['running'])}")
+
+    header('run_start_time_seconds', 'gauge', "Unix time the run started.")
+    lines.append(f"{METRIC_PREFIX}_run_start_time_seconds{format_labels(labels)} {metrics['started']:.3f}")
+
+    return "\n".join(lines) + "\n"
+
+def write_textfile(metrics, path):
+    """Rewrite a node-exporter textfile atomically"""
+    directory, name = os.path.split(os.path.abspath(path))
+    # The collector only reads *.prom, so the temp file is never half-read;
+    # a unique name per write keeps concurrent writers out of each other's file
+    fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(render_prometheus(metrics))
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def export_metrics_periodically(metrics, path, stop_event, interval=DEFAULT_METRICS_INTERVAL):
+    """Rewrite the textfile every ``interval`` seconds until stop_event is set"""
+    while not stop_event.wait(interval):
+        try:
+            write_textfile(metrics, path)
+        except OSError:
+            pass  # A full or read-only disk must not stop the run
+
+def start_metrics_writer(metrics, path, interval=DEFAULT_METRICS_INTERVAL):
+    """Start rewriting a textfile in a daemon thread; returns the writer (thread and stop event)"""
+    stop_event = threading.Event()
+    thread = threading.Thread(target=export_metrics_periodically, args=(metrics, path, stop_event, interval))
+    thread.daemon = True
+    thread.start()
+    return {'thread': thread, 'stop': stop_event}
+
+def finish_metrics(metrics, path=None, writer=None):
+    """Stop the writer, write the final textfile and return the merged snapshot
+
+    The writer thread is joined first, so a periodic write still in
+    progress can't replace the final file afterwards.
+    """
+    if writer is not None:
+        writer['stop'].set()
+        writer['thread'].join()
+    metrics['finished'] = time.time()
+    merged = merge_metrics(metrics)
+    if path:
+        write_textfile(metrics, path)
+    return merged
@@ -0,0 +1,346 @@
+"""
+Packer - Bundles cold files of each category into tar archives
+No OOP patterns used - functional approach
+
+Files older than a threshold are streamed into Category/packs/*.tar[.gz|.xz]
+on a process pool and removed once their archive is safely on disk. The
+archive is written in frames: every frame is an independent gzip or xz
+stream (concatenated streams are still a valid .tar.gz / .tar.xz), and a
+JSON index next to the archive records the frame and offset of every
+member, so a single file can be extracted without decompressing the rest.
+"""
+
+import os
+import gzip
+import json
+import lzma
+import stat
+import time
+import hashlib
+import tarfile
+from concurrent.futures import ProcessPoolExecutor
+
+from verified_copy import stream_copy, DEFAULT_CHECKSUM_ALGORITHM
+from ignore_rules import walk_directory, TEMP_SUFFIX
+from durability import sync_directory, count_syncs, record_removal
+
+PACK_DIR_NAME = 'packs'
+INDEX_SUFFIX = '.index.json'
+
+PACK_COMPRESSIONS = ('none', 'gz', 'xz')
+ARCHIVE_EXTENSIONS = {'none': '.tar', 'gz': '.tar.gz', 'xz': '.tar.xz'}
+
+# Limits of one archive; bigger categories are split over several
+MAX_ARCHIVE_MEMBERS = 10000
+MAX_ARCHIVE_BYTES = 1024 * 1024 * 1024
+
+# Uncompressed bytes per independently compressed frame
+FRAME_SIZE = 1024 * 1024
+
+TAR_BLOCK_SIZE = tarfile.BLOCKSIZE
+
+# Organizer files inside category folders that are never packed
+SKIPPED_NAMES = {'summary.txt', '.fanout'}
+
+def open_frame(raw_file, compression):
+    """Start a new compressed frame at the current position of the archive"""
+    if compression == 'gz':
+        return gzip.GzipFile(filename='', fileobj=raw_file, mode='wb', mtime=0)
+    if compression == 'xz':
+        return lzma.LZMAFile(raw_file, 'wb')
+    return raw_file
+
+def close_frame(frame, raw_file):
+    """Finish a compressed frame (the archive itself stays open)"""
+    if frame is not raw_file:
+        frame.close()
+
+def find_cold_files(category_path, older_than, rules=None):
+    """List (relative path, size, mtime, permission bits) of files last modified before ``older_than``
+
+    Files matching the ignore ``rules`` and reports still being written
+    are never packed.
+    """
+    cold = []
+
+    for root, dirs, files in walk_directory(category_path, rules):
+        if root == category_path:
+            dirs[:] = [d for d in dirs if d != PACK_DIR_NAME]
+        for filename in files:
+            if filename in SKIPPED_NAMES or filename.endswith(TEMP_SUFFIX):
+                continue
+            path = os.path.join(root, filename)
+            try:
+                stat_info = os.stat(path, follow_symlinks=False)
+            except OSError:
+                continue
+            # Links and special files are left alone
+            if stat.S_ISREG(stat_info.st_mode) and stat_info.st_mtime < older_than:
+                relative = os.path.relpath(path, category_path).replace(os.sep, '/')
+                cold.append((relative, stat_info.st_size, stat_info.st_mtime, stat.S_IMODE(stat_info.st_mode)))
+
+    cold.sort()
+    return cold
+
+def split_into_archives(members):
+    """Split members into groups that respect the per-archive limits"""
+    groups = []
+    current = []
+    current_bytes = 0
+
+    for member in members:
+        if current and (len(current) >= MAX_ARCHIVE_MEMBERS or current_bytes + member[1] > MAX_ARCHIVE_BYTES):
+            groups.append(current)
+            current = []
+            current_bytes = 0
+        current.append(member)
+        current_bytes += member[1]
+
+    if current:
+        groups.append(current)
+    return groups
+
+def write_member(frame, category_path, relative, size, mtime, mode):
+    """Stream one file into the current frame; returns (bytes written, checksum)"""
+    info = tarfile.TarInfo(relative)
+    info.size = size
+    info.mtime = int(mtime)
+    info.mode = mode
+    header = info.tobuf(tarfile.PAX_FORMAT, 'utf-8', 'surrogateescape')
+    frame.write(header)
+
+    digest = hashlib.new(DEFAULT_CHECKSUM_ALGORITHM)
+    with open(os.path.join(category_path, relative), 'rb') as source_file:
+        copied = stream_copy(source_file, frame, digest, size)
+    if copied != size:
+        raise OSError(f"{relative} changed size while being packed")
+
+    padding = -size % TAR_BLOCK_SIZE
+    frame.write(b"\0" * padding)
+    return len(header) + size + padding, digest.hexdigest()
+
+def pack_archive(task):
+    """Write one archive and its index, then remove the packed files (runs in a worker process)
+
+    Returns the index. If anything fails the partial archive is removed and
+    every original is left in place. The archive, its index and the packs
+    folder are synced before any original goes, whatever the durability
+    level: afterwards the archive is the only copy.
+    """
+    category_path = task['category_path']
+    archive_path = task['archive_path']
+    compression = task['compression']
+    members = []
+
+    try:
+        with open(archive_path, 'xb') as raw_file:
+            frame = open_frame(raw_file, compression)
+            frame_offset = 0
+            frame_used = 0
+
+            for relative, size, mtime, mode in task['members']:
+                if frame_used >= FRAME_SIZE:
+                    close_frame(frame, raw_file)
+                    # gzip writes its header as soon as the frame opens
+                    frame_offset = raw_file.tell()
+                    frame = open_frame(raw_file, compression)
+                    frame_used = 0
+
+                written, checksum = write_member(frame, category_path, relative, size, mtime, mode)
+                members.append({
+                    'name': relative,
+                    'size': size,
+                    'mtime': mtime,
+                    'checksum': checksum,
+                    'frame': frame_offset,
+                    'skip': frame_used
+                })
+                frame_used += written
+
+            close_frame(frame, raw_file)
+
+            # End-of-archive marker in a frame of its own
+            frame = open_frame(raw_file, compression)
+            frame.write(b"\0" * (2 * TAR_BLOCK_SIZE))
+            close_frame(frame, raw_file)
+
+            raw_file.flush()
+            os.fsync(raw_file.fileno())
+
+        index = {
+            'archive': os.path.basename(archive_path),
+            'compression': compression,
+            'checksum_algorithm': DEFAULT_CHECKSUM_ALGORITHM,
+            'members': members
+        }
+        with open(archive_path + INDEX_SUFFIX, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # The archive's folder entries must be on disk before the originals' removals are
+        sync_directory(os.path.dirname(archive_path))
+    except BaseException:
+        for path in (archive_path, archive_path + INDEX_SUFFIX):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        raise
+
+    # Only now that the archive is durable do the originals go
+    for member in members:
+        try:
+            os.remove(os.path.join(category_path, member['name']))
+        except FileNotFoundError:
+            pass
+
+    return index
+
+def build_pack_tasks(base_folder, categories, older_than, compression, rules=None):
+    """Plan the archives of every category with cold files"""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    tasks = []
+
+    for category in categories:
+        category_path = os.path.join(base_folder, category)
+        if not os.path.isdir(category_path):
+            continue
+
+        groups = split_into_archives(find_cold_files(category_path, older_than, rules))
+        if groups:
+            os.makedirs(os.path.join(category_path, PACK_DIR_NAME), exist_ok=True)
+
+        for number, members in enumerate(groups, 1):
+            name = f"{category}-{stamp}-{number:03d}{ARCHIVE_EXTENSIONS[compression]}"
+            tasks.append({
+                'category': category,
+                'category_path': category_path,
+                'archive_path': os.path.join(category_path, PACK_DIR_NAME, name),
+                'compression': compression,
+                'members': members
+            })
+
+    return tasks
+
+def pack_folder(base_folder, older_than_days, compression='gz', workers=None, categories=None,
+                journal=None, rules=None, durability=None):
+    """Pack the cold files of every category folder on a process pool
+
+    Returns {'archives': [...], 'packed': {category: {member: archive}}} with
+    archive paths relative to their category folder. The folders the
+    originals were removed from are synced per the ``durability`` level.
+    """
+    from file_organizer import FILE_CATEGORIES
+    from journal import append_journal_entry
+
+    if compression not in PACK_COMPRESSIONS:
+        raise ValueError(f"Unknown pack compression: {compression}")
+
+    older_than = time.time() - older_than_days * 86400
+    tasks = build_pack_tasks(base_folder, categories or FILE_CATEGORIES.keys(), older_than, compression, rules)
+    result = {'archives': [], 'packed': {}}
+    if not tasks:
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        indexes = list(executor.map(pack_archive, tasks))
+
+    for task, index in zip(tasks, indexes):
+        archive = f"{PACK_DIR_NAME}/{index['archive']}"
+        packed = result['packed'].setdefault(task['category'], {})
+
+        result['archives'].append({
+            'category': task['category'],
+            'archive': archive,
+            'members': len(index['members']),
+            'bytes': sum(member['size'] for member in index['members']),
+            'size': os.path.getsize(task['archive_path'])
+        })
+        if durability is not None:
+            # Archive and index data plus the packs folder, synced by the worker
+            count_syncs(durability, files=2, dirs=1)
+        removed_from = set()
+        for member in index['members']:
+            removed_from.add(os.path.dirname(os.path.join(task['category_path'], member['name'])))
+            packed[member['name']] = archive
+            append_journal_entry(journal, {
+                'op': 'pack',
+                'source': f"{task['category']}/{member['name']}",
+                'destination': f"{task['category']}/{archive}",
+                'category': task['category'],
+                'detail': member['checksum']
+            })
+        for directory in sorted(removed_from):
+            record_removal(durability, directory)
+
+    return result
+
+def read_pack_index(archive_path):
+    """Read the index written next to an archive"""
+    with open(archive_path + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def open_member_stream(archive_file, compression, member):
+    """Position a readable stream at the tar header of a member"""
+    archive_file.seek(member['frame'])
+    if compression == 'gz':
+        stream = gzip.GzipFile(fileobj=archive_file, mode='rb')
+    elif compression == 'xz':
+        stream = lzma.LZMAFile(archive_file, 'rb')
+    else:
+        stream = archive_file
+
+    # Skip the members that precede this one in its frame
+    remaining = member['skip']
+    while remaining:
+        skipped = len(stream.read(min(remaining, FRAME_SIZE)))
+        if not skipped:
+            raise EOFError("Archive is shorter than its index")
+        remaining -= skipped
+
+    return stream
+
+def extract_member(archive_path, member_name, destination_dir):
+    """Extract one member of a packed archive into ``destination_dir``
+
+    Only the member's frame is decompressed, and the file gets back the
+    permission bits recorded in its tar header. Returns the extracted path;
+    raises KeyError if the archive has no such member and ValueError if
+    the extracted data doesn't match the recorded checksum.
+    """
+    index = read_pack_index(archive_path)
+    member = next((m for m in index['members'] if m['name'] == member_name), None)
+    if member is None:
+        raise KeyError(f"{member_name} is not in {os.path.basename(archive_path)}")
+
+    destination_path = os.path.join(destination_dir, os.path.basename(member_name))
+    digest = hashlib.new(index['checksum_algorithm'])
+
+    with open(archive_path, 'rb') as archive_file:
+        stream = open_member_stream(archive_file, index['compression'], member)
+        with tarfile.open(fileobj=stream, mode='r|') as tar:
+            info = tar.next()
+            if info is None or info.name != member_name:
+                raise ValueError(f"Index of {os.path.basename(archive_path)} is out of date")
+
+            os.makedirs(destination_dir, exist_ok=True)
+            # Owner-only until the recorded mode is restored, so a private file is never exposed
+            with open(destination_path, 'xb', opener=lambda path, flags: os.open(path, flags, 0o600)) as destination_file:
+                stream_copy(tar.extractfile(info), destination_file, digest, info.size)
+            mode = info.mode
+
+    if digest.hexdigest() != member['checksum']:
+        os.remove(destination_path)
+        raise ValueError(f"Checksum mismatch extracting {member_name}")
+
+    os.chmod(destination_path, mode)
+    os.utime(destination_path, (member['mtime'], member['mtime']))
+    return destination_path
+
+def describe_pack(archive):
+    """Describe a packed archive for summaries"""
+    from file_utils import format_file_size
+
+    return (f"{archive['archive']}: {archive['members']} files, "
+            f"{format_file_size(archive['bytes'])} → {format_file_size(archive['size'])}")
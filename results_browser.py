@@ -0,0 +1,350 @@
+"""
+Results Browser - Browse the files of a run by category, page by page
+No OOP patterns used - functional approach
+
+The browser reads the run's own index: organized_files plus the size and
+mtime columns the engine records while placing files (see
+file_organizer.start_report_columns). Sorted orders and search results are
+compact arrays of row numbers into that index, so nothing is copied per
+file, and the Treeview only ever holds the pages the user scrolled
+through: a category gets its first page when it is opened and the next
+one when its "more" row scrolls into view. Searches and sorts run on a
+background thread; a search that extends the previous one only narrows
+the previous result.
+"""
+
+import os
+import sys
+import array
+import threading
+import subprocess
+import tkinter as tk
+from tkinter import ttk
+from datetime import datetime
+
+from file_utils import format_file_size
+
+# Rows inserted into the tree per page
+PAGE_SIZE = 500
+
+# Milliseconds of typing pause before a search runs
+SEARCH_DELAY_MS = 250
+
+SORT_KEYS = ('name', 'size', 'mtime')
+
+SORT_HEADINGS = {'name': "Name", 'size': "Size", 'mtime': "Modified"}
+
+def open_path(path):
+    """Open a file or folder with the platform's default application"""
+    if sys.platform == 'win32':
+        os.startfile(path)
+    elif sys.platform == 'darwin':
+        subprocess.Popen(['open', path])
+    else:
+        subprocess.Popen(['xdg-open', path])
+
+def stat_columns(base_folder, category, files):
+    """Stat a category's files once, for runs that recorded no columns"""
+    sizes = array.array('q')
+    mtimes = array.array('d')
+    category_path = os.path.join(base_folder, category)
+    for name in files:
+        try:
+            stat_info = os.stat(os.path.join(category_path, name))
+            sizes.append(stat_info.st_size)
+            mtimes.append(stat_info.st_mtime)
+        except OSError:
+            sizes.append(0)
+            mtimes.append(0.0)
+    return sizes, mtimes
+
+def build_results_index(base_folder, organized_files, report=None):
+    """Index the files of a run for browsing, without copying the name lists"""
+    report = report or {}
+    categories = {}
+
+    for category, files in organized_files.items():
+        if not files:
+            continue
+        sizes = report.get('sizes', {}).get(category)
+        mtimes = report.get('mtimes', {}).get(category)
+        if sizes is None or mtimes is None or len(sizes) != len(files):
+            sizes, mtimes = stat_columns(base_folder, category, files)
+        categories[category] = {
+            'files': files,
+            'sizes': sizes,
+            'mtimes': mtimes,
+            'orders': {}  # sort key -> row numbers in ascending order
+        }
+
+    return {'base_folder': base_folder, 'categories': categories}
+
+def get_sort_order(entry, key):
+    """Row numbers of a category in ascending ``key`` order, computed once per key"""
+    order = entry['orders'].get(key)
+    if order is None:
+        files = entry['files']
+        if key == 'name':
+            sort_key = lambda row: files[row].lower()
+        else:
+            sort_key = (entry['sizes'] if key == 'size' else entry['mtimes']).__getitem__
+        order = entry['orders'][key] = array.array('q', sorted(range(len(files)), key=sort_key))
+    return order
+
+def query_category(entry, key, needle='', previous=None):
+    """Get a category's rows sorted by ``key`` and matching ``needle``
+
+    When ``previous`` is the view of a shorter search with the same sort,
+    only its rows are searched again.
+    """
+    needle = needle.lower()
+    files = entry['files']
+
+    if (previous is not None and previous['key'] == key and previous['needle']
+            and needle.startswith(previous['needle'])):
+        if needle == previous['needle']:
+            return previous
+        rows = previous['rows']
+    else:
+        rows = get_sort_order(entry, key)
+
+    if needle:
+        rows = array.array('q', (row for row in rows if needle in files[row].lower()))
+
+    return {'key': key, 'needle': needle, 'rows': rows}
+
+def get_page(view, start, count, descending=False):
+    """Get ``count`` row numbers of a view starting at ``start``"""
+    rows = view['rows']
+    if not descending:
+        return rows[start:start + count]
+    end = len(rows) - start
+    return rows[max(0, end - count):end][::-1]
+
+def format_row(entry, row):
+    """Format one file's name, size and date for the tree"""
+    mtime = entry['mtimes'][row]
+    return (
+        entry['files'][row],
+        format_file_size(entry['sizes'][row]),
+        datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M') if mtime else ""
+    )
+
+def get_category_iid(category):
+    """Tree item id of a category node"""
+    return f"category:{category}"
+
+def get_more_iid(category):
+    """Tree item id of a category's "more" row"""
+    return f"more:{category}"
+
+def set_category_label(browser, category):
+    """Show a category's file count (and match count while searching)"""
+    total = len(browser['index']['categories'][category]['files'])
+    shown = len(browser['views'][category]['rows'])
+    count = f"{shown:,} of {total:,}" if browser['needle'] else f"{total:,}"
+    browser['tree'].item(get_category_iid(category), text=f"📁 {category} ({count} files)")
+
+def load_next_page(browser, category):
+    """Insert a category's next page of rows, replacing its "more" row"""
+    tree = browser['tree']
+    entry = browser['index']['categories'][category]
+    view = browser['views'][category]
+    parent = get_category_iid(category)
+    loaded = browser['loaded'][category]
+    browser['pending'].discard(category)
+
+    if tree.exists(get_more_iid(category)):
+        tree.delete(get_more_iid(category))
+
+    for row in get_page(view, loaded, PAGE_SIZE, browser['descending']):
+        name, size, modified = format_row(entry, row)
+        tree.insert(parent, 'end', iid=f"file:{category}:{row}", text=name, values=(size, modified))
+
+    loaded = browser['loaded'][category] = min(len(view['rows']), loaded + PAGE_SIZE)
+    remaining = len(view['rows']) - loaded
+    if remaining:
+        tree.insert(parent, 'end', iid=get_more_iid(category), text=f"⋯ {remaining:,} more", values=("", ""))
+
+def reset_category(browser, category):
+    """Drop a category's loaded rows; reload its first page if it is open"""
+    tree = browser['tree']
+    parent = get_category_iid(category)
+    children = tree.get_children(parent)
+    if children:
+        tree.delete(*children)
+    browser['loaded'][category] = 0
+    set_category_label(browser, category)
+
+    if not browser['views'][category]['rows']:
+        return
+    if tree.item(parent, 'open'):
+        load_next_page(browser, category)
+    else:
+        # A "more" row keeps the expand arrow without loading anything
+        tree.insert(parent, 'end', iid=get_more_iid(category), text="⋯", values=("", ""))
+
+def handle_open(browser):
+    """Load the first page of a category when it is expanded"""
+    iid = browser['tree'].focus()
+    if not iid.startswith('category:'):
+        return
+    category = iid[len('category:'):]
+    if browser['loaded'][category] == 0 and browser['views'][category]['rows']:
+        load_next_page(browser, category)
+
+def handle_scroll(browser, scrollbar, first, last):
+    """Move the scrollbar and load the next page of any open category whose end came into view"""
+    scrollbar.set(first, last)
+    tree = browser['tree']
+    for category in browser['views']:
+        more = get_more_iid(category)
+        if category in browser['pending'] or not browser['loaded'][category] or not tree.exists(more):
+            continue
+        if tree.bbox(more):
+            # Loading from inside the scroll callback would re-enter it
+            browser['pending'].add(category)
+            tree.after_idle(load_next_page, browser, category)
+
+def handle_activate(browser, event):
+    """Open a file (or load more rows) on double click or Enter"""
+    tree = browser['tree']
+    iid = tree.focus()
+    if iid.startswith('more:'):
+        load_next_page(browser, iid[len('more:'):])
+    elif iid.startswith('file:'):
+        _, category, row = iid.split(':', 2)
+        name = browser['index']['categories'][category]['files'][int(row)]
+        open_path(os.path.join(browser['index']['base_folder'], category, name))
+
+def update_headings(browser):
+    """Mark the sorted column with an arrow"""
+    arrow = " ▼" if browser['descending'] else " ▲"
+    for key, column in (('name', '#0'), ('size', 'size'), ('mtime', 'modified')):
+        text = SORT_HEADINGS[key] + (arrow if browser['key'] == key else "")
+        browser['tree'].heading(column, text=text)
+
+def refresh_views(browser):
+    """Recompute every category's view on a background thread, then show it"""
+    browser['generation'] += 1
+    generation = browser['generation']
+    key, needle = browser['key'], browser['needle']
+    previous = dict(browser['views'])
+    browser['status_var'].set("Searching..." if needle else "Sorting...")
+
+    def compute():
+        views = {
+            category: query_category(entry, key, needle, previous.get(category))
+            for category, entry in browser['index']['categories'].items()
+        }
+        try:
+            browser['window'].after(0, show_views, browser, generation, views)
+        except (tk.TclError, RuntimeError):
+            pass  # The window was closed meanwhile
+
+    thread = threading.Thread(target=compute)
+    thread.daemon = True
+    thread.start()
+
+def show_views(browser, generation, views):
+    """Swap in freshly computed views unless a newer search superseded them"""
+    if generation != browser['generation']:
+        return
+    browser['views'] = views
+    for category in views:
+        reset_category(browser, category)
+    update_headings(browser)
+
+    matches = sum(len(view['rows']) for view in views.values())
+    browser['status_var'].set(f"{matches:,} matching files" if browser['needle'] else f"{matches:,} files")
+
+def handle_sort(browser, key):
+    """Sort by a column; clicking the sorted column again reverses it"""
+    if browser['key'] == key:
+        # Reversing only changes how pages are read
+        browser['descending'] = not browser['descending']
+        for category in browser['views']:
+            reset_category(browser, category)
+        update_headings(browser)
+        return
+    browser['key'] = key
+    browser['descending'] = key != 'name'  # Largest and newest first
+    refresh_views(browser)
+
+def handle_search_typed(browser):
+    """Run the search once typing pauses"""
+    if browser['search_job'] is not None:
+        browser['window'].after_cancel(browser['search_job'])
+    browser['search_job'] = browser['window'].after(SEARCH_DELAY_MS, run_search, browser)
+
+def run_search(browser):
+    """Search file names for the text in the search box"""
+    browser['search_job'] = None
+    needle = browser['search_var'].get().strip().lower()
+    if needle != browser['needle']:
+        browser['needle'] = needle
+        refresh_views(browser)
+
+def open_results_browser(parent, base_folder, organized_files, report=None, colors=None):
+    """Open a window browsing the files a run organized"""
+    colors = colors or {}
+    window = tk.Toplevel(parent)
+    window.title(f"Results - {base_folder}")
+    window.geometry("800x600")
+    window.configure(bg=colors.get('bg_dark', '#1e1e1e'))
+
+    browser = {
+        'window': window,
+        'index': build_results_index(base_folder, organized_files, report),
+        'key': 'name',
+        'descending': False,
+        'needle': '',
+        'views': {},
+        'loaded': {},
+        'pending': set(),  # Categories with a page load scheduled
+        'generation': 0,
+        'search_job': None,
+        'search_var': tk.StringVar(),
+        'status_var': tk.StringVar(value="")
+    }
+
+    # Search box, folder button and match count
+    toolbar = tk.Frame(window, bg=colors.get('bg_dark', '#1e1e1e'))
+    toolbar.pack(fill='x', padx=10, pady=10)
+    tk.Label(toolbar, text="🔍", bg=colors.get('bg_dark', '#1e1e1e'),
+             fg=colors.get('text', '#ffffff')).pack(side='left')
+    search_entry = tk.Entry(toolbar, textvariable=browser['search_var'], width=40, relief='flat')
+    search_entry.pack(side='left', padx=(5, 10))
+    browser['search_var'].trace_add('write', lambda *_: handle_search_typed(browser))
+    tk.Button(toolbar, text="📂 Open folder", relief='flat',
+              command=lambda: open_path(base_folder)).pack(side='left')
+    tk.Label(toolbar, textvariable=browser['status_var'], bg=colors.get('bg_dark', '#1e1e1e'),
+             fg=colors.get('text_secondary', '#cccccc')).pack(side='right')
+
+    tree_frame = tk.Frame(window)
+    tree_frame.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+    tree = browser['tree'] = ttk.Treeview(tree_frame, columns=('size', 'modified'), selectmode='browse')
+    tree.column('#0', width=480)
+    tree.column('size', width=110, anchor='e')
+    tree.column('modified', width=150)
+    for key, column in (('name', '#0'), ('size', 'size'), ('mtime', 'modified')):
+        tree.heading(column, command=lambda key=key: handle_sort(browser, key))
+
+    scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=tree.yview)
+    tree.configure(yscrollcommand=lambda first, last: handle_scroll(browser, scrollbar, first, last))
+    scrollbar.pack(side='right', fill='y')
+    tree.pack(side='left', fill='both', expand=True)
+
+    tree.bind('<<TreeviewOpen>>', lambda event: handle_open(browser))
+    tree.bind('<Double-1>', lambda event: handle_activate(browser, event))
+    tree.bind('<Return>', lambda event: handle_activate(browser, event))
+
+    # Only the category nodes exist until one is opened
+    for category, entry in browser['index']['categories'].items():
+        tree.insert('', 'end', iid=get_category_iid(category), text=category)
+        browser['views'][category] = {'key': 'name', 'needle': '', 'rows': array.array('q')}
+        browser['loaded'][category] = 0
+
+    refresh_views(browser)
+    search_entry.focus_set()
+    return browser
@@ -0,0 +1,299 @@
+"""
+Sharding - Lets several workers or hosts organize one huge folder together
+No OOP patterns used - functional approach
+
+Filenames are split into shards by a stable hash. A worker owns a shard
+while it holds the shard's lease, a small file under .organizer/leases.
+Leases carry a generation number and are only ever put in place with
+no-replace renames of a fully written temp file, so when a lease expires
+exactly one worker can take over generation n+1, and no worker ever
+reads a half-written lease.
+Files are moved with no-replace renames that retry the next suffix when
+a name is taken, so workers never overwrite each other's files in a
+category.
+"""
+
+import os
+import json
+import time
+import zlib
+import socket
+
+from journal import get_state_dir, open_journal, append_journal_entry, close_journal
+from file_organizer import categorize_file, get_organize_options, FILE_CATEGORIES, ORGANIZE_DEFAULTS
+from throttle import set_throttle_limits, throttle_operation, get_throttle_stats
+from durability import create_durability, record_placement, flush_durability
+from ignore_rules import load_rules, is_ignored
+from atomic_rename import rename_noreplace, move_file_noclobber
+
+LEASES_DIR_NAME = 'leases'
+
+DEFAULT_SHARD_COUNT = 64
+DEFAULT_LEASE_SECONDS = 60
+DEFAULT_MAX_CLAIMS = 8
+
+# Options that change where files end up, which shard workers don't implement;
+# they are rejected unless left at their defaults
+UNSUPPORTED_SHARD_OPTIONS = ('strategy', 'fanout_threshold', 'pack_older_than_days', 'snapshot', 'chunk_size')
+
+def get_shard(filename, shard_count):
+    """Get the shard of a filename (stable across processes and hosts)"""
+    return zlib.crc32(os.fsencode(filename)) % shard_count
+
+def get_default_worker_id():
+    """Build a worker id that is unique across hosts"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def get_lease_dir(base_folder, run_id):
+    """Get (and create) the lease folder of a sharded run"""
+    lease_dir = os.path.join(get_state_dir(base_folder), LEASES_DIR_NAME, run_id)
+    os.makedirs(lease_dir, exist_ok=True)
+    return lease_dir
+
+def get_lease_path(lease_dir, shard, generation):
+    """Get the path of one generation of a shard's lease"""
+    return os.path.join(lease_dir, f"shard-{shard:05d}.g{generation:06d}.lease")
+
+def get_done_path(lease_dir, shard):
+    """Get the path of the marker written once a shard is fully processed"""
+    return os.path.join(lease_dir, f"shard-{shard:05d}.done")
+
+def read_lease_state(lease_dir, shard_count):
+    """Read the newest lease generation and done marker of every shard"""
+    state = {shard: {'generation': 0, 'done': False} for shard in range(shard_count)}
+
+    for name in os.listdir(lease_dir):
+        if not name.startswith("shard-"):
+            continue
+        try:
+            shard = int(name[6:11])
+        except ValueError:
+            continue
+        if shard not in state:
+            continue
+
+        if name.endswith(".done"):
+            state[shard]['done'] = True
+        elif name.endswith(".lease"):
+            generation = int(name[13:19])
+            state[shard]['generation'] = max(state[shard]['generation'], generation)
+
+    return state
+
+def read_lease(lease_path):
+    """Read a lease file, or None if it vanished or is being written"""
+    try:
+        with open(lease_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_lease(lease_path, worker_id, lease_seconds, exclusive):
+    """Write a lease; with ``exclusive`` the file must not exist yet (FileExistsError)
+
+    The lease is written in full under a temp name and then renamed into
+    place, so readers never see it half-written.
+    """
+    content = json.dumps({'owner': worker_id, 'expires': time.time() + lease_seconds})
+
+    temp_path = f"{lease_path}.{worker_id}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    if not exclusive:
+        os.replace(temp_path, lease_path)
+        return
+
+    try:
+        rename_noreplace(temp_path, lease_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def is_abandoned_lease(lease_path, lease_seconds):
+    """Check if an unreadable lease was left unfinished long enough ago to count as expired"""
+    try:
+        return time.time() - os.stat(lease_path).st_mtime > lease_seconds
+    except OSError:
+        return False  # Gone: a newer generation already replaced it
+
+def try_claim_shard(lease_dir, shard, generation, worker_id, lease_seconds):
+    """Try to take a shard whose newest lease is ``generation``; returns the lease or None"""
+    if generation:
+        lease_path = get_lease_path(lease_dir, shard, generation)
+        current = read_lease(lease_path)
+        if current is None:
+            # Leases are renamed into place whole, so an unreadable one was left by a
+            # crash or an older writer; it expires like a live lease would have
+            if not is_abandoned_lease(lease_path, lease_seconds):
+                return None
+        elif current['expires'] > time.time():
+            return None
+
+    try:
+        write_lease(get_lease_path(lease_dir, shard, generation + 1), worker_id, lease_seconds, True)
+    except FileExistsError:
+        return None  # Another worker won this generation
+
+    # The previous generation is dead; clean it up
+    if generation:
+        try:
+            os.remove(get_lease_path(lease_dir, shard, generation))
+        except OSError:
+            pass
+
+    return {'shard': shard, 'generation': generation + 1}
+
+def claim_shards(lease_dir, shard_count, worker_id, lease_seconds, max_claims):
+    """Claim up to ``max_claims`` free or expired shards"""
+    claimed = []
+
+    for shard, shard_state in read_lease_state(lease_dir, shard_count).items():
+        if len(claimed) >= max_claims:
+            break
+        if shard_state['done']:
+            continue
+
+        lease = try_claim_shard(lease_dir, shard, shard_state['generation'], worker_id, lease_seconds)
+        if lease:
+            claimed.append(lease)
+
+    return claimed
+
+def renew_lease(lease_dir, lease, worker_id, lease_seconds):
+    """Extend a held lease; returns False if another worker has taken the shard over"""
+    newer_path = get_lease_path(lease_dir, lease['shard'], lease['generation'] + 1)
+    if os.path.exists(newer_path):
+        return False
+
+    write_lease(get_lease_path(lease_dir, lease['shard'], lease['generation']), worker_id, lease_seconds, False)
+    return True
+
+def renew_leases(lease_dir, leases, worker_id, lease_seconds):
+    """Extend every held lease, flagging the ones that were taken over"""
+    for lease in leases:
+        if not lease.get('lost'):
+            lease['lost'] = not renew_lease(lease_dir, lease, worker_id, lease_seconds)
+
+def release_shard(lease_dir, lease, done):
+    """Give a shard back, marking it done if all of its files were processed"""
+    if done:
+        with open(get_done_path(lease_dir, lease['shard']), 'w', encoding='utf-8'):
+            pass
+
+    try:
+        os.remove(get_lease_path(lease_dir, lease['shard'], lease['generation']))
+    except OSError:
+        pass
+
+
+def scan_shard_files(folder_path, shards, shard_count, rules=None):
+    """List the top-level files that belong to the given shards, skipping ignored names"""
+    wanted = set(shards)
+    files = {shard: [] for shard in wanted}
+
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if is_ignored(rules, entry.name):
+                continue
+            if entry.is_file():
+                shard = get_shard(entry.name, shard_count)
+                if shard in wanted:
+                    files[shard].append(entry.name)
+
+    return files
+
+def run_shard_worker(folder_path, run_id, worker_id=None, shard_count=DEFAULT_SHARD_COUNT,
+                     lease_seconds=DEFAULT_LEASE_SECONDS, max_claims=DEFAULT_MAX_CLAIMS,
+                     options=None, progress_callback=None):
+    """Organize the shards of a folder this worker manages to claim
+
+    Every worker of one sharded run must use the same ``run_id`` and
+    ``shard_count``. Returns the organized files of this worker by category.
+    """
+    options = get_organize_options(options)
+    if options['mode'] != 'move':
+        raise ValueError("Sharded runs only support the 'move' mode")
+    for name in UNSUPPORTED_SHARD_OPTIONS:
+        if options[name] != ORGANIZE_DEFAULTS[name]:
+            raise ValueError(f"Sharded runs don't support the '{name}' option")
+    if options['max_bytes_per_second'] is not None or options['max_ops_per_second'] is not None:
+        set_throttle_limits(options['max_bytes_per_second'], options['max_ops_per_second'])
+
+    worker_id = worker_id or get_default_worker_id()
+    lease_dir = get_lease_dir(folder_path, run_id)
+    # The same rules as a single-process run: reports, partial downloads and state stay put
+    rules = load_rules(folder_path, options['ignore'], options['ignore_defaults'])
+    renew_interval = lease_seconds / 3.0
+
+    organized_files = {category: [] for category in FILE_CATEGORIES.keys()}
+    created_categories = set()
+    unsupported_renames = set()
+    durability = create_durability(options['durability'], options['durability_batch'])
+    journal = open_journal(folder_path, durability=durability) if options['journal'] else None
+    done_count = 0
+    total_count = 0
+
+    try:
+        while True:
+            leases = claim_shards(lease_dir, shard_count, worker_id, lease_seconds, max_claims)
+            if not leases:
+                break
+
+            shard_files = scan_shard_files(folder_path, [lease['shard'] for lease in leases], shard_count, rules)
+            total_count += sum(len(names) for names in shard_files.values())
+            last_renewal = time.monotonic()
+
+            for lease in leases:
+                for filename in shard_files[lease['shard']]:
+                    if time.monotonic() - last_renewal > renew_interval:
+                        renew_leases(lease_dir, leases, worker_id, lease_seconds)
+                        last_renewal = time.monotonic()
+                    if lease.get('lost'):
+                        break  # Someone took the shard over after our lease expired
+
+                    throttle_operation()
+                    category = categorize_file(filename)
+                    category_path = os.path.join(folder_path, category)
+                    if category not in created_categories:
+                        os.makedirs(category_path, exist_ok=True)
+                        created_categories.add(category)
+
+                    result = move_file_noclobber(
+                        os.path.join(folder_path, filename), category_path, unsupported_renames
+                    )
+
+                    if result is not None:
+                        record_placement(durability, os.path.join(category_path, result), folder_path)
+                        organized_files[category].append(result)
+                        append_journal_entry(journal, {
+                            'op': 'move',
+                            'source': filename,
+                            'destination': f"{category}/{result}",
+                            'category': category,
+                            'detail': f"shard {lease['shard']} by {worker_id}"
+                        })
+
+                    done_count += 1
+                    if progress_callback:
+                        progress_callback({
+                            'done': done_count,
+                            'total': total_count,
+                            'filename': filename,
+                            'category': category,
+                            'shard': lease['shard'],
+                            'throttle': get_throttle_stats()
+                        })
+
+                if not lease.get('lost'):
+                    # A shard is only marked done once its moves are on disk
+                    flush_durability(durability)
+                    release_shard(lease_dir, lease, done=True)
+    finally:
+        close_journal(journal)
+        flush_durability(durability)
+
+    return organized_files
@@ -0,0 +1,318 @@
+"""
+Snapshots - Sorted per-run listings of an organized folder and streaming diffs
+No OOP patterns used - functional approach
+
+A snapshot is one line per file (inode, size, mtime, category, path)
+sorted by inode, written under the .organizer folder after a run. Two
+snapshots are compared with merge joins, so a diff reads each file once,
+in order, and holds only one sort chunk in memory however many millions
+of entries they list:
+
+1. Join on inode: the same inode under the same path is unchanged or
+   modified, under another path with the same mtime it was moved (a
+   rename keeps the mtime; a different one means the filesystem reused
+   the inode of a deleted file for a new one).
+2. Entries without a partner are sorted by path (spilling sorted chunks
+   to temp files) and joined again: a path on both sides was replaced
+   (modified), the rest were removed or added.
+"""
+
+import os
+import heapq
+import shutil
+import tempfile
+import itertools
+from datetime import datetime
+
+from journal import get_state_dir, STATE_DIR_NAME
+from ignore_rules import load_rules, is_ignored, TEMP_SUFFIX
+from durability import sync_before_replace, record_written_file
+
+SNAPSHOTS_DIR_NAME = 'snapshots'
+SNAPSHOT_PREFIX = 'snapshot-'
+SNAPSHOT_SUFFIX = '.tsv'
+SNAPSHOT_HEADER = '# folder-organizer snapshot v1\tinode\tsize\tmtime_ns\tcategory\tpath\n'
+
+# Records sorted in memory before a chunk is spilled to a temp file
+SORT_CHUNK_RECORDS = 500000
+
+CHANGE_TYPES = ('added', 'removed', 'moved', 'modified')
+
+# Record fields, in file order
+INODE, SIZE, MTIME, CATEGORY, PATH = range(5)
+
+def get_snapshots_dir(base_folder):
+    """Get the folder holding the snapshots of a base folder"""
+    return os.path.join(get_state_dir(base_folder), SNAPSHOTS_DIR_NAME)
+
+def escape_path(path):
+    """Escape the characters that would break a tab-separated line"""
+    return path.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+def unescape_path(text):
+    """Undo escape_path"""
+    if '\\' not in text:
+        return text
+    return text.replace('\\\\', '\0').replace('\\t', '\t').replace('\\n', '\n').replace('\0', '\\')
+
+def format_record(record):
+    """Format a record as one snapshot line"""
+    return (f"{record[INODE]}\t{record[SIZE]}\t{record[MTIME]}\t"
+            f"{record[CATEGORY]}\t{escape_path(record[PATH])}\n")
+
+def parse_record(line):
+    """Parse one snapshot line into an (inode, size, mtime_ns, category, path) tuple"""
+    inode, size, mtime, category, path = line.rstrip('\n').split('\t', 4)
+    return (int(inode), int(size), int(mtime), category, unescape_path(path))
+
+def iter_folder_records(base_folder, rules=None):
+    """Yield a record for every file below a folder, skipping ignored entries
+
+    Directory entries carry their inode, so each file costs one lstat.
+    The category is a file's top-level folder ('' for loose files).
+    Symlinks are listed as themselves, never followed.
+    """
+    stack = ['']
+    while stack:
+        prefix = stack.pop()
+        try:
+            scanner = os.scandir(os.path.join(base_folder, prefix) if prefix else base_folder)
+        except OSError:
+            continue  # Removed or unreadable while walking
+        with scanner:
+            for entry in scanner:
+                path = prefix + entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if (not prefix and entry.name == STATE_DIR_NAME) or is_ignored(rules, entry.name, is_dir, path):
+                        continue
+                    if is_dir:
+                        stack.append(path + '/')
+                        continue
+                    info = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                category = prefix.split('/', 1)[0]
+                yield (entry.inode(), info.st_size, info.st_mtime_ns, category, path)
+
+def create_sorter(key, temp_dir=None, chunk_size=SORT_CHUNK_RECORDS):
+    """Create an external sorter: records are added, then read back in ``key`` order"""
+    return {
+        'key': key,
+        'chunk': [],
+        'chunk_size': chunk_size,
+        'temp_dir': temp_dir,
+        'spill_dir': None,
+        'runs': [],
+        'records': 0
+    }
+
+def spill_chunk(sorter):
+    """Sort the chunk in memory and write it to a temp file"""
+    if sorter['spill_dir'] is None:
+        sorter['spill_dir'] = tempfile.mkdtemp(prefix='organizer-sort-', dir=sorter['temp_dir'])
+    path = os.path.join(sorter['spill_dir'], f"run-{len(sorter['runs'])}{SNAPSHOT_SUFFIX}")
+    sorter['chunk'].sort(key=sorter['key'])
+    with open(path, 'w', encoding='utf-8', errors='surrogateescape') as f:
+        f.writelines(format_record(record) for record in sorter['chunk'])
+    sorter['runs'].append(path)
+    sorter['chunk'] = []
+
+def add_to_sorter(sorter, record):
+    """Add a record, spilling the chunk once it is full"""
+    sorter['chunk'].append(record)
+    sorter['records'] += 1
+    if len(sorter['chunk']) >= sorter['chunk_size']:
+        spill_chunk(sorter)
+
+def iter_run(path):
+    """Read back one spilled run"""
+    with open(path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+        for line in f:
+            yield parse_record(line)
+
+def iter_sorted(sorter):
+    """Yield every added record in key order, merging the spilled runs"""
+    if not sorter['runs']:
+        sorter['chunk'].sort(key=sorter['key'])
+        yield from sorter['chunk']
+        return
+
+    if sorter['chunk']:
+        spill_chunk(sorter)
+    yield from heapq.merge(*(iter_run(path) for path in sorter['runs']), key=sorter['key'])
+
+def close_sorter(sorter):
+    """Delete the sorter's temp files"""
+    sorter['chunk'] = []
+    if sorter['spill_dir'] is not None:
+        shutil.rmtree(sorter['spill_dir'], ignore_errors=True)
+        sorter['spill_dir'] = None
+        sorter['runs'] = []
+
+def inode_key(record):
+    """Snapshot order: inode, then path for hard links"""
+    return (record[INODE], record[PATH])
+
+def path_key(record):
+    """Order of the second join"""
+    return record[PATH]
+
+def write_snapshot(base_folder, rules=None, durability=None, chunk_size=SORT_CHUNK_RECORDS):
+    """Write a sorted snapshot of a folder and return its path and entry count
+
+    The listing is sorted in chunks of ``chunk_size`` records, so memory
+    stays bounded on folders of any size. ``rules`` default to the
+    folder's ignore rules.
+    """
+    if rules is None:
+        rules = load_rules(base_folder)
+
+    snapshots_dir = get_snapshots_dir(base_folder)
+    os.makedirs(snapshots_dir, exist_ok=True)
+    run_id = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    path = os.path.join(snapshots_dir, f"{SNAPSHOT_PREFIX}{run_id}{SNAPSHOT_SUFFIX}")
+    temp_path = path + TEMP_SUFFIX
+
+    sorter = create_sorter(inode_key, snapshots_dir, chunk_size)
+    try:
+        for record in iter_folder_records(base_folder, rules):
+            add_to_sorter(sorter, record)
+        with open(temp_path, 'w', encoding='utf-8', errors='surrogateescape') as f:
+            f.write(SNAPSHOT_HEADER)
+            f.writelines(format_record(record) for record in iter_sorted(sorter))
+    finally:
+        close_sorter(sorter)
+
+    sync_before_replace(durability, temp_path)
+    os.replace(temp_path, path)
+    record_written_file(durability, path, data_synced=True)
+    return {'path': path, 'entries': sorter['records']}
+
+def read_snapshot(snapshot_path):
+    """Yield the records of a snapshot in file (inode) order"""
+    with open(snapshot_path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+        for line in f:
+            if not line.startswith('#'):
+                yield parse_record(line)
+
+def list_snapshots(base_folder):
+    """Paths of a folder's snapshots, oldest first"""
+    snapshots_dir = get_snapshots_dir(base_folder)
+    if not os.path.isdir(snapshots_dir):
+        return []
+    names = sorted(
+        name for name in os.listdir(snapshots_dir)
+        if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX)
+    )
+    return [os.path.join(snapshots_dir, name) for name in names]
+
+def make_change(change, old=None, new=None):
+    """Describe one difference between two snapshots"""
+    record = new if new is not None else old
+    result = {'change': change, 'path': record[PATH], 'category': record[CATEGORY], 'size': record[SIZE]}
+    if change == 'moved':
+        result['old_path'] = old[PATH]
+    if change == 'modified':
+        result['old_size'] = old[SIZE]
+    return result
+
+def join_inode_group(old_group, new_group, old_rest, new_rest):
+    """Pair up the entries of one inode and yield their changes
+
+    Same paths pair first; an inode with several names (hard links) pairs
+    its remaining names as moves. Entries left over, or paired with a
+    different mtime, go to the path join.
+    """
+    new_by_path = {record[PATH]: record for record in new_group}
+    old_left = []
+    for old in old_group:
+        new = new_by_path.pop(old[PATH], None)
+        if new is None:
+            old_left.append(old)
+        elif old[SIZE] != new[SIZE] or old[MTIME] != new[MTIME]:
+            yield make_change('modified', old, new)
+
+    new_left = sorted(new_by_path.values(), key=path_key)
+    for old, new in zip(old_left, new_left):
+        if old[MTIME] == new[MTIME]:
+            yield make_change('moved', old, new)
+        else:
+            # A reused inode: the old file is gone and this is another one
+            add_to_sorter(old_rest, old)
+            add_to_sorter(new_rest, new)
+    for old in old_left[len(new_left):]:
+        add_to_sorter(old_rest, old)
+    for new in new_left[len(old_left):]:
+        add_to_sorter(new_rest, new)
+
+def diff_records(old_records, new_records, temp_dir=None, chunk_size=SORT_CHUNK_RECORDS):
+    """Yield the changes between two record streams sorted by inode
+
+    Both streams are read once; memory holds one inode group and at most
+    ``chunk_size`` unpaired records per side.
+    """
+    old_rest = create_sorter(path_key, temp_dir, chunk_size)
+    new_rest = create_sorter(path_key, temp_dir, chunk_size)
+    try:
+        # Join 1: by inode
+        old_groups = itertools.groupby(old_records, key=lambda record: record[INODE])
+        new_groups = itertools.groupby(new_records, key=lambda record: record[INODE])
+        old_item = next(old_groups, None)
+        new_item = next(new_groups, None)
+        while old_item is not None or new_item is not None:
+            if new_item is None or (old_item is not None and old_item[0] < new_item[0]):
+                for record in old_item[1]:
+                    add_to_sorter(old_rest, record)
+                old_item = next(old_groups, None)
+            elif old_item is None or new_item[0] < old_item[0]:
+                for record in new_item[1]:
+                    add_to_sorter(new_rest, record)
+                new_item = next(new_groups, None)
+            else:
+                yield from join_inode_group(list(old_item[1]), list(new_item[1]), old_rest, new_rest)
+                old_item = next(old_groups, None)
+                new_item = next(new_groups, None)
+
+        # Join 2: unpaired entries by path
+        old_iter = iter_sorted(old_rest)
+        new_iter = iter_sorted(new_rest)
+        old = next(old_iter, None)
+        new = next(new_iter, None)
+        while old is not None or new is not None:
+            if new is None or (old is not None and old[PATH] < new[PATH]):
+                yield make_change('removed', old)
+                old = next(old_iter, None)
+            elif old is None or new[PATH] < old[PATH]:
+                yield make_change('added', None, new)
+                new = next(new_iter, None)
+            else:
+                # Same name, new inode: replaced by another file
+                yield make_change('modified', old, new)
+                old = next(old_iter, None)
+                new = next(new_iter, None)
+    finally:
+        close_sorter(old_rest)
+        close_sorter(new_rest)
+
+def diff_snapshots(old_path, new_path, temp_dir=None, chunk_size=SORT_CHUNK_RECORDS):
+    """Yield the changes between two snapshot files (see diff_records)"""
+    if temp_dir is None:
+        temp_dir = os.path.dirname(os.path.abspath(new_path))
+    yield from diff_records(read_snapshot(old_path), read_snapshot(new_path), temp_dir, chunk_size)
+
+def count_changes(changes, keep=0):
+    """Count changes by type, keeping the first ``keep`` of them"""
+    counts = {change: 0 for change in CHANGE_TYPES}
+    kept = []
+    for change in changes:
+        counts[change['change']] += 1
+        if len(kept) < keep:
+            kept.append(change)
+    return {'counts': counts, 'changes': kept}
+
+def format_change(change):
+    """Format one change for terminal output"""
+    if change['change'] == 'moved':
+        return f"moved     {change['old_path']} → {change['path']}"
+    return f"{change['change']:<9} {change['path']}"
@@ -0,0 +1,276 @@
+"""
+Stats Report - Capacity-planning statistics of an organized folder
+No OOP patterns used - functional approach
+
+Percentiles, size and age histograms, extension breakdowns and the
+largest and oldest files are computed with NumPy over the columnar size,
+mtime and extension arrays the engine records while placing files (see
+file_organizer.start_report_columns), so a 10M-file run costs a few
+vectorised passes instead of Python loops. NumPy is only needed for this
+report; everything else runs without it.
+"""
+
+import os
+from datetime import datetime
+
+from file_utils import format_file_size
+from storage import get_backend
+
+STATISTICS_REPORT_NAME = 'STATISTICS_REPORT.txt'
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+# (lower bound in bytes, label); each bucket runs up to the next bound
+SIZE_BUCKETS = (
+    (0, "< 1 KB"),
+    (1024, "1 KB – 64 KB"),
+    (64 * 1024, "64 KB – 1 MB"),
+    (1024 ** 2, "1 MB – 16 MB"),
+    (16 * 1024 ** 2, "16 MB – 256 MB"),
+    (256 * 1024 ** 2, "256 MB – 1 GB"),
+    (1024 ** 3, "≥ 1 GB"),
+)
+
+# (lower bound in days since last modification, label)
+AGE_BUCKETS = (
+    (0, "< 1 day"),
+    (1, "1 – 7 days"),
+    (7, "7 – 30 days"),
+    (30, "30 – 90 days"),
+    (90, "90 days – 1 year"),
+    (365, "1 – 5 years"),
+    (5 * 365, "≥ 5 years"),
+)
+
+# Entries of the largest / oldest file lists and of the extension breakdown
+TOP_FILES = 10
+TOP_EXTENSIONS = 10
+
+def load_numpy():
+    """Import NumPy, explaining what needs it when it's missing"""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("The statistics report needs NumPy (pip install numpy)") from None
+    return numpy
+
+def get_extension_code(extensions, extension_index, filename):
+    """Get the code of a file's extension, adding it to the table if new"""
+    extension = os.path.splitext(filename)[1].lower()
+    code = extension_index.get(extension)
+    if code is None:
+        code = extension_index[extension] = len(extensions)
+        extensions.append(extension)
+    return code
+
+def get_category_columns(np, report, category, files, base_folder, extensions, extension_index,
+                         backend=None):
+    """Get a category's (sizes, mtimes, extension codes) as NumPy arrays
+
+    Columns recorded by the run are wrapped without a copy; categories
+    without them (runs that kept no report) are stat'ed once.
+    """
+    sizes = report.get('sizes', {}).get(category)
+    mtimes = report.get('mtimes', {}).get(category)
+    codes = report.get('extension_codes', {}).get(category)
+
+    if sizes is not None and mtimes is not None and codes is not None and len(sizes) == len(files):
+        return np.asarray(sizes, dtype=np.int64), np.asarray(mtimes, dtype=np.float64), np.asarray(codes)
+
+    stat = get_backend(backend)['stat']
+    category_path = os.path.join(base_folder, category)
+    sizes, mtimes, codes = [], [], []
+    for filename in files:
+        try:
+            file_stat = stat(os.path.join(category_path, filename))
+        except OSError:
+            file_stat = {'size': 0, 'mtime': 0.0}
+        sizes.append(file_stat['size'])
+        mtimes.append(file_stat['mtime'])
+        codes.append(get_extension_code(extensions, extension_index, filename))
+
+    return (np.array(sizes, dtype=np.int64), np.array(mtimes, dtype=np.float64),
+            np.array(codes, dtype=np.int64))
+
+def top_indices(np, values, count, largest=True):
+    """Indices of the ``count`` largest (or smallest) values, best first"""
+    if len(values) > count:
+        if largest:
+            indices = np.argpartition(values, len(values) - count)[-count:]
+        else:
+            indices = np.argpartition(values, count - 1)[:count]
+    else:
+        indices = np.arange(len(values))
+
+    order = np.argsort(values[indices], kind='stable')
+    return indices[order[::-1]] if largest else indices[order]
+
+def compute_histogram(np, values, bounds, weights):
+    """Count values (and sum their weights) per bucket of sorted lower bounds"""
+    # A few full-array comparisons beat a binary search per value for so few buckets
+    buckets = np.zeros(len(values), dtype=np.int8)
+    for bound in bounds[1:]:
+        buckets += values >= bound
+    counts = np.bincount(buckets, minlength=len(bounds))
+    totals = np.bincount(buckets, weights=weights, minlength=len(bounds))
+    return [(int(count), int(total)) for count, total in zip(counts, totals)]
+
+def compute_column_stats(np, sizes, mtimes, codes, extensions, now):
+    """Compute the aggregates of one set of columns (a category, or every file)"""
+    weights = sizes.astype(np.float64)
+    ages = np.maximum(now - mtimes, 0.0) / 86400.0
+
+    extension_counts = np.bincount(codes, minlength=len(extensions))
+    extension_bytes = np.bincount(codes, weights=weights, minlength=len(extensions))
+    extension_totals = [
+        (extensions[code] or "(none)", int(extension_counts[code]), int(extension_bytes[code]))
+        for code in np.argsort(extension_bytes, kind='stable')[::-1] if extension_counts[code]
+    ]
+
+    return {
+        'files': len(sizes),
+        'bytes': int(sizes.sum()),
+        'min': int(sizes.min()),
+        'mean': float(weights.mean()),
+        'max': int(sizes.max()),
+        'percentiles': dict(zip(PERCENTILES, (float(p) for p in np.percentile(sizes, PERCENTILES)))),
+        'sizes': compute_histogram(np, sizes, [bound for bound, _ in SIZE_BUCKETS], weights),
+        'ages': compute_histogram(np, ages, [bound for bound, _ in AGE_BUCKETS], weights),
+        'extensions': extension_totals[:TOP_EXTENSIONS],
+        'extension_totals': extension_totals
+    }
+
+def merge_column_stats(np, categories, all_sizes, extensions):
+    """Combine per-category aggregates into the overall ones
+
+    Everything adds up except the percentiles, which need every size.
+    """
+    files = sum(stats['files'] for stats in categories)
+    total_bytes = sum(stats['bytes'] for stats in categories)
+
+    extension_totals = {}
+    for stats in categories:
+        for extension, count, size in stats['extension_totals']:
+            previous = extension_totals.get(extension, (0, 0))
+            extension_totals[extension] = (previous[0] + count, previous[1] + size)
+    ranked = sorted(extension_totals.items(), key=lambda item: -item[1][1])
+
+    return {
+        'files': files,
+        'bytes': total_bytes,
+        'min': min(stats['min'] for stats in categories),
+        'mean': total_bytes / files,
+        'max': max(stats['max'] for stats in categories),
+        'percentiles': dict(zip(PERCENTILES, (float(p) for p in np.percentile(all_sizes, PERCENTILES)))),
+        'sizes': [tuple(map(sum, zip(*buckets))) for buckets in zip(*(stats['sizes'] for stats in categories))],
+        'ages': [tuple(map(sum, zip(*buckets))) for buckets in zip(*(stats['ages'] for stats in categories))],
+        'extensions': [(extension, count, size) for extension, (count, size) in ranked[:TOP_EXTENSIONS]],
+        'extension_totals': [(extension, count, size) for extension, (count, size) in ranked]
+    }
+
+def compute_statistics(base_folder, organized_files, report=None, backend=None, now=None):
+    """Compute per-category and overall statistics of a run
+
+    Returns {'categories': [...], 'total': {...}} where every entry holds
+    counts, bytes, size percentiles, size and age histograms (file count
+    and bytes per bucket), the top extensions by bytes, and the largest and
+    oldest files as (name, size, mtime). Raises ImportError without NumPy.
+    """
+    np = load_numpy()
+    report = report or {}
+    now = now if now is not None else datetime.now().timestamp()
+    extensions = list(report.get('extensions', []))
+    extension_index = dict(report.get('extension_index', {}))
+
+    categories = []
+    columns = []
+    for category, files in organized_files.items():
+        if not files:
+            continue
+        sizes, mtimes, codes = get_category_columns(
+            np, report, category, files, base_folder, extensions, extension_index, backend
+        )
+        stats = compute_column_stats(np, sizes, mtimes, codes, extensions, now)
+        stats['category'] = category
+        stats['largest'] = [(files[i], int(sizes[i]), float(mtimes[i])) for i in top_indices(np, sizes, TOP_FILES)]
+        stats['oldest'] = [(files[i], int(sizes[i]), float(mtimes[i]))
+                           for i in top_indices(np, mtimes, TOP_FILES, largest=False)]
+        categories.append(stats)
+        columns.append((sizes, mtimes, codes))
+
+    if not categories:
+        return {'categories': [], 'total': None, 'generated': now}
+
+    total = merge_column_stats(np, categories, np.concatenate([sizes for sizes, _, _ in columns]), extensions)
+    # The overall top files are among the per-category ones
+    total['largest'] = sorted(
+        ((f"{stats['category']}/{name}", size, mtime) for stats in categories
+         for name, size, mtime in stats['largest']),
+        key=lambda entry: -entry[1]
+    )[:TOP_FILES]
+    total['oldest'] = sorted(
+        ((f"{stats['category']}/{name}", size, mtime) for stats in categories
+         for name, size, mtime in stats['oldest']),
+        key=lambda entry: entry[2]
+    )[:TOP_FILES]
+
+    return {'categories': categories, 'total': total, 'generated': now}
+
+def format_size(size):
+    """Format a (possibly fractional) byte count"""
+    return format_file_size(int(round(size)))
+
+def render_stats_section(title, stats):
+    """Render the statistics of one category (or of every file)"""
+    lines = []
+    lines.append(f"📁 {title}: {stats['files']} files, {format_size(stats['bytes'])}")
+    lines.append(f"   Size: min {format_size(stats['min'])}, mean {format_size(stats['mean'])}, "
+                 f"max {format_size(stats['max'])}")
+    lines.append("   Percentiles: " + ", ".join(
+        f"p{percentile:g} {format_size(value)}" for percentile, value in stats['percentiles'].items()
+    ))
+
+    for heading, buckets, counts in (("Sizes", SIZE_BUCKETS, stats['sizes']), ("Ages", AGE_BUCKETS, stats['ages'])):
+        lines.append(f"   {heading}:")
+        for (_, label), (count, total) in zip(buckets, counts):
+            if count:
+                share = count / stats['files'] * 100
+                lines.append(f"     {label:<18} {count:>10} files {share:5.1f}%  {format_size(total):>10}")
+
+    lines.append("   Extensions: " + ", ".join(
+        f"{extension} {count} ({format_size(total)})" for extension, count, total in stats['extensions']
+    ))
+
+    lines.append("   Largest:")
+    for i, (name, size, _) in enumerate(stats['largest'], 1):
+        lines.append(f"     {i:2d}. {name:<40} {format_size(size):>10}")
+    lines.append("   Oldest:")
+    for i, (name, _, mtime) in enumerate(stats['oldest'], 1):
+        lines.append(f"     {i:2d}. {name:<40} {datetime.fromtimestamp(mtime).strftime('%Y-%m-%d')}")
+
+    lines.append("")
+    return lines
+
+def render_statistics(base_folder, statistics):
+    """Render STATISTICS_REPORT.txt from computed statistics"""
+    content = []
+    content.append("📈 STATISTICS REPORT - Capacity Planning")
+    content.append("=" * 60)
+    content.append(f"Generated on: {datetime.fromtimestamp(statistics['generated']).strftime('%Y-%m-%d %H:%M:%S')}")
+    content.append(f"Base folder: {base_folder}")
+    content.append("=" * 60)
+    content.append("")
+
+    if statistics['total'] is None:
+        content.append("No files were organized.")
+    else:
+        content.extend(render_stats_section("All files", statistics['total']))
+        content.append("-" * 60)
+        content.append("")
+        for stats in statistics['categories']:
+            content.extend(render_stats_section(stats['category'], stats))
+
+    content.append("=" * 60)
+    content.append("End of statistics report")
+
+    return "\n".join(content)
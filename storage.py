@@ -0,0 +1,321 @@
+"""
+Storage - Backends the organizing pipeline performs its file operations on
+No OOP patterns used - functional approach
+
+A backend is a dict of functions (scan, iter_scan, stat, exists, rename,
+rename_noreplace, replace, copy, checksum, remove, makedirs, listdir, read,
+write). The local backend maps
+them to os/shutil; the in-memory backend keeps a virtual tree of file
+metadata and can inject a fixed latency per operation, so the algorithmic
+cost of a run can be measured apart from disk cost, and million-file runs
+need no real files.
+"""
+
+import os
+import stat
+import time
+import shutil
+import hashlib
+import threading
+
+from verified_copy import copy_file_with_checksum, file_checksum
+from atomic_rename import move_noreplace
+
+# Operations every backend provides
+BACKEND_OPERATIONS = (
+    'scan', 'iter_scan', 'stat', 'exists', 'rename', 'rename_noreplace', 'replace', 'copy', 'checksum',
+    'remove', 'makedirs', 'listdir', 'read', 'write'
+)
+
+def local_iter_scan(path, skip=None, skipped=None):
+    """Yield the regular files of a folder (path or open descriptor) with their stat data
+
+    Names for which ``skip`` returns True are left out before any stat and
+    appended to ``skipped`` when a list is given. Entries are read from the
+    directory as they are consumed, so a caller working in batches never
+    holds the whole listing.
+    """
+    with os.scandir(path) as scan:
+        for entry in scan:
+            if skip is not None and skip(entry.name):
+                if skipped is not None:
+                    skipped.append(entry.name)
+                continue
+
+            try:
+                if not entry.is_file():
+                    continue
+                stat_info = entry.stat()
+            except OSError:
+                continue  # Vanished while scanning
+
+            yield {
+                'name': entry.name,
+                'size': stat_info.st_size,
+                'mtime': stat_info.st_mtime,
+                'inode': entry.inode()
+            }
+
+def local_scan(path, skip=None, skipped=None):
+    """List the regular files of a folder with their stat data (see local_iter_scan)"""
+    return list(local_iter_scan(path, skip, skipped))
+
+def local_stat(path):
+    """Stat a path and return the fields the pipeline uses"""
+    stat_info = os.stat(path)
+    return {
+        'size': stat_info.st_size,
+        'mtime': stat_info.st_mtime,
+        'ctime': stat_info.st_ctime,
+        'atime': stat_info.st_atime,
+        'inode': stat_info.st_ino,
+        'is_dir': stat.S_ISDIR(stat_info.st_mode)
+    }
+
+def local_write(path, text):
+    """Write a text file"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def local_read(path):
+    """Read a text file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+LOCAL_BACKEND = {
+    'name': 'local',
+    'scan': local_scan,
+    'iter_scan': local_iter_scan,
+    'stat': local_stat,
+    'exists': os.path.exists,
+    'rename': shutil.move,
+    'rename_noreplace': move_noreplace,
+    'replace': os.replace,
+    'copy': copy_file_with_checksum,
+    'checksum': file_checksum,
+    'remove': os.remove,
+    'makedirs': lambda path: os.makedirs(path, exist_ok=True),
+    'listdir': os.listdir,
+    'read': local_read,
+    'write': local_write
+}
+
+def get_backend(backend=None):
+    """Get the backend to use, the local one by default"""
+    return backend or LOCAL_BACKEND
+
+def is_local_backend(backend):
+    """Check if a backend works on the real filesystem"""
+    return backend is None or backend['name'] == 'local'
+
+def create_memory_backend(latency=None, capacity=None):
+    """Create an empty in-memory backend
+
+    ``latency`` maps operation names to seconds slept on every call, e.g.
+    {'rename': 0.002, 'stat': 0.0005} to mimic a network share. With a
+    ``capacity``, at most that many operations are served at once and the
+    rest queue, like requests on a congested share. The backend's 'state'
+    holds the virtual tree and per-operation call counts.
+    """
+    state = {
+        'files': {},     # path -> {'size', 'mtime', 'inode', 'data', 'content'}
+        'children': {},  # directory -> set of child names
+        'next_inode': 1,
+        'latency': dict(latency or {}),
+        'calls': {},
+        'lock': threading.Lock(),
+        'slots': threading.Semaphore(capacity) if capacity else None
+    }
+
+    def charge(operation):
+        with state['lock']:
+            state['calls'][operation] = state['calls'].get(operation, 0) + 1
+        delay = state['latency'].get(operation)
+        if not delay:
+            return
+        if state['slots'] is None:
+            time.sleep(delay)
+            return
+        with state['slots']:
+            time.sleep(delay)
+
+    def normalize(path):
+        return os.path.normpath(path)
+
+    def add_child(path):
+        parent, name = os.path.split(path)
+        if parent not in state['children']:
+            raise FileNotFoundError(f"No such directory: {parent}")
+        state['children'][parent].add(name)
+
+    def get_file(path):
+        node = state['files'].get(normalize(path))
+        if node is None:
+            raise FileNotFoundError(f"No such file: {path}")
+        return node
+
+    def scan(path, skip=None, skipped=None):
+        charge('scan')
+        directory = normalize(path)
+        with state['lock']:
+            if directory not in state['children']:
+                raise FileNotFoundError(f"No such directory: {path}")
+            names = list(state['children'][directory])
+
+        entries = []
+        for name in names:
+            if skip is not None and skip(name):
+                if skipped is not None:
+                    skipped.append(name)
+                continue
+            node = state['files'].get(os.path.join(directory, name))
+            if node is not None:
+                entries.append({'name': name, 'size': node['size'], 'mtime': node['mtime'], 'inode': node['inode']})
+        return entries
+
+    def stat(path):
+        charge('stat')
+        path = normalize(path)
+        if path in state['children']:
+            return {'size': 0, 'mtime': 0.0, 'ctime': 0.0, 'atime': 0.0, 'inode': 0, 'is_dir': True}
+        node = get_file(path)
+        return {
+            'size': node['size'], 'mtime': node['mtime'], 'ctime': node['mtime'],
+            'atime': node['mtime'], 'inode': node['inode'], 'is_dir': False
+        }
+
+    def exists(path):
+        charge('exists')
+        path = normalize(path)
+        return path in state['files'] or path in state['children']
+
+    def rename(source, destination, operation='rename', replace=True):
+        charge(operation)
+        source, destination = normalize(source), normalize(destination)
+        with state['lock']:
+            node = get_file(source)
+            if not replace and (destination in state['files'] or destination in state['children']):
+                raise FileExistsError(f"File exists: {destination}")
+            add_child(destination)
+            state['children'][os.path.dirname(source)].discard(os.path.basename(source))
+            del state['files'][source]
+            state['files'][destination] = node
+        return destination
+
+    def checksum_of(node, algorithm):
+        # Metadata-only files hash a stand-in for their content, shared by their copies
+        data = node['data'] if node['data'] is not None else node['content'].encode()
+        return hashlib.new(algorithm, data).hexdigest()
+
+    def copy(source, destination, algorithm='sha256'):
+        charge('copy')
+        source, destination = normalize(source), normalize(destination)
+        with state['lock']:
+            node = get_file(source)
+            if destination in state['files']:
+                raise FileExistsError(f"File exists: {destination}")
+            add_child(destination)
+            state['files'][destination] = dict(node, inode=state['next_inode'])
+            state['next_inode'] += 1
+        return checksum_of(node, algorithm), node['size']
+
+    def checksum(path, algorithm='sha256'):
+        charge('checksum')
+        return checksum_of(get_file(path), algorithm)
+
+    def remove(path):
+        charge('remove')
+        path = normalize(path)
+        with state['lock']:
+            get_file(path)
+            del state['files'][path]
+            state['children'][os.path.dirname(path)].discard(os.path.basename(path))
+
+    def makedirs(path):
+        charge('makedirs')
+        create_memory_dirs(state, path)
+
+    def listdir(path):
+        charge('listdir')
+        directory = normalize(path)
+        if directory not in state['children']:
+            raise FileNotFoundError(f"No such directory: {path}")
+        return list(state['children'][directory])
+
+    def read(path):
+        charge('read')
+        data = get_file(path)['data']
+        return (data or b"").decode('utf-8')
+
+    def write(path, text):
+        charge('write')
+        add_memory_file(backend, path, data=text.encode('utf-8'))
+
+    backend = {
+        'name': 'memory',
+        'state': state,
+        'scan': scan,
+        'iter_scan': lambda path, skip=None, skipped=None: iter(scan(path, skip, skipped)),
+        'stat': stat,
+        'exists': exists,
+        'rename': rename,
+        'rename_noreplace': lambda source, destination: rename(source, destination, 'rename_noreplace', False),
+        'replace': lambda source, destination: rename(source, destination, 'replace'),
+        'copy': copy,
+        'checksum': checksum,
+        'remove': remove,
+        'makedirs': makedirs,
+        'listdir': listdir,
+        'read': read,
+        'write': write
+    }
+    return backend
+
+def create_memory_dirs(state, path):
+    """Create a folder and its missing parents in an in-memory tree"""
+    path = os.path.normpath(path)
+
+    with state['lock']:
+        missing = []
+        while path not in state['children']:
+            missing.append(path)
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+
+        for directory in reversed(missing):
+            state['children'][directory] = set()
+            parent, name = os.path.split(directory)
+            if parent != directory and parent in state['children']:
+                state['children'][parent].add(name)
+
+def add_memory_file(backend, path, size=None, mtime=None, data=None):
+    """Create or replace a file in an in-memory backend without charging latency
+
+    Files without ``data`` only carry metadata, so millions of them are cheap.
+    """
+    state = backend['state']
+    path = os.path.normpath(path)
+    parent, name = os.path.split(path)
+
+    with state['lock']:
+        if parent not in state['children']:
+            raise FileNotFoundError(f"No such directory: {parent}")
+        state['children'][parent].add(name)
+        state['files'][path] = {
+            'size': len(data) if data is not None else (size or 0),
+            'mtime': time.time() if mtime is None else mtime,
+            'inode': state['next_inode'],
+            'data': data,
+            'content': f"{state['next_inode']}:{size}"
+        }
+        state['next_inode'] += 1
+
+def add_memory_dir(backend, path):
+    """Create a folder (and its parents) in an in-memory backend without charging latency"""
+    create_memory_dirs(backend['state'], path)
+
+def get_backend_calls(backend):
+    """Get the per-operation call counts of an in-memory backend"""
+    return dict(backend.get('state', {}).get('calls', {}))
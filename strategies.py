@@ -0,0 +1,80 @@
+"""
+Strategies - Sub folder layouts beneath the extension categories
+No OOP patterns used - functional approach
+
+A strategy is a '+'-separated list of layers, e.g. "extension+month" for
+Images/2026/10 or "extension+size" for Videos/Huge. The extension category
+is always the top level; each further layer adds one sub folder computed
+from the stat data captured by the scan, so no extra syscalls are needed.
+"""
+
+import os
+import time
+
+STRATEGY_LAYERS = ('extension', 'year', 'month', 'size')
+
+# (upper bound in bytes, tier folder); anything bigger is 'Huge'
+SIZE_TIERS = (
+    (1024 * 1024, 'Small'),
+    (100 * 1024 * 1024, 'Medium'),
+    (1024 * 1024 * 1024, 'Large'),
+)
+LARGEST_TIER = 'Huge'
+
+def parse_strategy(strategy):
+    """Split a strategy into its layers below the extension category
+
+    Accepts "extension+month" style strings or a list of layer names.
+    Raises ValueError for unknown layers.
+    """
+    layers = strategy.split('+') if isinstance(strategy, str) else list(strategy)
+    layers = [layer.strip() for layer in layers if layer.strip()]
+
+    unknown = [layer for layer in layers if layer not in STRATEGY_LAYERS]
+    if unknown:
+        raise ValueError(f"Unknown strategy layers: {', '.join(unknown)}")
+
+    # Extension categories are always the top level
+    return tuple(layer for layer in layers if layer != 'extension')
+
+def get_size_tier(size):
+    """Get the size tier folder of a file"""
+    for limit, tier in SIZE_TIERS:
+        if size < limit:
+            return tier
+    return LARGEST_TIER
+
+def get_layer_key(layer, entry):
+    """Get the sub folder name(s) one layer assigns to a scanned entry"""
+    if layer == 'size':
+        return (get_size_tier(entry['size']),)
+
+    local = time.localtime(entry['mtime'])
+    if layer == 'year':
+        return (f"{local.tm_year:04d}",)
+    return (f"{local.tm_year:04d}", f"{local.tm_mon:02d}")
+
+def make_strategy(strategy):
+    """Compile a strategy into a function mapping a scanned entry to its sub folder
+
+    The returned function gives '' for the plain extension layout. Sub folder
+    paths are built once per distinct key and shared by every file with it.
+    """
+    layers = parse_strategy(strategy)
+    if not layers:
+        return lambda entry: ''
+
+    paths = {}
+
+    def get_sub_folder(entry):
+        key = tuple(name for layer in layers for name in get_layer_key(layer, entry))
+        path = paths.get(key)
+        if path is None:
+            path = paths[key] = os.path.join(*key)
+        return path
+
+    return get_sub_folder
+
+def describe_strategy(strategy):
+    """Describe a strategy for summaries, e.g. "extension / year / month" """
+    return " / ".join(('extension',) + parse_strategy(strategy))
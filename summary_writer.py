@@ -4,7 +4,25 @@ No OOP patterns used - functional approach
 """
 
 import os
+import shutil
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from file_utils import check_write_access
+from fanout import describe_layout
+from strategies import describe_strategy, parse_strategy
+from packer import describe_pack
+from storage import get_backend, is_local_backend
+from durability import create_durability, record_written_file, sync_before_replace, flush_durability
+from ignore_rules import TEMP_SUFFIX
+from stats_report import compute_statistics, render_statistics, STATISTICS_REPORT_NAME
+
+MASTER_SUMMARY_NAME = 'MASTER_SUMMARY.txt'
+DETAILED_REPORT_NAME = 'DETAILED_REPORT.txt'
+
+# Threads rendering category summaries (rendering is cheap, writes and stat fallbacks wait on I/O)
+SUMMARY_WORKERS = 8
 
 def format_file_size(size_bytes):
     """Format file size in human-readable format"""
@@ -19,18 +37,18 @@ def format_file_size(size_bytes):
     
     return f"{size_bytes:.1f} {size_names[i]}"
 
-def get_file_info(file_path):
+def get_file_info(file_path, backend=None):
     """Get detailed information about a file"""
     try:
-        file_size = os.path.getsize(file_path)
-        file_stat = os.stat(file_path)
+        file_stat = get_backend(backend)['stat'](file_path)
+        file_size = file_stat['size']
         
         return {
             'size': file_size,
             'size_formatted': format_file_size(file_size),
-            'created': datetime.fromtimestamp(file_stat.st_ctime),
-            'modified': datetime.fromtimestamp(file_stat.st_mtime),
-            'accessed': datetime.fromtimestamp(file_stat.st_atime)
+            'created': datetime.fromtimestamp(file_stat['ctime']),
+            'modified': datetime.fromtimestamp(file_stat['mtime']),
+            'accessed': datetime.fromtimestamp(file_stat['atime'])
         }
     except OSError:
         return {
@@ -41,32 +59,48 @@ def get_file_info(file_path):
             'accessed': None
         }
 
-def create_summary_header(category, timestamp, file_count):
+def create_summary_header(category, timestamp, file_count, layout=None, strategy=None):
     """Create the header section of a summary file"""
     header = []
     header.append(f"📁 {category} - File Summary")
     header.append("=" * 50)
     header.append(f"Generated on: {timestamp}")
     header.append(f"Total files: {file_count}")
+    if strategy and parse_strategy(strategy):
+        header.append(f"Sub folders: {describe_strategy(strategy)}")
+    if layout:
+        header.append(f"Layout: {describe_layout(layout)}")
     header.append("=" * 50)
     header.append("")
     
     return "\n".join(header)
 
-def create_file_listing(files, category_path):
-    """Create a formatted list of files with details"""
+def create_file_listing(files, category_path, annotations=None, backend=None, sizes=None):
+    """Create a formatted list of files with details
+
+    ``sizes`` (aligned with ``files``) come from the run's scan; without
+    them every file is stat'ed.
+    """
     file_list = []
+    annotations = annotations or {}
     
     for i, filename in enumerate(files, 1):
-        file_path = os.path.join(category_path, filename)
-        file_info = get_file_info(file_path)
+        if sizes is not None:
+            size_formatted = format_file_size(sizes[i - 1])
+        else:
+            size_formatted = get_file_info(os.path.join(category_path, filename), backend)['size_formatted']
         
-        # Format the file entry
-        file_entry = f"{i:3d}. {filename:<40} ({file_info['size_formatted']})"
-        file_list.append(file_entry)
+        file_list.append(format_file_entry(i, filename, size_formatted, annotations.get(filename)))
     
     return "\n".join(file_list)
 
+def format_file_entry(number, filename, size_formatted, annotation=None):
+    """Format one numbered line of a file listing"""
+    file_entry = f"{number:3d}. {filename:<40} ({size_formatted})"
+    if annotation:
+        file_entry += f" [{annotation}]"
+    return file_entry
+
 def create_summary_footer():
     """Create the footer section of a summary file"""
     footer = []
@@ -76,17 +110,58 @@ def create_summary_footer():
     
     return "\n".join(footer)
 
-def write_summary_file(summary_path, content):
-    """Write content to a summary file with proper encoding"""
+def write_summary_file(summary_path, content, backend=None, durability=None):
+    """Write content to a summary file atomically (temp file, then rename)
+
+    Readers see the old file or the new one, never a partial write.
+    """
+    backend = get_backend(backend)
+    directory, name = os.path.split(summary_path)
+    temp_path = os.path.join(directory, f".{name}.{os.getpid()}-{threading.get_ident()}{TEMP_SUFFIX}")
+    
     try:
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        backend['write'](temp_path, content)
+        sync_before_replace(durability, temp_path)
+        backend['replace'](temp_path, summary_path)
+        record_written_file(durability, summary_path, data_synced=True)
         return True
     except Exception as e:
+        try:
+            backend['remove'](temp_path)
+        except OSError:
+            pass
         print(f"Error writing summary file: {e}")
         return False
 
-def generate_category_summary(category, files, base_folder, timestamp):
+def get_file_annotations(report, category):
+    """Collect per-file notes (link strategy, checksum, archive) for a category from a run report"""
+    annotations = {}
+    if not report:
+        return annotations
+    
+    for key in ('strategies', 'checksums', 'packed'):
+        for filename, note in report.get(key, {}).get(category, {}).items():
+            if key == 'packed':
+                note = f"packed in {note}"
+            if filename in annotations:
+                annotations[filename] += f", {note}"
+            else:
+                annotations[filename] = note
+    
+    return annotations
+
+def create_pack_listing(packs):
+    """Create the list of archives cold files of a category were packed into"""
+    if not packs:
+        return ""
+    
+    lines = ["", "Packed archives:"]
+    lines.extend(f"  📦 {describe_pack(archive)}" for archive in packs)
+    return "\n".join(lines) + "\n"
+
+def generate_category_summary(category, files, base_folder, timestamp, annotations=None,
+                              layout=None, strategy=None, packs=None, backend=None, durability=None,
+                              sizes=None):
     """Generate a summary for a specific category"""
     if not files:
         return None  # No files to summarize
@@ -95,50 +170,175 @@ def generate_category_summary(category, files, base_folder, timestamp):
     summary_path = os.path.join(category_path, "summary.txt")
     
     # Create summary content
-    header = create_summary_header(category, timestamp, len(files))
-    file_list = create_file_listing(files, category_path)
+    header = create_summary_header(category, timestamp, len(files), layout, strategy)
+    file_list = create_file_listing(files, category_path, annotations, backend, sizes)
+    pack_list = create_pack_listing(packs)
     footer = create_summary_footer()
     
     # Combine all sections
-    summary_content = f"{header}{file_list}\n{footer}"
+    summary_content = f"{header}{file_list}\n{pack_list}{footer}"
     
     # Write the summary file
-    success = write_summary_file(summary_path, summary_content)
+    success = write_summary_file(summary_path, summary_content, backend, durability)
     
     return success
 
-def generate_summaries(base_folder, organized_files):
-    """Generate summary files for each category folder"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    summary_results = {}
-    
+def open_summary_spool(base_folder, strategy=None):
+    """Start category summaries that are filled batch by batch (chunked runs)
+
+    Each category's listing is appended to a temp file next to its
+    summary.txt, so only the current batch is ever held in memory.
+    """
+    return {
+        'base_folder': base_folder,
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'strategy': strategy,
+        'categories': {}
+    }
+
+def append_summary_spool(spool, organized_files, report):
+    """Append one batch of organized files to the spooled listings
+
+    Sizes and annotations come from the batch's report columns and
+    details, which the caller may reset afterwards.
+    """
     for category, files in organized_files.items():
-        if files:
-            success = generate_category_summary(category, files, base_folder, timestamp)
-            summary_results[category] = success
-        else:
-            summary_results[category] = None  # No files to summarize
+        if not files:
+            continue
+        
+        spooled = spool['categories'].get(category)
+        if spooled is None:
+            name = f".summary.txt.{os.getpid()}.listing{TEMP_SUFFIX}"
+            path = os.path.join(spool['base_folder'], category, name)
+            spooled = spool['categories'][category] = {
+                'path': path,
+                'handle': open(path, 'w', encoding='utf-8'),
+                'files': 0,
+                'bytes': 0
+            }
+        
+        sizes = report['sizes'][category]
+        annotations = get_file_annotations(report, category)
+        lines = []
+        for filename, size in zip(files, sizes):
+            spooled['files'] += 1
+            spooled['bytes'] += size
+            lines.append(format_file_entry(spooled['files'], filename, format_file_size(size), annotations.get(filename)))
+        spooled['handle'].write("\n".join(lines) + "\n")
+
+def finish_summary_spool(spool, report=None, durability=None):
+    """Write each spooled category's summary.txt atomically and remove the listings
+
+    Returns {category: success} like generate_summaries.
+    """
+    report = report or {}
+    layouts = report.get('layouts', {})
+    packs = {}
+    for archive in report.get('packs', []):
+        packs.setdefault(archive['category'], []).append(archive)
     
-    return summary_results
+    results = {}
+    for category, spooled in spool['categories'].items():
+        spooled['handle'].close()
+        summary_path = os.path.join(spool['base_folder'], category, "summary.txt")
+        temp_path = f"{spooled['path']}.summary"
+        try:
+            with open(spooled['path'], 'r', encoding='utf-8') as listing, \
+                    open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(create_summary_header(
+                    category, spool['timestamp'], spooled['files'], layouts.get(category), spool['strategy']
+                ))
+                # Streamed, so a listing of millions of lines is never read whole
+                shutil.copyfileobj(listing, f)
+                f.write(create_pack_listing(packs.get(category)))
+                f.write(create_summary_footer())
+            sync_before_replace(durability, temp_path)
+            os.replace(temp_path, summary_path)
+            record_written_file(durability, summary_path, data_synced=True)
+            results[category] = True
+        except OSError as e:
+            print(f"Error writing summary file: {e}")
+            results[category] = False
+        finally:
+            for path in (spooled['path'], temp_path):
+                if os.path.exists(path):
+                    os.remove(path)
+    
+    return results
 
-def create_master_summary(base_folder, organized_files):
-    """Create a master summary file in the base folder"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    master_summary_path = os.path.join(base_folder, "MASTER_SUMMARY.txt")
+def discard_summary_spool(spool):
+    """Remove the spooled listings of a run that failed"""
+    for spooled in spool['categories'].values():
+        spooled['handle'].close()
+        if os.path.exists(spooled['path']):
+            os.remove(spooled['path'])
+
+def build_report(base_folder, organized_files, report=None):
+    """Aggregate what every summary output needs in one pass over the organized files
+
+    Sizes come from the run report ('sizes', aligned with the organized
+    files), so nothing is stat'ed here; categories without them are
+    stat'ed later, on the rendering pool.
+    """
+    report = report or {}
+    run_sizes = report.get('sizes', {})
+    layouts = report.get('layouts', {})
+    
+    packs = {}
+    for archive in report.get('packs', []):
+        packs.setdefault(archive['category'], []).append(archive)
     
-    # Calculate totals
-    total_files = sum(len(files) for files in organized_files.values())
-    total_categories = sum(1 for files in organized_files.values() if files)
+    categories = []
+    for category, files in organized_files.items():
+        if not files:
+            continue
+        sizes = run_sizes.get(category)
+        categories.append({
+            'category': category,
+            'files': files,
+            'sizes': sizes if sizes is not None and len(sizes) == len(files) else None,
+            'annotations': get_file_annotations(report, category),
+            'layout': layouts.get(category),
+            'packs': packs.get(category, [])
+        })
     
-    # Create master summary content
+    return {
+        'base_folder': base_folder,
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'strategy': report.get('strategy'),
+        'categories': categories,
+        'total_files': sum(len(aggregate['files']) for aggregate in categories)
+    }
+
+def fill_category_sizes(aggregate, base_folder, backend=None):
+    """Stat the files of a category whose sizes the run didn't record"""
+    if aggregate['sizes'] is None:
+        category_path = os.path.join(base_folder, aggregate['category'])
+        aggregate['sizes'] = [
+            get_file_info(os.path.join(category_path, filename), backend)['size']
+            for filename in aggregate['files']
+        ]
+    return sum(aggregate['sizes'])
+
+def render_category(built, aggregate, backend=None, durability=None):
+    """Write one category's summary.txt; returns (success, total bytes)"""
+    total_bytes = fill_category_sizes(aggregate, built['base_folder'], backend)
+    success = generate_category_summary(
+        aggregate['category'], aggregate['files'], built['base_folder'], built['timestamp'],
+        aggregate['annotations'], aggregate['layout'], built['strategy'], aggregate['packs'],
+        backend, durability, aggregate['sizes']
+    )
+    return success, total_bytes
+
+def render_master_summary(built):
+    """Render MASTER_SUMMARY.txt from a built report"""
     content = []
     content.append("📁 MASTER SUMMARY - Folder Organization Report")
     content.append("=" * 60)
-    content.append(f"Generated on: {timestamp}")
-    content.append(f"Base folder: {base_folder}")
-    content.append(f"Total files organized: {total_files}")
-    content.append(f"Categories created: {total_categories}")
+    content.append(f"Generated on: {built['timestamp']}")
+    content.append(f"Base folder: {built['base_folder']}")
+    content.append(f"Total files organized: {built['total_files']}")
+    content.append(f"Categories created: {len(built['categories'])}")
     content.append("=" * 60)
     content.append("")
     
@@ -146,73 +346,193 @@ def create_master_summary(base_folder, organized_files):
     content.append("📊 Category Breakdown:")
     content.append("-" * 30)
     
-    for category, files in organized_files.items():
-        if files:
-            content.append(f"📁 {category}: {len(files)} files")
+    for aggregate in built['categories']:
+        content.append(f"📁 {aggregate['category']}: {len(aggregate['files'])} files")
     
     content.append("")
     content.append("=" * 60)
     content.append("End of master summary")
     
-    # Write master summary
-    master_content = "\n".join(content)
-    return write_summary_file(master_summary_path, master_content)
+    return "\n".join(content)
 
-def create_detailed_report(base_folder, organized_files):
-    """Create a detailed report with file statistics"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    report_path = os.path.join(base_folder, "DETAILED_REPORT.txt")
-    
-    # Calculate statistics
-    total_files = 0
-    total_size = 0
-    category_stats = {}
-    
-    for category, files in organized_files.items():
-        if files:
-            category_size = 0
-            for filename in files:
-                file_path = os.path.join(base_folder, category, filename)
-                file_size = get_file_info(file_path)['size']
-                category_size += file_size
-            
-            category_stats[category] = {
-                'count': len(files),
-                'size': category_size,
-                'size_formatted': format_file_size(category_size)
-            }
-            total_files += len(files)
-            total_size += category_size
-    
-    # Create detailed report content
+def render_detailed_report(built, category_bytes):
+    """Render DETAILED_REPORT.txt from a built report and per-category byte totals"""
     content = []
     content.append("📊 DETAILED ORGANIZATION REPORT")
     content.append("=" * 60)
-    content.append(f"Generated on: {timestamp}")
-    content.append(f"Base folder: {base_folder}")
+    content.append(f"Generated on: {built['timestamp']}")
+    content.append(f"Base folder: {built['base_folder']}")
     content.append("")
     
     content.append("📈 SUMMARY STATISTICS:")
-    content.append(f"Total files: {total_files}")
-    content.append(f"Total size: {format_file_size(total_size)}")
-    content.append(f"Categories: {len([c for c in organized_files.values() if c])}")
+    content.append(f"Total files: {built['total_files']}")
+    content.append(f"Total size: {format_file_size(sum(category_bytes.values()))}")
+    content.append(f"Categories: {len(built['categories'])}")
     content.append("")
     
     content.append("📁 CATEGORY DETAILS:")
     content.append("-" * 40)
     
-    for category, stats in category_stats.items():
-        content.append(f"📁 {category}:")
-        content.append(f"   Files: {stats['count']}")
-        content.append(f"   Size: {stats['size_formatted']}")
+    for aggregate in built['categories']:
+        content.append(f"📁 {aggregate['category']}:")
+        content.append(f"   Files: {len(aggregate['files'])}")
+        content.append(f"   Size: {format_file_size(category_bytes[aggregate['category']])}")
         content.append("")
     
     content.append("=" * 60)
     content.append("End of detailed report")
     
-    # Write detailed report
-    report_content = "\n".join(content)
-    return write_summary_file(report_path, report_content)
+    return "\n".join(content)
+
+def write_reports(base_folder, organized_files, report=None, backend=None, durability=None,
+                  summaries=True, master=False, detailed=False, workers=None, statistics=False):
+    """Build every summary output in one pass and write them atomically
+
+    Category summaries are rendered concurrently on a thread pool of
+    ``workers`` threads (default: up to SUMMARY_WORKERS). ``durability``
+    is a level name; it defaults to the run's level from the report.
+    ``statistics`` adds STATISTICS_REPORT.txt (needs NumPy, see
+    stats_report.py). Returns {category: success} plus an entry per
+    top-level report that was written.
+    """
+    streamed = (report or {}).get('streamed_summaries')
+    if streamed is not None:
+        # Chunked runs wrote their category summaries batch by batch and kept no file lists
+        if master or detailed or statistics:
+            raise ValueError("Runs with a chunk size only write category summaries")
+        results = {category: None for category in organized_files}
+        results.update(streamed if summaries else {})
+        return results
+    
+    durability = durability or (report or {}).get('durability', {}).get('level', 'none')
+    sync_state = create_durability(durability if is_local_backend(backend) else 'none')
+    built = build_report(base_folder, organized_files, report)
+    
+    results = {category: None for category in organized_files}  # None: no files to summarize
+    category_bytes = {}
+    
+    if summaries or detailed:
+        def render(aggregate):
+            if summaries:
+                return render_category(built, aggregate, backend, sync_state)
+            return None, fill_category_sizes(aggregate, base_folder, backend)
+        
+        workers = workers or min(SUMMARY_WORKERS, max(1, len(built['categories'])))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            rendered = list(executor.map(render, built['categories']))
+        
+        for aggregate, (success, total_bytes) in zip(built['categories'], rendered):
+            if summaries:
+                results[aggregate['category']] = success
+            category_bytes[aggregate['category']] = total_bytes
+    
+    if master:
+        results[MASTER_SUMMARY_NAME] = write_summary_file(
+            os.path.join(base_folder, MASTER_SUMMARY_NAME), render_master_summary(built), backend, sync_state
+        )
+    if detailed:
+        results[DETAILED_REPORT_NAME] = write_summary_file(
+            os.path.join(base_folder, DETAILED_REPORT_NAME), render_detailed_report(built, category_bytes),
+            backend, sync_state
+        )
+    if statistics:
+        results[STATISTICS_REPORT_NAME] = write_summary_file(
+            os.path.join(base_folder, STATISTICS_REPORT_NAME),
+            render_statistics(base_folder, compute_statistics(base_folder, organized_files, report, backend)),
+            backend, sync_state
+        )
+    
+    flush_durability(sync_state)
+    if report and 'durability' in report:
+        report['durability']['file_syncs'] += sync_state['file_syncs']
+        report['durability']['dir_syncs'] += sync_state['dir_syncs']
+    return results
+
+def generate_summaries(base_folder, organized_files, report=None, backend=None, durability=None):
+    """Generate summary files for each category folder
+
+    ``backend`` is the storage backend the folder was organized on
+    (see storage.py); local files if None. Summaries are synced at the
+    run's durability level from the report unless ``durability`` (a level
+    name) overrides it.
+    """
+    return write_reports(base_folder, organized_files, report, backend, durability)
+
+def create_master_summary(base_folder, organized_files, report=None, backend=None):
+    """Create a master summary file in the base folder
+
+    Compatibility wrapper around write_reports; a caller that wants several
+    outputs asks for them in one write_reports call instead.
+    """
+    results = write_reports(base_folder, organized_files, report, backend, summaries=False, master=True)
+    return results[MASTER_SUMMARY_NAME]
+
+def create_detailed_report(base_folder, organized_files, report=None, backend=None):
+    """Create a detailed report with file statistics
+
+    Compatibility wrapper around write_reports (detailed=True).
+    """
+    results = write_reports(base_folder, organized_files, report, backend, summaries=False, detailed=True)
+    return results[DETAILED_REPORT_NAME]
+
+def create_statistics_report(base_folder, organized_files, report=None, backend=None):
+    """Create a capacity-planning statistics report (needs NumPy)
+
+    Compatibility wrapper around write_reports (statistics=True).
+    """
+    results = write_reports(base_folder, organized_files, report, backend, summaries=False, statistics=True)
+    return results[STATISTICS_REPORT_NAME]
+
+def create_batch_report(report_path, batch):
+    """Create an aggregated report for a batch of organization jobs"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    jobs = batch['jobs']
+    
+    # Aggregate category counts over every successful job
+    totals = {}
+    for job in jobs:
+        for category, count in job['stats'].items():
+            if category != 'total':
+                totals[category] = totals.get(category, 0) + count
+    
+    failed = [job for job in jobs if job['status'] != 0]
+    total_files = sum(job['stats'].get('total', 0) for job in jobs)
+    
+    content = []
+    content.append("📁 BATCH REPORT - Multi-Folder Organization")
+    content.append("=" * 60)
+    content.append(f"Generated on: {timestamp}")
+    content.append(f"Jobs: {len(jobs)} ({len(jobs) - len(failed)} succeeded, {len(failed)} failed)")
+    content.append(f"Total files organized: {total_files}")
+    content.append(f"Workers: {batch['max_workers']} (max {batch['per_device_limit']} per device)")
+    content.append(f"Duration: {batch['seconds']:.1f} seconds")
+    content.append("=" * 60)
+    content.append("")
+    
+    content.append("📊 Category Breakdown:")
+    content.append("-" * 30)
+    for category, count in totals.items():
+        if count:
+            content.append(f"📁 {category}: {count} files")
+    content.append("")
+    
+    content.append("📋 Jobs:")
+    content.append("-" * 30)
+    for job in jobs:
+        status = "✅" if job['status'] == 0 else "❌"
+        content.append(
+            f"{status} [exit {job['status']}] {job['folder']} - "
+            f"{job['stats'].get('total', 0)} files, "
+            f"{format_file_size(job['estimated_bytes'])} estimated, {job['seconds']:.1f}s"
+        )
+        if job['error']:
+            content.append(f"   Error: {job['error']}")
+    
+    content.append("")
+    content.append("=" * 60)
+    content.append("End of batch report")
+    
+    return write_summary_file(report_path, "\n".join(content))
 
 def validate_summary_creation(base_folder, organized_files):
     """Validate that summary creation is possible"""
@@ -222,14 +542,11 @@ def validate_summary_creation(base_folder, organized_files):
     if not os.path.isdir(base_folder):
         return False, "Base folder path is not a directory"
     
-    try:
-        # Test write access
-        test_file = os.path.join(base_folder, "test_write.tmp")
-        with open(test_file, 'w') as f:
-            f.write("test")
-        os.remove(test_file)
-        return True, "Write access confirmed"
-    except PermissionError:
+    # Test write access (probed once per folder, then cached)
+    error = check_write_access(base_folder)
+    if isinstance(error, PermissionError):
         return False, "Permission denied - cannot write summaries"
-    except Exception as e:
-        return False, f"Error testing write access: {str(e)}" 
\ No newline at end of file
+    if error is not None:
+        return False, f"Error testing write access: {str(error)}"
+    
+    return True, "Write access confirmed" 
\ No newline at end of file
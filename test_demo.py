@@ -58,6 +58,56 @@ def create_test_files():
     
     return str(test_dir.absolute())
 
+def test_file_named_like_a_category(tmp_path):
+    """A file with a category's name fails only the files bound for that category"""
+    from file_organizer import organize_folder
+    
+    (tmp_path / "Images").write_text("not a folder")
+    (tmp_path / "photo.jpg").write_text("image")
+    (tmp_path / "notes.txt").write_text("document")
+    
+    report = {}
+    organized_files = organize_folder(str(tmp_path), {'lean': True}, report)
+    
+    assert organized_files['Documents'] == ["notes.txt"]
+    assert organized_files['Others'] == ["Images"]
+    assert [failure['file'] for failure in report['failed']] == ["photo.jpg"]
+    assert (tmp_path / "photo.jpg").is_file()
+    assert (tmp_path / "Others" / "Images").is_file()
+
+def populate_flat_folder(folder, count):
+    """Fill a folder with ``count`` small files spread over every category"""
+    extensions = ['.jpg', '.txt', '.mp3', '.mp4', '.zip', '.py', '.csv', '.xyz']
+    for i in range(count):
+        (folder / f"file_{i:06d}{extensions[i % len(extensions)]}").write_text("x")
+
+def measure_chunked_peak(folder, count, options):
+    """Organize a fresh folder of ``count`` files in chunks; returns the peak traced bytes"""
+    import tracemalloc
+    from file_organizer import organize_folder
+    from summary_writer import generate_summaries
+    
+    folder.mkdir()
+    populate_flat_folder(folder, count)
+    
+    tracemalloc.start()
+    try:
+        report = {}
+        generate_summaries(str(folder), organize_folder(str(folder), options, report), report)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def test_chunked_memory_ceiling(tmp_path):
+    """Peak memory of a chunked run doesn't grow with the number of files"""
+    for label, workers in [("one", {}), ("four", {'small_file_workers': 4}), ("auto", {'concurrency': 'auto'})]:
+        options = dict(workers, chunk_size=50)
+        small_peak = measure_chunked_peak(tmp_path / f"{label}_small", 1000, options)
+        large_peak = measure_chunked_peak(tmp_path / f"{label}_large", 4000, options)
+        
+        # Four times the files may cost no more than noise on top of the smaller run
+        assert large_peak <= small_peak * 1.25, f"{label} worker(s): {small_peak} → {large_peak} bytes"
+
 def cleanup_test_files():
     """Remove test files"""
     test_dir = Path("test_folder")
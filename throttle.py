@@ -0,0 +1,141 @@
+"""
+Throttle - Token-bucket limits for bytes/sec and metadata ops/sec
+No OOP patterns used - functional approach
+"""
+
+import os
+import json
+import time
+import threading
+
+def create_token_bucket(rate=None, burst=None):
+    """Create a token bucket refilling at ``rate`` tokens/sec (None = unlimited)"""
+    capacity = burst if burst is not None else (rate or 0)
+    return {
+        'rate': rate,
+        'capacity': capacity,
+        'tokens': capacity,
+        'updated': time.monotonic(),
+        'lock': threading.Lock(),
+        'consumed': 0,
+        'waited': 0.0
+    }
+
+def set_bucket_rate(bucket, rate, burst=None):
+    """Change the refill rate of a bucket while it is in use"""
+    with bucket['lock']:
+        bucket['rate'] = rate or None
+        bucket['capacity'] = burst if burst is not None else (rate or 0)
+        bucket['tokens'] = min(bucket['tokens'], bucket['capacity'])
+        bucket['updated'] = time.monotonic()
+
+def consume_tokens(bucket, amount):
+    """Take tokens from a bucket, sleeping until the bucket can afford them
+
+    Requests larger than the bucket capacity are allowed to drive the bucket
+    into debt, so a single huge file is delayed proportionally instead of
+    blocking forever. Returns the number of seconds slept.
+    """
+    if not bucket['rate'] or amount <= 0:
+        bucket['consumed'] += max(amount, 0)
+        return 0.0
+
+    with bucket['lock']:
+        rate = bucket['rate']
+        if not rate:
+            bucket['consumed'] += amount
+            return 0.0
+
+        now = time.monotonic()
+        elapsed = now - bucket['updated']
+        bucket['tokens'] = min(bucket['capacity'], bucket['tokens'] + elapsed * rate)
+        bucket['updated'] = now
+
+        bucket['tokens'] -= amount
+        bucket['consumed'] += amount
+        wait = -bucket['tokens'] / rate if bucket['tokens'] < 0 else 0.0
+        bucket['waited'] += wait
+
+    if wait:
+        time.sleep(wait)
+    return wait
+
+# Limits shared by every worker thread of the process
+_throttles = {
+    'bytes': create_token_bucket(),
+    'ops': create_token_bucket()
+}
+
+def set_throttle_limits(bytes_per_second=None, ops_per_second=None):
+    """Set the process-wide limits; None or 0 removes a limit"""
+    set_bucket_rate(_throttles['bytes'], bytes_per_second)
+    set_bucket_rate(_throttles['ops'], ops_per_second)
+
+def throttle_bytes(byte_count):
+    """Account for data transferred, waiting if the byte limit is exceeded"""
+    return consume_tokens(_throttles['bytes'], byte_count)
+
+def throttle_operation(op_count=1):
+    """Account for metadata operations, waiting if the ops limit is exceeded"""
+    return consume_tokens(_throttles['ops'], op_count)
+
+def get_throttle_stats():
+    """Get the current limits and how much time workers spent throttled"""
+    bytes_bucket = _throttles['bytes']
+    ops_bucket = _throttles['ops']
+
+    return {
+        'bytes_per_second': bytes_bucket['rate'],
+        'ops_per_second': ops_bucket['rate'],
+        'bytes': bytes_bucket['consumed'],
+        'ops': ops_bucket['consumed'],
+        'throttled_seconds': bytes_bucket['waited'] + ops_bucket['waited']
+    }
+
+def format_throttle_stats(stats):
+    """Format throttle stats for progress lines"""
+    from file_utils import format_file_size
+
+    limits = []
+    if stats['bytes_per_second']:
+        limits.append(f"{format_file_size(stats['bytes_per_second'])}/s")
+    if stats['ops_per_second']:
+        limits.append(f"{stats['ops_per_second']:g} ops/s")
+
+    if not limits:
+        return "unthrottled"
+
+    return f"limit {', '.join(limits)}, waited {stats['throttled_seconds']:.1f}s"
+
+def load_throttle_file(path):
+    """Apply limits from a JSON file with bytes_per_second / ops_per_second keys"""
+    with open(path, 'r', encoding='utf-8') as f:
+        settings = json.load(f)
+
+    set_throttle_limits(settings.get('bytes_per_second'), settings.get('ops_per_second'))
+    return settings
+
+def watch_throttle_file(path, stop_event, interval=1.0):
+    """Re-apply a throttle file whenever it changes, until stop_event is set
+
+    Lets operators retune a running command-line job by editing the file.
+    """
+    last_mtime = None
+
+    while not stop_event.is_set():
+        try:
+            mtime = os.path.getmtime(path)
+            if mtime != last_mtime:
+                load_throttle_file(path)
+                last_mtime = mtime
+        except (OSError, ValueError):
+            pass
+        stop_event.wait(interval)
+
+def start_throttle_watcher(path, interval=1.0):
+    """Start watching a throttle file in a daemon thread; returns the stop event"""
+    stop_event = threading.Event()
+    thread = threading.Thread(target=watch_throttle_file, args=(path, stop_event, interval))
+    thread.daemon = True
+    thread.start()
+    return stop_event
@@ -7,6 +7,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from datetime import datetime
 import threading
+import time
 import os
 
 # Global variables for UI state
@@ -18,6 +19,18 @@ organize_btn = None
 select_btn = None
 summary_btn = None
 progress_bar = None
+link_mode_var = None
+verified_copy_var = None
+auto_workers_var = None
+max_mbps_var = None
+max_ops_var = None
+strategy_var = None
+last_progress_update = 0.0
+# (organized_files, report) of the last run, for the results browser
+last_results = None
+
+# Sub folder strategies offered in the options section
+STRATEGY_CHOICES = ('extension', 'extension+month', 'extension+year', 'extension+size')
 
 # Color scheme for dark theme
 COLORS = {
@@ -38,7 +51,7 @@ def create_main_window():
     global root_window
     root_window = tk.Tk()
     root_window.title("Folder Organizer")
-    root_window.geometry("600x500")
+    root_window.geometry("600x620")
     root_window.resizable(False, False)
     root_window.configure(bg=COLORS['bg_dark'])
     return root_window
@@ -103,6 +116,155 @@ def create_folder_section(main_frame):
     )
     folder_display.pack(fill='x', pady=(0, 10))
 
+def create_options_section(main_frame):
+    """Create the organization options section"""
+    options_frame = tk.Frame(main_frame, bg=COLORS['bg_dark'])
+    options_frame.pack(fill='x', pady=(0, 10))
+    
+    global link_mode_var
+    link_mode_var = tk.BooleanVar(value=False)
+    link_check = tk.Checkbutton(
+        options_frame,
+        text="🔗 Keep originals (build category view with links)",
+        variable=link_mode_var,
+        font=('Segoe UI', 9),
+        fg=COLORS['text_secondary'],
+        bg=COLORS['bg_dark'],
+        activebackground=COLORS['bg_dark'],
+        activeforeground=COLORS['text'],
+        selectcolor=COLORS['bg_medium']
+    )
+    link_check.pack(anchor='w')
+    
+    global verified_copy_var
+    verified_copy_var = tk.BooleanVar(value=False)
+    verify_check = tk.Checkbutton(
+        options_frame,
+        text="🔒 Verified move (copy with checksum, then remove originals)",
+        variable=verified_copy_var,
+        font=('Segoe UI', 9),
+        fg=COLORS['text_secondary'],
+        bg=COLORS['bg_dark'],
+        activebackground=COLORS['bg_dark'],
+        activeforeground=COLORS['text'],
+        selectcolor=COLORS['bg_medium']
+    )
+    verify_check.pack(anchor='w')
+    
+    global auto_workers_var
+    auto_workers_var = tk.BooleanVar(value=False)
+    auto_workers_check = tk.Checkbutton(
+        options_frame,
+        text="⚙️ Auto-tune workers (for network shares)",
+        variable=auto_workers_var,
+        font=('Segoe UI', 9),
+        fg=COLORS['text_secondary'],
+        bg=COLORS['bg_dark'],
+        activebackground=COLORS['bg_dark'],
+        activeforeground=COLORS['text'],
+        selectcolor=COLORS['bg_medium']
+    )
+    auto_workers_check.pack(anchor='w')
+    
+    # Sub folder layout below each category
+    strategy_frame = tk.Frame(options_frame, bg=COLORS['bg_dark'])
+    strategy_frame.pack(anchor='w', pady=(5, 0))
+    
+    tk.Label(
+        strategy_frame,
+        text="Sub folders:",
+        font=('Segoe UI', 9),
+        fg=COLORS['text_secondary'],
+        bg=COLORS['bg_dark']
+    ).pack(side='left')
+    
+    global strategy_var
+    strategy_var = tk.StringVar(value=STRATEGY_CHOICES[0])
+    strategy_menu = tk.OptionMenu(strategy_frame, strategy_var, *STRATEGY_CHOICES)
+    strategy_menu.config(
+        font=('Segoe UI', 9),
+        fg=COLORS['text'],
+        bg=COLORS['bg_medium'],
+        activebackground=COLORS['bg_light'],
+        activeforeground=COLORS['text'],
+        highlightthickness=0,
+        relief='flat'
+    )
+    strategy_menu.pack(side='left', padx=(5, 0))
+    
+    # Throttle controls, applied to running jobs as well
+    throttle_frame = tk.Frame(options_frame, bg=COLORS['bg_dark'])
+    throttle_frame.pack(anchor='w', pady=(5, 0))
+    
+    global max_mbps_var, max_ops_var
+    max_mbps_var = tk.StringVar(value="")
+    max_ops_var = tk.StringVar(value="")
+    
+    for label_text, variable in (("Max MB/s:", max_mbps_var), ("Max ops/s:", max_ops_var)):
+        tk.Label(
+            throttle_frame,
+            text=label_text,
+            font=('Segoe UI', 9),
+            fg=COLORS['text_secondary'],
+            bg=COLORS['bg_dark']
+        ).pack(side='left')
+        tk.Entry(
+            throttle_frame,
+            textvariable=variable,
+            width=8,
+            font=('Segoe UI', 9),
+            fg=COLORS['text'],
+            bg=COLORS['bg_medium'],
+            insertbackground=COLORS['text'],
+            relief='flat'
+        ).pack(side='left', padx=(5, 15))
+    
+    tk.Button(
+        throttle_frame,
+        text="Apply limits",
+        font=('Segoe UI', 9),
+        fg=COLORS['text'],
+        bg=COLORS['bg_light'],
+        activebackground=COLORS['bg_medium'],
+        activeforeground=COLORS['text'],
+        relief='flat',
+        padx=10,
+        cursor='hand2',
+        command=handle_apply_throttle
+    ).pack(side='left')
+
+def get_organize_options():
+    """Collect organize_folder options from the UI controls"""
+    options = {'mode': 'move', 'strategy': strategy_var.get()}
+    if link_mode_var.get():
+        options['mode'] = 'link'
+    elif verified_copy_var.get():
+        options['mode'] = 'verified_move'
+    if auto_workers_var.get():
+        options['concurrency'] = 'auto'
+    return options
+
+def parse_limit(variable, scale=1):
+    """Parse a throttle entry; empty or invalid values mean no limit"""
+    try:
+        value = float(variable.get())
+    except ValueError:
+        return None
+    return value * scale if value > 0 else None
+
+def handle_apply_throttle():
+    """Apply the throttle limits entered in the UI, even during a run"""
+    from throttle import set_throttle_limits
+    
+    bytes_per_second = parse_limit(max_mbps_var, 1024 * 1024)
+    ops_per_second = parse_limit(max_ops_var)
+    set_throttle_limits(bytes_per_second, ops_per_second)
+    
+    if bytes_per_second or ops_per_second:
+        log_status(f"🐢 Throttle: {max_mbps_var.get() or '∞'} MB/s, {max_ops_var.get() or '∞'} ops/s")
+    else:
+        log_status("🐇 Throttle removed")
+
 def create_buttons_section(main_frame):
     """Create the buttons section"""
     buttons_frame = tk.Frame(main_frame, bg=COLORS['bg_dark'])
@@ -148,7 +310,7 @@ def create_buttons_section(main_frame):
     # View summaries button
     summary_btn = tk.Button(
         buttons_frame,
-        text="📊 View Summaries",
+        text="📊 Browse Results",
         font=('Segoe UI', 11, 'bold'),
         fg=COLORS['text'],
         bg=COLORS['warning'],
@@ -244,9 +406,27 @@ def handle_folder_selection():
         progress_var.set(f"📁 {folder}")
         organize_btn.config(state='normal')
         log_status(f"✅ Selected folder: {folder}")
+        
+        # Scanning a big folder takes a moment; keep the UI responsive
+        thread = threading.Thread(target=estimate_thread, args=(folder, get_organize_options()))
+        thread.daemon = True
+        thread.start()
     else:
         log_status("❌ No folder selected")
 
+def estimate_thread(folder, options):
+    """Thread function estimating how long organizing a folder will take"""
+    try:
+        from calibration import estimate_folder, format_duration
+        
+        estimate = estimate_folder(folder, options)
+        message = (f"⏱️ Estimated time: {format_duration(estimate['seconds'])} "
+                   f"for {estimate['files']} files ({options['mode']})")
+    except Exception as e:
+        message = f"⚠️ Could not estimate time: {e}"
+    
+    root_window.after(0, log_status, message)
+
 def handle_organize_files():
     """Handle organize files button click"""
     if not selected_folder:
@@ -259,12 +439,17 @@ def handle_organize_files():
     progress_bar.start()
     progress_var.set("Organizing files...")
     
+    # Read the controls here, Tk variables belong to the main thread
+    options = get_organize_options()
+    options['max_bytes_per_second'] = parse_limit(max_mbps_var, 1024 * 1024) or 0
+    options['max_ops_per_second'] = parse_limit(max_ops_var) or 0
+    
     # Run in separate thread to prevent UI freezing
-    thread = threading.Thread(target=organize_files_thread)
+    thread = threading.Thread(target=organize_files_thread, args=(options,))
     thread.daemon = True
     thread.start()
 
-def organize_files_thread():
+def organize_files_thread(options):
     """Thread function for file organization"""
     try:
         # Import here to avoid circular imports
@@ -272,19 +457,44 @@ def organize_files_thread():
         from summary_writer import generate_summaries
         
         # Organize files
-        organized_files = organize_folder(selected_folder)
+        report = {}
+        organized_files = organize_folder(selected_folder, options, report, report_progress)
         
         # Generate summaries
-        generate_summaries(selected_folder, organized_files)
+        generate_summaries(selected_folder, organized_files, report)
         
         # Update UI in main thread
-        root_window.after(0, organize_complete, organized_files)
+        root_window.after(0, organize_complete, organized_files, report)
         
     except Exception as e:
         root_window.after(0, organize_error, str(e))
 
-def organize_complete(organized_files):
+def report_progress(progress):
+    """Forward engine progress to the UI thread, at most ten times a second"""
+    global last_progress_update
+    
+    now = time.monotonic()
+    if progress['done'] < progress['total'] and now - last_progress_update < 0.1:
+        return
+    last_progress_update = now
+    
+    root_window.after(0, show_progress, progress)
+
+def show_progress(progress):
+    """Show engine progress and throttle state in the progress label"""
+    from throttle import format_throttle_stats
+    
+    workers = progress.get('workers', {})
+    pools = f", {workers['small']} + {workers['large']} workers" if sum(workers.values()) > 1 else ""
+    progress_var.set(
+        f"Organizing files... {progress['done']}/{progress['total']} "
+        f"({format_throttle_stats(progress['throttle'])}{pools})"
+    )
+
+def organize_complete(organized_files, report=None):
     """Handle completion of file organization"""
+    global last_results
+    last_results = (organized_files, report)
     progress_bar.stop()
     progress_var.set("✅ Organization complete!")
     
@@ -301,6 +511,26 @@ def organize_complete(organized_files):
         if files:
             log_status(f"📁 {category}: {len(files)} files")
     
+    if report and report.get('ignored'):
+        log_status(f"🙈 Skipped {len(report['ignored'])} ignored files")
+    
+    for failure in (report or {}).get('failed', []):
+        log_status(f"⚠️ {failure['file']} not moved: {failure['error']}")
+    
+    if report and report.get('concurrency'):
+        for pool, tuning in report['concurrency'].items():
+            if tuning['decisions']:
+                log_status(f"⚙️ {pool} files: {tuning['initial']} → {tuning['final']} workers "
+                           f"(peak {tuning['peak']})")
+    
+    if report and report.get('slow_operations'):
+        log_status(f"🐢 {len(report['slow_operations'])} slow operations")
+    
+    if report and report.get('mode') == 'link':
+        from file_organizer import get_strategy_counts
+        for strategy, count in get_strategy_counts(report).items():
+            log_status(f"🔗 {strategy}: {count} files")
+    
     messagebox.showinfo("Success", f"Successfully organized {total_files} files!")
 
 def organize_error(error_msg):
@@ -316,12 +546,16 @@ def organize_error(error_msg):
     messagebox.showerror("Error", f"Failed to organize files:\n{error_msg}")
 
 def handle_view_summaries():
-    """Handle view summaries button click"""
-    if selected_folder and os.path.exists(selected_folder):
-        os.startfile(selected_folder)
-        log_status("📂 Opened organized folder")
-    else:
+    """Handle browse results button click"""
+    if not last_results or not os.path.exists(selected_folder):
         messagebox.showwarning("Warning", "No organized folder available")
+        return
+    
+    from results_browser import open_results_browser
+    
+    organized_files, report = last_results
+    open_results_browser(root_window, selected_folder, organized_files, report, COLORS)
+    log_status("📊 Opened results browser")
 
 def log_status(message):
     """Add a message to the status log"""
@@ -341,6 +575,7 @@ def setup_ui():
     main_frame = setup_main_container()
     create_title_section(main_frame)
     create_folder_section(main_frame)
+    create_options_section(main_frame)
     create_buttons_section(main_frame)
     create_progress_section(main_frame)
     create_status_section(main_frame)
@@ -0,0 +1,111 @@
+"""
+Verified Copy - Copies files while checksumming the copied buffers
+No OOP patterns used - functional approach
+"""
+
+import os
+import shutil
+import hashlib
+import threading
+
+from throttle import throttle_bytes
+
+# Size of each pooled copy buffer
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Files smaller than one buffer are copied with a single read
+SMALL_FILE_LIMIT = COPY_BUFFER_SIZE
+
+# Upper bound on idle buffers kept around between copies
+MAX_POOLED_BUFFERS = 16
+
+DEFAULT_CHECKSUM_ALGORITHM = 'sha256'
+
+# Reusable buffers for large files, shared by every copying thread
+_buffer_pool = []
+_buffer_pool_lock = threading.Lock()
+
+def acquire_buffer():
+    """Take a copy buffer from the pool, allocating one if the pool is empty"""
+    with _buffer_pool_lock:
+        if _buffer_pool:
+            return _buffer_pool.pop()
+    return bytearray(COPY_BUFFER_SIZE)
+
+def release_buffer(buffer):
+    """Return a copy buffer to the pool for the next large file"""
+    with _buffer_pool_lock:
+        if len(_buffer_pool) < MAX_POOLED_BUFFERS:
+            _buffer_pool.append(buffer)
+
+def stream_copy(source_file, destination_file, digest, size):
+    """Copy between open files, feeding every chunk to the digest on the way"""
+    if size < SMALL_FILE_LIMIT:
+        data = source_file.read()
+        throttle_bytes(len(data))
+        digest.update(data)
+        destination_file.write(data)
+        return len(data)
+
+    copied = 0
+    buffer = acquire_buffer()
+    view = memoryview(buffer)
+    try:
+        while True:
+            count = source_file.readinto(buffer)
+            if not count:
+                break
+            throttle_bytes(count)
+            chunk = view[:count]
+            digest.update(chunk)
+            destination_file.write(chunk)
+            copied += count
+    finally:
+        view.release()
+        release_buffer(buffer)
+
+    return copied
+
+def copy_file_with_checksum(source_path, destination_path, algorithm=DEFAULT_CHECKSUM_ALGORITHM):
+    """Copy a file in a single pass and return (checksum, bytes copied)
+
+    The checksum is computed from the same buffers that are written, so the
+    source is read exactly once. The destination must not exist yet.
+    """
+    digest = hashlib.new(algorithm)
+
+    try:
+        with open(source_path, 'rb') as source_file, open(destination_path, 'xb') as destination_file:
+            size = os.fstat(source_file.fileno()).st_size
+            copied = stream_copy(source_file, destination_file, digest, size)
+        shutil.copystat(source_path, destination_path)
+    except FileExistsError:
+        raise
+    except BaseException:
+        # Never leave a partial copy behind
+        try:
+            os.remove(destination_path)
+        except OSError:
+            pass
+        raise
+
+    return digest.hexdigest(), copied
+
+def file_checksum(file_path, algorithm=DEFAULT_CHECKSUM_ALGORITHM):
+    """Compute the checksum of a file by reading it with a pooled buffer"""
+    digest = hashlib.new(algorithm)
+
+    buffer = acquire_buffer()
+    view = memoryview(buffer)
+    try:
+        with open(file_path, 'rb') as f:
+            while True:
+                count = f.readinto(buffer)
+                if not count:
+                    break
+                digest.update(view[:count])
+    finally:
+        view.release()
+        release_buffer(buffer)
+
+    return digest.hexdigest()